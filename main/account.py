@@ -1,10 +1,12 @@
 # ? Built-in
+from __future__ import annotations
+
 import os
 import sys
 import json
 import struct
 import numpy as np
-from typing import Any
+from typing import TYPE_CHECKING, Any, Optional
 from pprint import pprint
 from hashlib import sha256
 from base64 import b64encode, b64decode
@@ -12,23 +14,58 @@ from binascii import hexlify, unhexlify
 from dataclasses import dataclass, field, asdict
 
 # ? Third Party
-from nptyping import NDArray, Int, Shape, Structure
+if TYPE_CHECKING:  # * Only needed for annotations
+    from nptyping import NDArray, Int, Shape, Structure
 
 # ? Local
 from keypair import KeyPair
+from growable import GrowableArray
+from metrics import timed
+from keypool import KeyPool, gen_wallet_entry
+from derivation import derive_wallet_entry, derive_wallet_entries, wallet_seed
 from signature import Signature
 from operation import Operation
 from transaction import Transaction
+from records import pack_transactions, unpack_transactions
+
+# Module-level helpers KEYS, SIGNER, OP and TX are created on first access
+_LAZY_HELPERS = {
+    "KEYS": KeyPair,
+    "SIGNER": Signature,
+    "OP": Operation,
+    "TX": Transaction,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Creates a module-level helper the first time it is accessed"""
+    if name in _LAZY_HELPERS:
+        globals()[name] = helper = _LAZY_HELPERS[name]()
+        return helper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Class Initialization
-KEYS = KeyPair()
-SIGNER: "Signature" = Signature()
-OP: "Operation" = Operation()
-TX: "Transaction" = Transaction()
 
 # Random Integer 4bytes
 RANDNONCE: int = int.from_bytes
 
+# Wallet entry: RSA key pair with its CRT parameters for fast signing
+WALLET_STRUCT = np.dtype(
+    [
+        ("PrivateKey", "O"),
+        ("PublicKey", "O"),
+        ("Modulus", "O"),
+        ("Prime1", "O"),
+        ("Prime2", "O"),
+        ("Exponent1", "O"),
+        ("Exponent2", "O"),
+        ("Coefficient", "O"),
+    ]
+)
+
+# Transaction history entry: an operation received (UTXO) or sent (STXO), as
+# (records.TransactionRecord tuple, transaction position, operation position)
+HISTORY_STRUCT = np.dtype([("UTXO", "O"), ("STXO", "O")])
+
 
 @dataclass(repr=False)
 class Account:
@@ -47,21 +84,41 @@ class Account:
         a dictonary containing properties own by the accountt
 
     :tx_history:
-        a numpy array value representing unspent and spent transaction outputs.
+        a growable numpy array value representing unspent and spent transaction outputs.
+
+    :unspent / spent:
+        running totals of the coins in tx_history, updated on every new transaction.
 
     """
 
     _account_id: bytes = b""
 
-    wallet: NDArray[
+    wallet: GrowableArray | NDArray[
         Shape["1,0"],
-        Structure["PrivateKey: Object, PublicKey: Object, Modulus: Object"],
+        Structure[
+            "PrivateKey: Object, PublicKey: Object, Modulus: Object, "
+            "Prime1: Object, Prime2: Object, Exponent1: Object, "
+            "Exponent2: Object, Coefficient: Object"
+        ],
     ] = field(default_factory=lambda: np.empty([1, 0], dtype="O"))
 
     _properties: dict = field(default_factory=lambda: dict())
-    _tx_history: NDArray[
+    _tx_history: GrowableArray | NDArray[
         Shape["2,2"], Structure["UTXO: Object, STXO: Object"]
     ] | None = None
+    _unspent: int | float = field(default=0, init=False)
+    _spent: int | float = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        """Moves plain numpy wallet/history into growable arrays and sets the running totals"""
+        if isinstance(self.wallet, np.ndarray) and self.wallet.dtype.names:
+            self.wallet = GrowableArray.from_array(self.wallet)
+
+        if isinstance(self._tx_history, np.ndarray):
+            self._tx_history = GrowableArray.from_array(self._tx_history)
+
+        if self._tx_history is not None:
+            self.audit_balance(repair=True)
 
     @property
     def get_account_id(self) -> bytes:
@@ -73,46 +130,91 @@ class Account:
         """Return a new object of Account"""
         return cls(id, wall, property, tx_history)
 
-    def gen_account(self) -> "Account":
+    def gen_account(
+        self, pool: Optional[KeyPool] = None, seed: Optional[bytes] = None
+    ) -> "Account":
         """
         a function that allows you to create an account.
                 The first key pair is generated and assigned to the account.
 
+        :pool:
+            optional KeyPool to draw a pre-generated key pair from
+
+        :seed:
+            optional secret to derive the first key pair from, so the same seed always
+            gives the same account. See derivation
+
         :returns:
              an object of the Account class.
         """
         # Get KeyPair
-        kPrv, kPub = KEYS.gen_key_pair().values()
+        if seed is not None:
+            entry = derive_wallet_entry(seed, 0)
+        elif pool is not None:
+            entry = pool.get()
+        else:
+            entry = gen_wallet_entry()
+        kPub = (entry[2], entry[1])
         acc_id = sha256(str(kPub).encode("ascii")).hexdigest()
 
-        data_struct = np.dtype(
-            [("PrivateKey", "O"), ("PublicKey", "O"), ("Modulus", "O")]
-        )
-        wallet = np.array([(kPrv[0], kPub[1], kPub[0])], dtype=data_struct)
+        wallet = GrowableArray(WALLET_STRUCT, capacity=2)
+        wallet.append(entry)
         return self.__create_account(acc_id, wallet, self.get_properties, self._tx_history)
 
-    def add_key_pair_to_wallet(self, keypair: KeyPair) -> None:
+    def add_key_pair_to_wallet(
+        self, keypair: KeyPair, pool: Optional[KeyPool] = None
+    ) -> None:
         """
         a function that allows you to add a new key pair to the wallet and use it in the future to sign operations
         initiated from this account.
 
         :keypair:
-            object of KeyPair class
+            object of KeyPair class; sets the key size
+
+        :pool:
+            optional KeyPool to draw a pre-generated key pair from instead of deriving one
 
         :return:
             None.
         """
-        # Generates New keypair from private key
-        kPrv, kPub = keypair.gen_key_pair(self.wallet["PrivateKey"][0]).values()
-        data_struct = np.dtype(
-            [("PrivateKey", "O"), ("PublicKey", "O"), ("Modulus", "O")]
+        if pool is not None:
+            entry = pool.get()
+        else:
+            # Derives the next key pair from the first private key. See derivation
+            entry = derive_wallet_entry(
+                wallet_seed(self.wallet[0]), len(self.wallet), keypair.key_bytes
+            )
+        self.__append_wallet_entries([entry])
+
+    def derive_key_pairs(
+        self, count: int, key_bytes: int = 1024, max_workers: Optional[int] = None
+    ) -> None:
+        """
+        a function that adds count key pairs to the wallet in one batch. Keys are derived
+        from the first private key, so the same wallet always derives the same keys.
+
+        :max_workers:
+            worker processes deriving keys. Defaults to the number of cores.
+        """
+        if count < 1:
+            raise BaseException(f"Cannot derive {count} key pairs: count must be at least 1!")
+        start = len(self.wallet)
+        entries = derive_wallet_entries(
+            wallet_seed(self.wallet[0]), range(start, start + count), key_bytes, max_workers
         )
+        self.__append_wallet_entries(entries)
+
+    def __append_wallet_entries(self, entries: list) -> None:
+        """Adds keys to the wallet; the account id follows the last public key"""
+        if not isinstance(self.wallet, GrowableArray):
+            self.wallet = GrowableArray(WALLET_STRUCT)
+        for entry in entries:
+            self.wallet.append(entry)  # Add new keys to the wallet
+        kPub = (entries[-1][2], entries[-1][1])
         #  Updates account id with the new publickey
         self._account_id = sha256(str(kPub).encode("ascii")).hexdigest()
 
-        temp = np.array([(kPrv[0], kPub[1], kPub[0])], dtype=data_struct)
-        self.wallet = np.append(self.wallet, temp)  # Add new keys to the wallet
-
+    @timed("account_payment_seconds", "Time to sign, verify and record a payment")
     def create_payment_op(
         self, recipient: "Account", asset: int | float | str | bytes, index: int
     ) -> Transaction:
@@ -131,31 +233,17 @@ class Account:
         :return:
             Trasaction object.
         """
-        sig: bytes = b""  # Sign asset
-        if isinstance(asset, int):
-            sig = self.sign_data(
-                asset.to_bytes(asset.bit_length(), "little"), index
-            )  # signs integer: coins
-
-        elif isinstance(asset, float):
-            sig = self.sign_data(struct.pack("f", asset), index)  # signs float: coins
-
-        elif isinstance(asset, bytes) or isinstance(asset, str):
-            try:
-                sig = self.sign_data(
-                    asset.encode("ascii"), index
-                )  # signs string: property's id
-            except AttributeError:
-                sig = self.sign_data(asset, index)  # signs bytes: property's id
-
+        nonce: int = RANDNONCE(os.urandom(4), sys.byteorder)
         # Create Operation from Operation Class
-        operation = OP.create_operation(self, recipient, asset, sig)
+        operation = Operation().create_operation(self, recipient, asset, b"", nonce)
+        # Sign asset, bound to both accounts and the transaction's nonce
+        operation.signature = self.sign_data(operation.get_message(), index)
 
         # Verify Operation
         if operation.verify_operation(index):
             op: list[Operation] = operation.get_operation_list
-            transaction = TX.create_operation(
-                op, RANDNONCE(os.urandom(4), sys.byteorder)
+            transaction = Transaction().create_operation(
+                op, nonce
             )  # If operation is genuine create transaction
 
             # Update both sender and receiver's transaction history
@@ -167,6 +255,55 @@ class Account:
             f"Transfer of {asset} to {recipient.get_account_id} from {self.get_account_id} failed!!"
         )
 
+    @timed("account_batch_payment_seconds", "Time to sign, verify and record a batch payment")
+    def create_batch_payment(
+        self, payments: list[tuple["Account", int | float]], index: int
+    ) -> Transaction:
+        """
+        a function that pays many recipients in one transaction: one nonce, one hash and
+        one mempool entry for the whole batch. Each payment is a signed operation.
+
+        :payments:
+            (recipient, amount) pairs. Amounts are positive coins; their total must be below the balance.
+
+        :index:
+            index of key for signing data
+
+        :return:
+            Trasaction object.
+        """
+        if not payments:
+            raise BaseException("No payments to make!")
+        for _, amount in payments:
+            if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not amount > 0:
+                raise BaseException(f"Invalid amount {amount!r}: batch payments transfer positive coin amounts only!")
+        total = sum(amount for _, amount in payments)
+        if not total < self.get_balance:
+            raise BaseException(f"Transfer of {total} from {self.get_account_id} failed!!")
+
+        nonce: int = RANDNONCE(os.urandom(4), sys.byteorder)
+        sigs: dict = {}  # * Repeated payments share a signature; 10 and 10.0 are not equal messages
+        ops: list[dict] = []
+        for recipient, amount in payments:
+            operation = Operation().create_operation(self, recipient, amount, b"", nonce)
+            msg = operation.get_message()
+            if msg not in sigs:
+                sigs[msg] = self.sign_data(msg, index)
+            operation.signature = sigs[msg]
+            if not operation.verify_operation(index):
+                raise BaseException(
+                    f"Transfer of {amount} to {recipient.get_account_id} from {self.get_account_id} failed!!"
+                )
+            ops.extend(operation.get_operation_list)
+
+        transaction = Transaction().create_operation(ops, nonce)
+        self._update_tx_history(transaction)
+        recipients = {id(recipient): recipient for recipient, _ in payments}
+        for recipient in recipients.values():
+            if recipient is not self:
+                recipient._update_tx_history(transaction)
+        return transaction
+
     @property
     def get_balance(self) -> int | float:
         """
@@ -175,11 +312,27 @@ class Account:
         :return:
             integer
         """
+        if self._unspent > self._spent:
+            return self._unspent - self._spent
+        return 0
+
+    def audit_balance(self, repair: bool = False) -> bool:
+        """
+        a function that recomputes the totals from the full transaction history
+        and checks them against the running totals used by get_balance.
+
+        :repair:
+            if true, replace the running totals with the recomputed ones
+
+        :return:
+            true if the running totals match the history
+        """
         unspent: int = self.__compute_utxos_stxos("UTXO")
         spent: int = self.__compute_utxos_stxos("STXO")
-        if unspent > spent:
-            return unspent - spent
-        return 0
+        matches = (unspent, spent) == (self._unspent, self._spent)
+        if repair:
+            self._unspent, self._spent = unspent, spent
+        return matches
 
     @get_balance.getter
     def print_balance(self) -> None:
@@ -191,7 +344,7 @@ class Account:
         """
         print(f"Account balance: {self.get_balance}")
 
-    def create_property(self, deed_no: bytes, appro_area: bytes, worth: int) -> None:
+    def create_property(self, deed_no: bytes, appro_area: bytes, worth: int | float) -> Transaction:
         """
         a function creates a new property.
 
@@ -206,11 +359,16 @@ class Account:
 
         :owner:
             account_id of the current owner
+
+        :return:
+            Transaction object issuing the property to this account, for the chain's property registry.
         """
-        property_: dict[bytes, dict[str, bytes]] = {
-            hexlify(b64encode(deed_no)).decode("ascii"): {
-                "appro_area": hexlify(b64encode(appro_area)).decode("ascii"),
-                "worth": hexlify(b64encode(worth)).decode("ascii"),
+        deed_id: str = hexlify(b64encode(deed_no)).decode("ascii")
+        area: str = hexlify(b64encode(appro_area)).decode("ascii")
+        property_: dict[str, dict[str, str | int | float]] = {
+            deed_id: {
+                "appro_area": area,
+                "worth": worth,
                 "owner": self.get_account_id,
             }
         }
@@ -219,17 +377,20 @@ class Account:
         # Statically create a transaction for the new property
         operation = [
             {
-                "asset": hexlify(b64encode(deed_no)).decode("ascii"),
+                "asset": deed_id,
                 "receiver": self.get_account_id,
                 "sender": None,
                 "sig": None,
+                "worth": worth,
+                "appro_area": area,
             }
         ]
 
-        tx: Transaction = TX.create_operation(
+        tx: Transaction = Transaction().create_operation(
             operation, RANDNONCE(os.urandom(4), sys.byteorder)
         )
         # self._update_tx_history(tx)
+        return tx
 
     def payment_op_for_property(
         self, prop_id: str, buyer: "Account", amount: int | float | float, index: int
@@ -250,15 +411,39 @@ class Account:
             index of key for signing data
 
         :return:
-            trasaction object.
+            trasaction object transferring the deed. See sell_property for the buyer's payment too.
+        """
+        return self.sell_property(prop_id, buyer, amount, index)[1]
+
+    def sell_property(
+        self, prop_id: str, buyer: "Account", amount: int | float, index: int
+    ) -> tuple[Transaction, Transaction]:
+        """
+        a function that sells a property: the buyer pays this account and the deed is transferred to the buyer.
+
+        :prop_id:
+            a digital deed that uniquely identifies a property.
+
+        :buyer:
+            account object as input to which the property ownership will be transfered.
+
+        :amount:
+            property's worth.
+
+        :index:
+            index of key for signing data
+
+        :return:
+            (payment, deed) transactions. Both must reach the chain for its balances to match the accounts'.
         """
         # Create operation for and seller
-        sig: bytes = self.sign_data(prop_id.encode("ascii"), index)
-        seller_op: Operation = OP.create_operation(self, buyer, prop_id, sig)
+        nonce: int = RANDNONCE(os.urandom(4), sys.byteorder)
+        seller_op: Operation = Operation().create_operation(self, buyer, prop_id, b"", nonce)
+        seller_op.signature = self.sign_data(seller_op.get_message(), index)
 
         if seller_op.verify_operation(index, True):  # verify property of interest exist
             # Initiate coin payment operation
-            buyer.create_payment_op(self, amount, index)
+            payment: Transaction = buyer.create_payment_op(self, amount, index)
             # if payment operation was a success remove and update seller properties
             temp = {prop_id: self.get_properties.pop(prop_id)}
             # change property owner
@@ -266,12 +451,12 @@ class Account:
             # Update buyer's properties
             buyer.update_properties = temp
 
-            transaction: Transaction = TX.create_operation(
-                seller_op.get_operation_list, RANDNONCE(os.urandom(4), sys.byteorder)
+            transaction: Transaction = Transaction().create_operation(
+                seller_op.get_operation_list, nonce
             )
             # self.__update_transaction_history(transaction)
             # buyer.__update_transaction_history(transaction)
-            return transaction
+            return payment, transaction
 
         raise BaseException(
             f"Transfer of {prop_id} to {buyer.get_account_id} from {self.get_account_id} failed!!"
@@ -330,8 +515,19 @@ class Account:
         :return:
             bytes -> The value of the signature
         """
-        d, n = self.wallet["PrivateKey"][index], self.wallet["Modulus"][index]
-        signed_data = SIGNER.sign_data((d, n), msg)
+        entry = self.wallet[index]
+        if entry["Prime1"] is not None:  # * CRT parameters available: fast path
+            crt = (
+                entry["Prime1"],
+                entry["Prime2"],
+                entry["Exponent1"],
+                entry["Exponent2"],
+                entry["Coefficient"],
+            )
+            return Signature().sign_data_crt(crt, msg)
+
+        d, n = entry["PrivateKey"], entry["Modulus"]
+        signed_data = Signature().sign_data((d, n), msg)
         return signed_data
 
     @property
@@ -343,44 +539,43 @@ class Account:
         """function calculate and returns available coin that can spent"""
 
         tx: int = 0
-        if coin == "UTXO":  # Calculate Unspent
-            unspent: list = list(self.get_history["UTXO"])
-
-            for u in range(len(unspent)):
-                if unspent[u] is not None:
-                    temp = unspent[u][0]["operation"][0]["asset"]
-                    if not isinstance(temp, str):
-                        tx += temp
-
-        elif coin == "STXO":  # Calculate Spent
-            spent: list = list(self.get_history["STXO"])
-
-            for s in range(len(spent)):
-                if spent[s] is not None:
-                    temp = spent[s][0]["operation"][0]["asset"]
-                    if not isinstance(temp, str):
-                        tx += temp
-        else:
+        if self.get_history is None:  # No transactions yet
+            return tx
+        if coin not in ("UTXO", "STXO"):
             raise BaseException(f"Invalid coin {coin}!")
+        for entry in self.get_history[coin]:
+            if entry is not None:
+                records, i, j = entry
+                temp = records[i].operations[j].asset
+                if not isinstance(temp, (str, bytes)):
+                    tx += temp
         return tx
 
     def _update_tx_history(self, tx: Transaction):
-        """Function keeps record of transactions for account"""
-
-        data_struct = np.dtype([("UTXO", "O"), ("STXO", "O")])
-        temp_tx = None
-
-        if tx.get_trasaction_list[0]["operation"][0]["sender"] == self.get_account_id:
-            temp_tx = np.array([(None, tx.get_trasaction_list)], dtype=data_struct)
-
-        if tx.get_trasaction_list[0]["operation"][0]["receiver"] == self.get_account_id:
-            temp_tx = np.array([(tx.get_trasaction_list, None)], dtype=data_struct)
-
-        if self._tx_history is not None:
-            self._tx_history = np.append(self._tx_history, temp_tx)
-        else:
-            self._tx_history = temp_tx
-        # print(self._tx_history)
+        """
+        Function keeps record of transactions for account: one row per operation
+        of the transaction this account sends or receives.
+        """
+        records = None
+        for i, entry in enumerate(tx.get_trasaction_list):
+            for j, operation in enumerate(entry["operation"]):
+                asset = operation["asset"]
+                coins = 0 if isinstance(asset, (str, bytes)) else asset  # Properties carry no coins
+                received = operation["receiver"] == self.get_account_id
+                sent = operation["sender"] == self.get_account_id
+                if not (received or sent):  # Operation does not involve this account
+                    continue
+
+                if records is None:
+                    records = pack_transactions(tx.get_trasaction_list)
+                if self._tx_history is None:
+                    self._tx_history = GrowableArray(HISTORY_STRUCT)
+                if received:
+                    self._unspent += coins
+                    self._tx_history.append(((records, i, j), None))
+                if sent:
+                    self._spent += coins
+                    self._tx_history.append((None, (records, i, j)))
 
     def print_tx_history(self, tx: str | None = None) -> None:
         """
@@ -393,15 +588,18 @@ class Account:
                     or
                 "STXO" for Spent Transaction Outputs
         """
+        def view(column: str) -> list:
+            return [r if r is None else unpack_transactions(r[0]) for r in self.get_history[column]]
+
         if tx == "UTXO":
-            temp = list(self.get_history["UTXO"])
+            temp = view("UTXO")
             print(f"UTXO: {json.dumps(temp, indent=2)}", end="\n")
         elif tx == "STXO":
-            temp = list(self.get_history["STXO"])
+            temp = view("STXO")
             print(f"STXO: {json.dumps(temp, indent=2)}", end="\n")
         else:
-            temp = list(self.get_history["UTXO"])
-            temp2 = list(self.get_history["STXO"])
+            temp = view("UTXO")
+            temp2 = view("STXO")
             print(f"UTXO: {json.dumps(temp, indent=2)}", end="\n")
             print(f"STXO: {json.dumps(temp2, indent=2)}", end="\n")
 
@@ -447,22 +645,30 @@ class SpecialAccount(Account):
     def __init__(
         self,
         _account_id: bytes = b"",
-        wallet: NDArray[
+        wallet: GrowableArray | NDArray[
             Shape["1,0"],
-            Structure["PrivateKey: Object, PublicKey: Object, Modulus: Object"],
+            Structure[
+                "PrivateKey: Object, PublicKey: Object, Modulus: Object, "
+                "Prime1: Object, Prime2: Object, Exponent1: Object, "
+                "Exponent2: Object, Coefficient: Object"
+            ],
         ] = np.empty([1, 0], dtype="O"),
-        _properties: dict = dict(),
-        _tx_history: NDArray[Shape["2,2"], Structure["UTXO: Object, STXO: Object"]]
+        _properties: dict | None = None,
+        _tx_history: GrowableArray
+        | NDArray[Shape["2,2"], Structure["UTXO: Object, STXO: Object"]]
         | None = None,
         test_coins: int = 0,
     ) -> None:
     
-        super().__init__(_account_id, wallet, _properties, _tx_history)
+        # A fresh dict per account: a shared default would hand one account's deeds to all
+        super().__init__(_account_id, wallet, _properties if _properties is not None else {}, _tx_history)
         self.test_coins = test_coins
 
 
-    def gen_account(self) -> "Account":
-        obj = super().gen_account()
+    def gen_account(
+        self, pool: Optional[KeyPool] = None, seed: Optional[bytes] = None
+    ) -> "Account":
+        obj = super().gen_account(pool, seed)
         """Sets first UTXO: Statically for test purposes"""
         temp_utxo = [
             {
@@ -472,7 +678,7 @@ class SpecialAccount(Account):
                 "sig": None,
             }
         ]
-        tx = TX.create_operation(temp_utxo, RANDNONCE(os.urandom(4), sys.byteorder))
+        tx = Transaction().create_operation(temp_utxo, RANDNONCE(os.urandom(4), sys.byteorder))
         obj._update_tx_history(tx)
         obj.test_coins = self.test_coins
         return obj
@@ -0,0 +1,35 @@
+"""
+Micro benchmarks for the hot paths of the blockchain.
+
+Run from the ``main`` directory so local modules resolve, e.g.
+    python -m bench.sign
+"""
+import time
+from typing import Callable
+
+
+def measure(fn: Callable[[], object], rounds: int) -> dict[str, float]:
+    """
+    Calls fn rounds times and returns timing statistics in seconds.
+
+    :fn:
+        a zero-argument callable to time
+
+    :rounds:
+        number of calls
+    """
+    samples: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    total = sum(samples)
+    return {
+        "rounds": rounds,
+        "total": total,
+        "mean": total / rounds,
+        "p50": samples[rounds // 2],
+        "p99": samples[min(rounds - 1, (rounds * 99) // 100)],
+        "ops_per_sec": rounds / total if total else float("inf"),
+    }
@@ -0,0 +1,112 @@
+"""
+Runs the benchmark suites and writes one machine-readable JSON report.
+
+Run from the ``main`` directory:
+    python -m bench --scale quick
+    python -m bench --scale full --output results/2026-10-17.json
+    python -m bench --only crypto ledger
+
+The report holds the environment (commit, interpreter, cores) next to the results,
+so runs from different commits or machines can be compared.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import importlib
+import subprocess
+import traceback
+
+# Suite module -> keyword arguments of its run() per scale
+SUITES: dict[str, dict[str, dict]] = {
+    "crypto": {
+        "quick": {"key_sizes": (512,), "keygen_rounds": 1, "rounds": 20},
+        "full": {"key_sizes": (512, 1024), "keygen_rounds": 5, "rounds": 200},
+    },
+    "sign": {"quick": {"rounds": 20}, "full": {"rounds": 200}},
+    "script": {"quick": {"rounds": 200}, "full": {"rounds": 2000}},
+    "ledger": {
+        "quick": {"sizes": (10, 100), "history_sizes": (1_000, 10_000), "chain_sizes": (1, 10), "rounds": 2},
+        "full": {"sizes": (10, 100, 1000), "history_sizes": (1_000, 10_000, 100_000), "chain_sizes": (1, 10, 100), "rounds": 5},
+    },
+    "validation": {"quick": {"operations": 200, "rounds": 2}, "full": {"operations": 2000, "rounds": 3}},
+    "service": {
+        "quick": {"submitters": 500, "block_sizes": (50,)},
+        "full": {"submitters": 5000, "block_sizes": (50, 500)},
+    },
+    "encoding": {"quick": {"transactions": 200, "rounds": 5}, "full": {"transactions": 1000, "rounds": 20}},
+    "history": {
+        "quick": {"sizes": (1_000, 10_000), "baseline_max": 1_000},
+        "full": {"sizes": (10_000, 100_000, 1_000_000), "baseline_max": 10_000},
+    },
+    "records": {"quick": {"sizes": (100_000,)}, "full": {"sizes": (100_000, 1_000_000)}},
+    "sizes": {"quick": {"operations": 200}, "full": {"operations": 1000}},
+    "blockstore": {"quick": {"blocks": 200}, "full": {"blocks": 2000}},
+    "keypool": {"quick": {"rounds": 4, "cold_rounds": 1}, "full": {"rounds": 32, "cold_rounds": 3}},
+    "derivation": {"quick": {"keys": 2, "rounds": 10}, "full": {"keys": 16, "rounds": 100}},
+    "importtime": {"quick": {}, "full": {}},
+}
+
+
+def environment(scale: str) -> dict:
+    """Describes the run, for comparing reports"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "scale": scale,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suites(names: list[str], scale: str) -> dict:
+    """
+    a function that runs suites one after the other.
+    A failing suite is reported with its error and does not stop the others.
+    """
+    report = {"environment": environment(scale), "results": {}}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(f"bench.{name}")
+            result = module.run(**SUITES[name][scale])
+        except Exception:
+            result = {"error": traceback.format_exc(limit=3)}
+        report["results"][name] = {
+            "elapsed_s": time.perf_counter() - start,
+            "result": result,
+        }
+        print(f"{name}: {report['results'][name]['elapsed_s']:.1f}s", file=sys.stderr)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scale", choices=("quick", "full"), default="quick")
+    parser.add_argument("--only", nargs="*", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    text = json.dumps(run_suites(args.only, args.scale), indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""BlockStore append throughput per fsync batch size, and lookup latency"""
+import json
+import random
+import argparse
+import tempfile
+import time
+from hashlib import sha256
+
+from block import Block
+from blockstore import BlockStore
+
+from bench import measure
+
+
+def _chain(blocks: int) -> list[Block]:
+    chain, prev_hash = [], "0".zfill(64)
+    for i in range(blocks):
+        tx_id = sha256(str(i).encode("ascii")).hexdigest()
+        block = Block().create_block(prev_hash, [[{"transaction_id": tx_id, "operation": [], "nonce": i}]])
+        chain.append(block)
+        prev_hash = block.block_id
+    return chain
+
+
+def run(blocks: int = 2000, sync_batches: tuple[int, ...] = (1, 64, 0)) -> dict:
+    """
+    :blocks:
+        blocks appended per run
+
+    :sync_batches:
+        values of BlockStore.sync_every to compare. 0 syncs only on close.
+    """
+    chain = _chain(blocks)
+    results: dict = {}
+    for sync_every in sync_batches:
+        with tempfile.TemporaryDirectory() as path:
+            with BlockStore(path, sync_every=sync_every) as store:
+                start = time.perf_counter()
+                for block in chain:
+                    store.append(block)
+                store.sync()
+                elapsed = time.perf_counter() - start
+
+                ids = [block.block_id for block in random.sample(chain, min(200, blocks))]
+                heights = iter(random.choices(range(blocks), k=len(ids)))
+                id_iter = iter(ids)
+                by_id = measure(lambda: store.get_by_id(next(id_iter)), len(ids))
+                by_height = measure(lambda: store.get_by_height(next(heights)), len(ids))
+            results[f"sync_every_{sync_every}"] = {
+                "append_s": elapsed,
+                "appends_per_sec": blocks / elapsed,
+                "get_by_id": by_id,
+                "get_by_height": by_height,
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--sync-batches", type=int, nargs="*", default=[1, 64, 0])
+    args = parser.parse_args()
+    print(json.dumps(run(args.blocks, tuple(args.sync_batches)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Key generation, export, signing and verification at growing key sizes"""
+import json
+import argparse
+
+from keypair import KeyPair
+from signature import Signature
+
+from bench import measure
+
+KEY_SIZES = (512, 1024)
+
+
+def run(key_sizes: tuple[int, ...] = KEY_SIZES, keygen_rounds: int = 3, rounds: int = 100) -> dict:
+    """
+    :key_sizes:
+        bit sizes of each prime, as KeyPair(key_bytes=...)
+
+    :keygen_rounds:
+        key pairs generated per size; prime search dominates and varies a lot
+
+    :rounds:
+        signatures made and verified, and keys exported, per size
+    """
+    msg = b"benchmark payment operation"
+    results = {}
+    for size in key_sizes:
+        keys = KeyPair(key_bytes=size)
+        keygen = measure(keys.gen_key_pair, keygen_rounds)
+        kPr, kPub = keys.gen_key_pair().values()
+        crt = keys.get_crt_params
+        signer = Signature()
+        sig = signer.sign_data(kPr, msg)
+        assert signer.verify_signature(msg, sig, kPub)
+
+        results[str(size)] = {
+            "gen_key_pair": keygen,
+            "sign_data": measure(lambda: signer.sign_data(kPr, msg), rounds),
+            "sign_data_crt": measure(lambda: signer.sign_data_crt(crt, msg), rounds),
+            "verify_signature": measure(lambda: signer.verify_signature(msg, sig, kPub), rounds),
+            "export_der": measure(keys.to_string, rounds),
+            "export_pem": measure(lambda: keys.to_string(key="Private", format="PEM"), rounds),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--key-sizes", type=int, nargs="*", default=list(KEY_SIZES))
+    parser.add_argument("--keygen-rounds", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.key_sizes), args.keygen_rounds, args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
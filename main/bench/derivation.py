@@ -0,0 +1,71 @@
+"""Wallet sub-key creation: KeyPair.gen_key_pair from the previous private key against seeded derivation"""
+import json
+import time
+import argparse
+
+from keypair import KeyPair
+from keypool import gen_wallet_entry
+from signature import Signature
+from derivation import derive_wallet_entry, derive_wallet_entries, wallet_seed
+
+from bench import measure
+
+
+def run(keys: int = 8, key_bytes: int = 1024, workers: int | None = None, rounds: int = 50) -> dict:
+    """
+    :keys:
+        sub-keys created by each method
+
+    :key_bytes:
+        bit size of each prime
+
+    :workers:
+        processes for the batch derivation; defaults to the number of cores
+
+    :rounds:
+        signature verifications timed per key
+    """
+    root = gen_wallet_entry(key_bytes)
+    seed = wallet_seed(root)
+
+    def legacy() -> tuple:
+        """The path add_key_pair_to_wallet took: the private exponent is the starting e"""
+        keypair = KeyPair(key_bytes=key_bytes)
+        kPrv, kPub = keypair.gen_key_pair(root[0]).values()
+        return kPrv, kPub
+
+    index = iter(range(1, 10**6))
+    results = {
+        "previous": measure(legacy, keys),
+        "derive": measure(lambda: derive_wallet_entry(seed, next(index), key_bytes), keys),
+    }
+    start = time.perf_counter()
+    derive_wallet_entries(seed, range(10**6, 10**6 + keys), key_bytes, workers)
+    elapsed = time.perf_counter() - start
+    results["derive_batch"] = {"keys": keys, "total": elapsed, "keys_per_sec": keys / elapsed}
+
+    # * Every verification of an operation pays for e
+    kPrv, kPub = legacy()
+    child = derive_wallet_entry(seed, 0, key_bytes)
+    signer = Signature()
+    sig = signer.sign_data(kPrv, b"verify")
+    child_sig = signer.sign_data((child[0], child[2]), b"verify")
+    results["verify_previous"] = measure(lambda: signer.verify_signature(b"verify", sig, kPub), rounds)
+    results["verify_derived"] = measure(
+        lambda: signer.verify_signature(b"verify", child_sig, (child[2], child[1])), rounds
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=8)
+    parser.add_argument("--key-bytes", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.keys, args.key_bytes, args.workers, args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Transaction and block hashing/serialization: repr + JSON against the canonical binary encoding"""
+import os
+import json
+import argparse
+from hashlib import sha256
+
+from block import Block
+from transaction import Transaction
+
+from bench import measure
+
+
+def _transactions(count: int) -> list[Transaction]:
+    """Transactions shaped like Account.create_payment_op output"""
+    txs = []
+    for i in range(count):
+        op = [
+            {
+                "sender": sha256(b"sender%d" % i).hexdigest(),
+                "receiver": sha256(b"receiver%d" % i).hexdigest(),
+                "asset": 100 + i,
+                "sig": os.urandom(256).hex(),
+            }
+        ]
+        txs.append(Transaction().create_operation(op, i))
+    return txs
+
+
+def run(transactions: int = 1000, rounds: int = 20) -> dict:
+    """
+    :transactions:
+        transactions per block
+
+    :rounds:
+        repetitions of each measurement
+    """
+    txs = _transactions(transactions)
+    tx_lists = [tx.get_trasaction_list for tx in txs]
+    block = Block().create_block("0".zfill(64), tx_lists)
+    tx = txs[0]
+
+    def repr_hash() -> None:
+        for t in txs:
+            sha256(str((t.set_of_operations, t.nonce)).encode("ascii")).hexdigest()
+
+    def binary_hash() -> None:
+        for t in txs:
+            t._digest = None
+            t.eval()
+
+    tx_bytes = tx.to_bytes()
+    block_bytes = block.to_bytes()
+    return {
+        "tx_hash_repr": measure(repr_hash, rounds),
+        "tx_hash_binary": measure(binary_hash, rounds),
+        "tx_size_json": len(tx.to_string().encode("utf-8")),
+        "tx_size_binary": len(tx_bytes),
+        "block_size_json": len(block.to_string().encode("utf-8")),
+        "block_size_binary": len(block_bytes),
+        "tx_to_string": measure(lambda: [t.to_string() for t in txs], rounds),
+        "tx_to_bytes": measure(lambda: [t.to_bytes() for t in txs], rounds),
+        "block_to_string": measure(block.to_string, rounds),
+        "block_to_bytes": measure(block.to_bytes, rounds),
+        "block_json_loads": measure(lambda: json.loads(block.to_string()), rounds),
+        "block_from_bytes": measure(lambda: Block.from_bytes(block_bytes), rounds),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.transactions, args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Transaction history growth: np.append against GrowableArray"""
+import json
+import time
+import argparse
+
+import numpy as np
+
+from account import HISTORY_STRUCT
+from growable import GrowableArray
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _tx(i: int) -> list[dict]:
+    """A small transaction list shaped like Transaction.get_trasaction_list"""
+    return [{"transaction_id": i, "operation": [{"asset": 1}], "nonce": i}]
+
+
+def time_np_append(entries: int) -> float:
+    """Seconds to build a history of entries rows with np.append (copies on every insert)"""
+    history = None
+    start = time.perf_counter()
+    for i in range(entries):
+        temp = np.array([(_tx(i), None)], dtype=HISTORY_STRUCT)
+        history = temp if history is None else np.append(history, temp)
+    return time.perf_counter() - start
+
+
+def time_growable(entries: int) -> float:
+    """Seconds to build a history of entries rows with GrowableArray"""
+    history = GrowableArray(HISTORY_STRUCT)
+    start = time.perf_counter()
+    for i in range(entries):
+        history.append((_tx(i), None))
+    elapsed = time.perf_counter() - start
+    assert len(history["UTXO"]) == entries
+    return elapsed
+
+
+def run(sizes: tuple[int, ...] = SIZES, baseline_max: int = 10_000) -> dict:
+    """
+    :sizes:
+        history sizes to build
+
+    :baseline_max:
+        largest size timed with np.append; its O(n^2) cost makes larger runs impractical
+    """
+    results = {}
+    for size in sizes:
+        growable = time_growable(size)
+        baseline = time_np_append(size) if size <= baseline_max else None
+        results[str(size)] = {
+            "np_append_s": baseline,
+            "growable_s": growable,
+            "growable_appends_per_sec": size / growable,
+            "speedup": baseline / growable if baseline else None,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(SIZES))
+    parser.add_argument("--baseline-max", type=int, default=10_000)
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.sizes), args.baseline_max), indent=2))
+
+
+if __name__ == "__main__":
+    main()
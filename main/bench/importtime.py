@@ -0,0 +1,78 @@
+"""Cold-start import latency of each module, measured with python -X importtime"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+MODULES = (
+    "signature",
+    "keypair",
+    "script",
+    "operation",
+    "transaction",
+    "block",
+    "verifier",
+    "keypool",
+    "account",
+    "blockchain",
+)
+
+# Third party packages that should only be imported on the paths that use them
+HEAVY = ("numpy", "nptyping", "pyasn1", "Crypto")
+
+
+def import_profile(module: str) -> dict:
+    """
+    Imports module in a fresh interpreter and parses the -X importtime report.
+
+    :module:
+        name of a module in the main directory
+
+    :return:
+        cumulative import time in microseconds, wall time of the process
+        and the heavy packages pulled in.
+    """
+    main_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=main_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line[len("import time:") :].split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum)
+
+    return {
+        "cumulative_us": cumulative.get(module, 0),
+        "process_wall_s": wall,
+        "heavy_imports": sorted(
+            pkg for pkg in HEAVY if pkg in cumulative
+        ),
+    }
+
+
+def run(modules: tuple[str, ...] = MODULES) -> dict:
+    return {module: import_profile(module) for module in modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.modules)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
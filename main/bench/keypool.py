@@ -0,0 +1,46 @@
+"""Account creation latency with and without a pre-generated KeyPool"""
+import json
+import time
+import argparse
+
+from account import Account
+from keypool import KeyPool
+
+from bench import measure
+
+
+def run(rounds: int = 32, cold_rounds: int = 3, workers: int | None = None) -> dict:
+    """
+    Times Account.gen_account drawing keys from a warmed pool against generating inline.
+
+    :rounds:
+        accounts created from the pool (the pool is warmed to this size first)
+
+    :cold_rounds:
+        accounts created without a pool
+    """
+    cold = measure(lambda: Account().gen_account(), cold_rounds)
+
+    with KeyPool(low_watermark=rounds // 2, high_watermark=rounds, max_workers=workers) as pool:
+        while len(pool) < rounds:  # * Warm up: wait for the background workers
+            time.sleep(0.05)
+        warm = measure(lambda: Account().gen_account(pool), rounds)
+
+    return {
+        "gen_account": cold,
+        "gen_account_pooled": warm,
+        "p99_speedup": cold["p99"] / warm["p99"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=32)
+    parser.add_argument("--cold-rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rounds, args.cold_rounds, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Ledger hot paths at growing sizes: transactions, blocks, balances and block validation"""
+import json
+import time
+import argparse
+
+from block import Block
+from keypair import KeyPair
+from account import Account, SpecialAccount
+from blockchain import Blockchain
+from transaction import Transaction
+
+from bench import measure
+from test.helpers import make_block, make_signers
+
+SIZES = (10, 100, 1000)
+HISTORY_SIZES = (1_000, 10_000, 100_000)
+CHAIN_SIZES = (1, 10, 100)
+
+
+def _ops(count: int) -> list[dict]:
+    """Payment operations shaped like Operation.get_operation_list"""
+    return [
+        {"sender": f"{i:064x}", "receiver": f"{i + 1:064x}", "asset": i + 1, "sig": "ab" * 256}
+        for i in range(count)
+    ]
+
+
+def bench_transactions(sizes: tuple[int, ...], rounds: int) -> dict:
+    """Transaction.create_operation (which hashes) by number of operations"""
+    results = {}
+    for size in sizes:
+        ops = _ops(size)
+        results[str(size)] = measure(lambda: Transaction().create_operation(ops, 1), rounds)
+    return results
+
+
+def bench_blocks(sizes: tuple[int, ...], rounds: int) -> dict:
+    """Block.create_block (Merkle root and block hash) by number of transactions"""
+    results = {}
+    for size in sizes:
+        txs = [Transaction().create_operation(_ops(1), i).get_trasaction_list for i in range(size)]
+        results[str(size)] = measure(lambda: Block().create_block("0".zfill(64), txs), rounds)
+    return results
+
+
+def bench_balances(sizes: tuple[int, ...], rounds: int) -> dict:
+    """Account.get_balance and the full recount of audit_balance by history size"""
+    results = {}
+    for size in sizes:
+        account = Account(_account_id="alice")
+        for i in range(size):
+            op = {"sender": "faucet", "receiver": "alice", "asset": 1, "sig": None}
+            account._update_tx_history(Transaction(str(i), [op], i))
+        results[str(size)] = {
+            "get_balance": measure(lambda: account.get_balance, rounds),
+            "audit_balance": measure(account.audit_balance, max(1, rounds // 100)),
+        }
+    return results
+
+
+def bench_validate_block(
+    block_sizes: tuple[int, ...], chain_sizes: tuple[int, ...], rounds: int
+) -> dict:
+    """
+    Blockchain.validate_block by operations per block, then by chain length.
+    Every round validates a new block, since a block is only accepted once.
+    """
+    signers = make_signers(4)
+    nonce = 0
+
+    def new_chain() -> Blockchain:
+        blockchain = Blockchain()
+        for account_id, _, kPub in signers:
+            blockchain.key_registry[account_id] = kPub
+            blockchain.state.seed(account_id, 10**12)
+        return blockchain
+
+    def timed(blockchain: Blockchain, operations: int) -> dict:
+        nonlocal nonce
+        blocks, prev_hash = [], blockchain.tip_id
+        for _ in range(rounds):  # * Signing and linking are not measured
+            blocks.append(make_block(operations, signers, prev_hash, nonce))
+            prev_hash, nonce = blocks[-1].block_id, nonce + operations
+        chain = iter(blocks)
+        return measure(lambda: blockchain.validate_block(next(chain)), rounds)
+
+    by_block = {str(size): timed(new_chain(), size) for size in block_sizes}
+
+    by_chain = {}
+    blockchain = new_chain()
+    for size in chain_sizes:
+        while len(blockchain.block_history) < size:
+            blockchain.validate_block(make_block(1, signers, blockchain.tip_id, nonce))
+            nonce += 1
+        by_chain[str(size)] = timed(blockchain, block_sizes[0])
+    return {"by_block_size": by_block, "by_chain_length": by_chain}
+
+
+def bench_batch_payments(sizes: tuple[int, ...]) -> dict:
+    """
+    N payments as N single-operation transactions against one N-operation transaction:
+    signing and recording, stored block bytes and block validation, per payment.
+    """
+    results = {}
+    for size in sizes:
+        blockchain = Blockchain(faucet_coins=10**9)
+        payer = SpecialAccount(test_coins=10**9).gen_account()
+        payer.add_key_pair_to_wallet(KeyPair())
+        blockchain.register_account(payer)
+        blockchain.state.seed(payer.get_account_id, 10**9)
+        recipients = [Account(_account_id=f"{i:064x}") for i in range(size)]
+
+        def per_payment(build) -> dict:
+            start = time.perf_counter()
+            txs = build()
+            created = time.perf_counter() - start
+            block = Block().create_block(blockchain.tip_id, [tx.get_trasaction_list for tx in txs])
+            start = time.perf_counter()
+            blockchain.validate_block(block)
+            validated = time.perf_counter() - start
+            return {
+                "create_us": created / size * 1e6,
+                "validate_us": validated / size * 1e6,
+                "block_bytes": len(block.to_bytes()) / size,
+            }
+
+        amounts = iter(range(1, 2 * size + 1))  # * Distinct amounts: no signature is reused
+        single = per_payment(
+            lambda: [payer.create_payment_op(r, next(amounts), 1) for r in recipients]
+        )
+        batch = per_payment(
+            lambda: [payer.create_batch_payment([(r, next(amounts)) for r in recipients], 1)]
+        )
+        results[str(size)] = {"single": single, "batch": batch}
+    return results
+
+
+def run(
+    sizes: tuple[int, ...] = SIZES,
+    history_sizes: tuple[int, ...] = HISTORY_SIZES,
+    chain_sizes: tuple[int, ...] = CHAIN_SIZES,
+    rounds: int = 5,
+) -> dict:
+    """
+    :sizes:
+        operations per transaction, transactions per block and operations per validated block
+
+    :history_sizes:
+        transaction history sizes for the balance benchmark
+
+    :chain_sizes:
+        chain lengths at which a block is validated
+    """
+    return {
+        "transaction_create": bench_transactions(sizes, rounds * 20),
+        "block_create": bench_blocks(sizes, rounds * 4),
+        "account_balance": bench_balances(history_sizes, rounds * 200),
+        "validate_block": bench_validate_block(sizes, chain_sizes, rounds),
+        "batch_payment": bench_batch_payments(sizes),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(SIZES))
+    parser.add_argument("--history-sizes", type=int, nargs="*", default=list(HISTORY_SIZES))
+    parser.add_argument("--chain-sizes", type=int, nargs="*", default=list(CHAIN_SIZES))
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.sizes), tuple(args.history_sizes), tuple(args.chain_sizes), args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Memory per stored transaction: transaction lists of dicts against records"""
+import os
+import json
+import time
+import argparse
+import tracemalloc
+from hashlib import sha256
+
+from records import pack_transactions, unpack_transactions
+
+SIZES = (100_000, 1_000_000)
+
+
+def _tx(i: int) -> list[dict]:
+    """A signed payment shaped like Transaction.get_trasaction_list, with a 1024-bit signature"""
+    return [
+        {
+            "transaction_id": sha256(b"tx%d" % i).hexdigest(),
+            "operation": [
+                {
+                    "sender": sha256(b"sender%d" % i).hexdigest(),
+                    "receiver": sha256(b"receiver%d" % i).hexdigest(),
+                    "asset": i + 1,
+                    "sig": os.urandom(128).hex(),
+                }
+            ],
+            "nonce": i,
+        }
+    ]
+
+
+def _traced(build) -> tuple[object, int]:
+    """Returns what build made and the bytes it allocated"""
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes: tuple[int, ...] = SIZES) -> dict:
+    """
+    :sizes:
+        numbers of stored transactions
+    """
+    results = {}
+    for size in sizes:
+        lists, list_bytes = _traced(lambda: [_tx(i) for i in range(size)])
+        records, record_bytes = _traced(lambda: [pack_transactions(tx_list) for tx_list in lists])
+        start = time.perf_counter()  # * Timed again untraced; tracing slows allocation
+        for tx_list in lists:
+            pack_transactions(tx_list)
+        pack_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for item in records:
+            unpack_transactions(item)
+        unpack_s = time.perf_counter() - start
+        results[str(size)] = {
+            "dict_bytes_per_tx": list_bytes / size,
+            "record_bytes_per_tx": record_bytes / size,
+            "reduction": 1 - record_bytes / list_bytes,
+            "pack_us_per_tx": pack_s / size * 1e6,
+            "unpack_us_per_tx": unpack_s / size * 1e6,
+        }
+        del lists, records
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(SIZES))
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.sizes)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
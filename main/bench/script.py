@@ -0,0 +1,53 @@
+"""Scripts per second: Script.eval against the compiled bytecode interpreter"""
+import json
+import argparse
+from hashlib import sha256
+
+import bytecode
+from keypair import KeyPair
+from script import Script, asset_to_bytes
+from signature import Signature
+
+from bench import measure
+
+
+def run(rounds: int = 2000) -> dict:
+    """
+    :rounds:
+        scripts evaluated per path
+    """
+    kPr, kPub = KeyPair().gen_key_pair().values()
+    amount = 150
+    sig = Signature().sign_data(kPr, asset_to_bytes(amount))
+    pub_hex = str(kPub).encode("ascii").hex()
+    account_id = sha256(str(kPub).encode("ascii")).hexdigest()
+
+    unlocking = f"{sig.hex()} {pub_hex}"
+    locking = f"DUP SHA256 {account_id} EQUALVERIFY CHECKSIG"
+    op_codes = f"{unlocking} {locking}"
+    msg = asset_to_bytes(amount)
+    assert Script(op_codes, amount).eval() and bytecode.run_script((unlocking, locking), msg)
+
+    def cold() -> None:
+        bytecode._cache.clear()
+        bytecode.parse_public_key.cache_clear()
+        bytecode.run_script((unlocking, locking), msg)
+
+    results = {
+        "script_eval": measure(lambda: Script(op_codes, amount).eval(), rounds),
+        "bytecode_cached": measure(lambda: bytecode.run_script((unlocking, locking), msg), rounds),
+        "bytecode_cold": measure(cold, rounds),
+    }
+    results["speedup_cached"] = results["script_eval"]["mean"] / results["bytecode_cached"]["mean"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""LedgerService under concurrent submitters: throughput, submit latency and event loop lag"""
+import json
+import time
+import asyncio
+import argparse
+
+from blockchain import Blockchain
+from service import LedgerService
+
+from test.helpers import make_block, make_signers
+
+
+async def _submit_all(service: LedgerService, txs: list, tick: float) -> tuple[list[float], float]:
+    """Submits every transaction concurrently while a ticker measures how late the loop wakes it"""
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(tick)
+            lags.append(time.perf_counter() - start - tick)
+
+    async def submitter(tx: list) -> float:
+        start = time.perf_counter()
+        await service.submit(tx)
+        return time.perf_counter() - start
+
+    ticking = asyncio.create_task(ticker())
+    latencies = await asyncio.gather(*(submitter(tx) for tx in txs))
+    done.set()
+    await ticking
+    return sorted(latencies), max(lags, default=0.0)
+
+
+def run(submitters: int = 2000, block_sizes: tuple[int, ...] = (50, 500), max_delay: float = 0.05) -> dict:
+    """
+    :submitters:
+        concurrent submit calls, one signed payment each
+
+    :block_sizes:
+        max_block_txs values to compare
+    """
+    signers = make_signers(4)
+    txs = make_block(submitters, signers).transactions  # * Signed once, outside the timing
+    results = {}
+    for block_size in block_sizes:
+        blockchain = Blockchain()
+        for account_id, _, kPub in signers:
+            blockchain.key_registry[account_id] = kPub
+            blockchain.state.seed(account_id, 10**12)
+
+        async def main() -> tuple[list[float], float, float]:
+            async with LedgerService(blockchain, max_block_txs=block_size, max_delay=max_delay) as service:
+                start = time.perf_counter()
+                latencies, lag = await _submit_all(service, txs, tick=0.001)
+                return latencies, lag, time.perf_counter() - start
+
+        latencies, lag, elapsed = asyncio.run(main())
+        last = len(latencies) - 1
+        results[str(block_size)] = {
+            "blocks": len(blockchain.block_history),
+            "elapsed_s": elapsed,
+            "tx_per_sec": len(latencies) / elapsed,
+            "submit_p50_s": latencies[last // 2],
+            "submit_p99_s": latencies[last * 99 // 100],
+            "max_loop_lag_s": lag,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--submitters", type=int, default=2000)
+    parser.add_argument("--block-sizes", type=int, nargs="*", default=[50, 500])
+    parser.add_argument("--max-delay", type=float, default=0.05)
+    args = parser.parse_args()
+    print(json.dumps(run(args.submitters, tuple(args.block_sizes), args.max_delay), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compares plain RSA signing with the CRT signing path of Signature"""
+import json
+import argparse
+
+from keypair import KeyPair
+from signature import Signature
+
+from bench import measure
+
+
+def run(rounds: int = 200, key_bytes: int = 1024) -> dict:
+    """
+    Signs the same message with sign_data and sign_data_crt.
+
+    :rounds:
+        number of signatures per path
+
+    :key_bytes:
+        bit size of each prime
+    """
+    keys = KeyPair(key_bytes=key_bytes)
+    kPr = keys.gen_key_pair()["Kpr"]
+    crt = keys.get_crt_params
+    signer = Signature()
+    msg = b"benchmark payment operation"
+
+    # * Both paths must agree before timing them
+    assert signer.sign_data(kPr, msg) == signer.sign_data_crt(crt, msg)
+
+    plain = measure(lambda: signer.sign_data(kPr, msg), rounds)
+    fast = measure(lambda: signer.sign_data_crt(crt, msg), rounds)
+    return {
+        "sign_data": plain,
+        "sign_data_crt": fast,
+        "speedup": plain["mean"] / fast["mean"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--key-bytes", type=int, default=1024)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rounds, args.key_bytes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Stored block size: signatures padded to bit_length() bytes against modulus-width signatures"""
+import json
+import argparse
+
+from block import Block
+from script import asset_to_bytes, legacy_asset_to_bytes
+from transaction import Transaction
+
+from test.helpers import make_block, make_signers
+
+
+def _pad_legacy(block: Block) -> Block:
+    """The block with every signature widened to bit_length() bytes, as earlier versions wrote it"""
+    txs = []
+    for tx_list in block.transactions:
+        tx = tx_list[0]
+        ops = []
+        for op in tx["operation"]:
+            value = int.from_bytes(bytes.fromhex(op["sig"]), "little")
+            ops.append({**op, "sig": value.to_bytes(value.bit_length(), "little").hex()})
+        txs.append(Transaction().create_operation(ops, tx["nonce"]).get_trasaction_list)
+    return Block().create_block(block.prev_hash, txs)
+
+
+def run(operations: int = 1000, amounts: tuple[int, ...] = (1, 1_000, 10**9)) -> dict:
+    """
+    :operations:
+        signed payments in the block
+
+    :amounts:
+        coin amounts whose signed message sizes are compared
+    """
+    block = make_block(operations, make_signers(4))
+    legacy = _pad_legacy(block)
+    fixed_bytes, legacy_bytes = len(block.to_bytes()), len(legacy.to_bytes())
+    return {
+        "block_bytes": {"legacy": legacy_bytes, "fixed": fixed_bytes},
+        "bytes_per_operation": {"legacy": legacy_bytes / operations, "fixed": fixed_bytes / operations},
+        "json_bytes": {"legacy": len(legacy.to_string()), "fixed": len(block.to_string())},
+        "reduction": legacy_bytes / fixed_bytes,
+        "amount_message_bytes": {
+            str(amount): {"legacy": len(legacy_asset_to_bytes(amount)), "fixed": len(asset_to_bytes(amount))}
+            for amount in amounts
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.operations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
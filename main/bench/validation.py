@@ -0,0 +1,50 @@
+"""Block validation latency: the staged validator in the calling process against a worker pool"""
+import os
+import json
+import argparse
+
+from sigcache import SIGCACHE
+from validation import BlockValidator
+
+from bench import measure
+from test.helpers import make_block, make_signers
+
+
+def run(operations: int = 2000, rounds: int = 3, workers: int | None = None) -> dict:
+    """
+    :operations:
+        signed operations in the block
+
+    :workers:
+        pool size; defaults to the number of cores
+    """
+    signers = make_signers(4)
+    registry = {account_id: kPub for account_id, _, kPub in signers}
+    block = make_block(operations, signers)
+    workers = workers or os.cpu_count() or 1
+
+    def validate(validator: BlockValidator) -> None:
+        SIGCACHE.clear()  # * Measure cold verification
+        validator.validate(block, "0".zfill(64), 0, {}, registry)
+
+    results: dict = {"operations": operations, "workers": workers}
+    with BlockValidator(max_workers=1) as serial:
+        results["serial"] = measure(lambda: validate(serial), rounds)
+    with BlockValidator(max_workers=workers) as pool:
+        validate(pool)  # * Start the workers outside the measurement
+        results["pool"] = measure(lambda: validate(pool), rounds)
+    results["speedup"] = results["serial"]["mean"] / results["pool"]["mean"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    print(json.dumps(run(args.operations, args.rounds, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
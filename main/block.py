@@ -1,7 +1,11 @@
 import json
 from hashlib import sha256
+from typing import Optional
 from dataclasses import dataclass, field
 
+from encoding import encode, decode
+from merkle import MerkleTree
+
 
 @dataclass(repr=False)
 class Block:
@@ -14,17 +18,27 @@ class Block:
 
     :transaction:
         a  list of transactions confirmed in this block.
+
+    :merkle_root:
+        root of the Merkle tree over the ids of the transactions. Lets light clients check
+        that a transaction is in the block with an O(log n) inclusion proof.
     """
 
     block_id: str = ""
     prev_hash: str = ""
     transactions: list = field(default_factory=lambda: list())
+    merkle_root: str = ""
+    _digest: Optional[str] = field(default=None, init=False, compare=False)
+    _tree: Optional[MerkleTree] = field(default=None, init=False, compare=False)
+    _leaf_index: dict = field(default_factory=lambda: dict(), init=False, compare=False)
 
     @classmethod
     def __create_block_helper(cls, prev_hash: str, transactions: list) -> "Block":
         """Helper function returns an new object of Block"""
-        block_id = cls("", prev_hash, transactions).eval()
-        return cls(block_id, prev_hash, transactions)
+        block = cls("", prev_hash, transactions)
+        block.merkle_root = block.get_merkle_root()
+        block.block_id = block.eval()
+        return block
 
     def create_block(self, prev_hash: str, transactions: list) -> "Block":
         """
@@ -41,11 +55,101 @@ class Block:
         """
         return self.__create_block_helper(prev_hash, transactions)
 
+    def iter_transactions(self):
+        """
+        a function that iterates over the transactions of the block.
+
+        :yields:
+            (position, transaction) pairs; position is the index in the transactions list.
+        """
+        for position, tx_list in enumerate(self.transactions):
+            for tx in tx_list:
+                yield position, tx
+
+    def add_transaction(self, tx_list: list[dict]) -> None:
+        """
+        a function that appends a transaction while the block is being assembled.
+        Only the Merkle path of the new transaction is rehashed.
+
+        :tx_list:
+            a transaction list (Transaction.get_trasaction_list)
+        """
+        tree = self.get_merkle_tree()
+        self.transactions.append(tx_list)
+        for tx in tx_list:
+            self._leaf_index.setdefault(tx["transaction_id"], tree.append(tx["transaction_id"]))
+        self.merkle_root = tree.get_root.hex()
+        self._digest = None
+        self.block_id = self.eval()
+
+    def get_merkle_tree(self) -> MerkleTree:
+        """Returns the Merkle tree of the transactions, built on first use"""
+        if self._tree is None:
+            self._tree, self._leaf_index = MerkleTree(), {}
+            for _, tx in self.iter_transactions():
+                index = self._tree.append(tx["transaction_id"])
+                self._leaf_index.setdefault(tx["transaction_id"], index)
+        return self._tree
+
+    def get_merkle_root(self) -> str:
+        """Returns the Merkle root computed from the transactions, as hex"""
+        return self.get_merkle_tree().get_root.hex()
+
+    def get_inclusion_proof(self, tx_id: str) -> list[tuple[str, bool]]:
+        """
+        a function that proves a transaction is in this block.
+
+        :tx_id:
+            transaction id
+
+        :returns:
+            Merkle proof, checked with Block.verify_inclusion against merkle_root.
+        """
+        self.get_merkle_tree()
+        if tx_id not in self._leaf_index:
+            raise ValueError(f"Transaction '{tx_id}' is not in block '{self.block_id}'")
+        return self._tree.get_proof(self._leaf_index[tx_id])
+
+    @staticmethod
+    def verify_inclusion(
+        tx_id: str, proof: list[tuple[str, bool]], merkle_root: str
+    ) -> bool:
+        """
+        a function that checks a transaction inclusion proof without the block's transactions.
+
+        :tx_id:
+            transaction id
+
+        :proof:
+            proof returned by get_inclusion_proof
+
+        :merkle_root:
+            Merkle root of the block
+        """
+        return MerkleTree.verify_proof(tx_id, proof, merkle_root)
+
     def eval(self) -> str:
-        """Return hash of the block"""
-        return sha256(
-            str((self.transactions, self.prev_hash)).encode("ascii")
-        ).hexdigest()
+        """Return hash of the block: computed once over the previous hash and the Merkle root of the transactions"""
+        if self._digest is None:
+            self._digest = sha256(
+                encode((self.prev_hash, self.get_merkle_root()))
+            ).hexdigest()
+        return self._digest
+
+    def to_bytes(self) -> bytes:
+        """
+        a function that serializes the block with the canonical binary encoding.
+        Smaller and faster than to_string; read back with Block.from_bytes.
+        """
+        return encode(
+            (self.block_id, self.prev_hash, self.merkle_root, self.transactions)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Block":
+        """Returns the Block serialized by to_bytes"""
+        block_id, prev_hash, merkle_root, transactions = decode(data)
+        return cls(block_id, prev_hash, transactions, merkle_root)
 
     def to_string(self) -> str:
         """
@@ -58,6 +162,7 @@ class Block:
             {
                 "block_id": self.block_id,
                 "prev_hash": self.prev_hash,
+                "merkle_root": self.merkle_root,
                 "transactions": self.transactions,
             }
         ]
@@ -74,7 +179,7 @@ if __name__ == "__main__":
     block = Block()
     tx = [
         {
-            "trasaction_id": "977b41effe56b110a30f628863e53d80cc623693fab31fd0e19f38aa61c3ced0",
+            "transaction_id": "977b41effe56b110a30f628863e53d80cc623693fab31fd0e19f38aa61c3ced0",
             "operation": [
                 {
                     "sender": "14bea94409798b67d78cfd9d544c8714af1e195f061395cdfc401f5891212434",
@@ -88,7 +193,7 @@ if __name__ == "__main__":
     ]
     tx2 = [
         {
-            "trasaction_id": "977b41effe56b110a30f628863e53d80cc623693fab31fd0e19f38aa61c3ced0",
+            "transaction_id": "977b41effe56b110a30f628863e53d80cc623693fab31fd0e19f38aa61c3ced0",
             "operation": [
                 {
                     "sender": "14bea94409798b67d78cfd9d544c8714af1e195f061395cdfc401f5891212434",
@@ -100,8 +205,8 @@ if __name__ == "__main__":
             "nonce": 785881423,
         }
     ]
-    block = block.create_block('0'.zfill(64), tx)
-    block2 = block.create_block(block.block_id, tx2)
+    block = block.create_block('0'.zfill(64), [tx])
+    block2 = block.create_block(block.block_id, [tx2])
     print(block.to_string())
     print("\n\n\n\n")
     print(block2.to_string())
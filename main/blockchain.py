@@ -1,18 +1,38 @@
 # built-in
+import os
 import json
+from hashlib import sha256
 from collections import defaultdict
 from dataclasses import dataclass, field
 
-from numpy import block
+from typing import Any, Optional
 
 # Local imports
 from block import Block
+from blockstore import BlockStore
 from keypair import KeyPair
+from mempool import Mempool
+from state import ChainState
+from properties import PropertyRegistry
 from account import Account, SpecialAccount
 from transaction import Transaction
+from records import pack_transactions, unpack_transactions
+from validation import BlockValidator, ValidationError, STAGE_SECONDS
+from metrics import REGISTRY, timed
 
-# Class initialization
-BLOCK: Block = Block()
+# File of the block store directory holding the seed the faucet's keys are derived from
+FAUCET_SEED = "faucet.seed"
+
+BLOCKS_ACCEPTED = REGISTRY.counter("blocks_accepted_total", "Blocks added to the history")
+OPERATIONS_ACCEPTED = REGISTRY.counter("block_operations_total", "Operations in accepted blocks")
+
+
+def __getattr__(name: str) -> Any:
+    """Creates the module-level BLOCK helper the first time it is accessed"""
+    if name == "BLOCK":
+        globals()[name] = helper = Block()
+        return helper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass(repr=False)
@@ -21,25 +41,64 @@ class Blockchain:
     :coin_database:
         a table reflecting the current state of balances in the system.
         The account identifier is used as the key,
-        the user balance is used as the value.
+        the user balance is used as the value. Balances are the confirmed ones of state.
 
     :block_history:
         an array storing all the blocks added to the history.
 
     :tx_database:
-        an array storing all transactions in history. It will be used for faster access
-        when checking the existence of the transaction in the history (protection against duplication).
+        an array storing all transactions in history, one entry per block.
+        Transactions are kept as records.TransactionRecord; get_transaction returns the list view.
+
+    :tx_index:
+        a table from transaction id to (block height, position in the block). It is used for
+        constant-time checks of the existence of a transaction in the history (protection against duplication).
 
     :fauce_coins:
         a specail Account object value defining the number of coins available in the faucet for testing.
+
+    :faucet_coins:
+        number of coins the faucet starts with.
+
+    :faucet_seed:
+        secret the faucet's keys are derived from, so the faucet keeps its account id across
+        restarts. Defaults to a seed kept in the block store directory; without a block store,
+        the faucet gets fresh keys.
+
+    :mempool:
+        pending transactions waiting to be included in a block. Only the transactions a block
+        includes are removed from it when the block is accepted.
+
+    :block_store:
+        optional on-disk BlockStore. Accepted blocks are appended to it so the chain survives restarts:
+        a Blockchain created on a store that holds blocks replays them first.
+
+    :key_registry:
+        a table from account identifier to public key (n, e), for verifying the signatures of a block.
+        Filled by register_account.
+
+    :validator:
+        runs the stateless validation stages of validate_block on a worker pool.
+
+    :state:
+        confirmed balances and property owners, applied by validate_block. Keeps undo logs so
+        the most recent blocks can be disconnected with disconnect_tip.
     """
 
     coin_database: defaultdict[dict] = field(default_factory=lambda: defaultdict(dict))
     block_history: list = field(default_factory=lambda: list())
     tx_database: defaultdict[list] = field(default_factory=lambda: defaultdict(list))
+    tx_index: dict[str, tuple[int, int]] = field(default_factory=lambda: dict())
     # Sets one time coins
     __fauce_coins: SpecialAccount = field(default_factory=lambda: SpecialAccount(test_coins=1000), init=False)
-    mempool_mirror: defaultdict[list] = field(default_factory=lambda: defaultdict(list))
+    mempool: Mempool = field(default_factory=lambda: Mempool())
+    block_store: Optional[BlockStore] = None
+    key_registry: dict[str, tuple[int, int]] = field(default_factory=lambda: dict())
+    validator: BlockValidator = field(default_factory=lambda: BlockValidator())
+    state: ChainState = field(default_factory=lambda: ChainState())
+    faucet_coins: int | float = 1000
+    faucet_seed: Optional[bytes] = None
+    tip_id: str = field(default="0".zfill(64), init=False)
 
     def __post_init__(self) -> None:
         """
@@ -51,9 +110,50 @@ class Blockchain:
         # Subsequent transactions are created from this class
         # BlockchainAccount: Account = Account(self.__fauce_coins)
         # Generate account new object
-        self.__fauce_coins = self.__fauce_coins.gen_account()
+        self.__fauce_coins.test_coins = self.faucet_coins
+        if self.faucet_seed is None and self.block_store is not None:
+            self.faucet_seed = self.__load_faucet_seed()
+        self.__fauce_coins = self.__fauce_coins.gen_account(seed=self.faucet_seed)
         # Generates wallets
         self.__fauce_coins.add_key_pair_to_wallet(KeyPair())
+        self.register_account(self.__fauce_coins)
+        # Faucet allocation is the only balance not created by a block
+        self.state.seed(self.__fauce_coins.get_account_id, self.__fauce_coins.get_balance)
+        if self.block_store is not None and len(self.block_store):
+            self.__replay_block_store()
+
+    def __load_faucet_seed(self) -> bytes:
+        """Returns the faucet seed kept in the block store directory, creating it on first use"""
+        path = os.path.join(self.block_store.path, FAUCET_SEED)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(os.urandom(32))
+                f.flush()
+                os.fsync(f.fileno())
+        with open(path, "rb") as f:
+            return f.read()
+
+    def __replay_block_store(self) -> None:
+        """
+        Rebuilds tip, state, history and indexes from the blocks of block_store, in height order.
+        Stored blocks were validated when they were appended: structure, duplicates and state are
+        checked again, signatures are not, since the keys of other accounts are not stored.
+        """
+        for block in self.block_store.iter_blocks():
+            height: int = len(self.block_history)
+            try:
+                self.validator.check_structure(block, self.tip_id)
+                block_index = self.validator.check_duplicates(block, height, self.tx_index)
+                undo = self.state.apply_block(block)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as err:
+                raise ValidationError("store", f"Stored block at height {height}: {err}") from err
+            self.__commit_block(block, block_index, undo)
+            for _, tx in block.iter_transactions():  # * Faucet payouts spend its local balance too
+                self.__fauce_coins._update_tx_history(
+                    Transaction(tx["transaction_id"], tx["operation"], tx["nonce"])
+                )
 
     def get_fauce_coins(self) -> int:
         """functions returns available coins in the blockchain"""
@@ -67,7 +167,7 @@ class Blockchain:
             genesis block
         """
         # Create Genesis block with transactions in the mempool 
-        genesis: Block = BLOCK.create_block("0".zfill(64), list(self.mempool_mirror.values()))
+        genesis: Block = Block().create_block("0".zfill(64), self.mempool.select())
         return genesis
 
     def get_token_from_faucet(self, account: Account, amount: int) -> None:
@@ -82,45 +182,182 @@ class Blockchain:
             amount to update on coin_database
         """
         if account and amount:
-            # Create Transaction
-            transaction: Transaction = self.__fauce_coins.create_payment_op(account, amount, 1)
-            # Add transactions to the mempool
-            self.mempool_mirror[len(self.mempool_mirror)] = transaction.get_trasaction_list
-            # Update coin database
-            self.update_coin_database(account)
+            self.get_tokens_from_faucet([(account, amount)])
+
+    def get_tokens_from_faucet(self, payouts: list[tuple[Account, int]]) -> Transaction:
+        """
+        a function that funds many accounts from the faucet in a single transaction,
+        one operation per account.
+
+        :payouts:
+            (account, amount) pairs
+
+        :returns:
+            the payout transaction, added to the mempool
+        """
+        accounts = [account for account, _ in payouts]
+        self.register_account(*accounts)
+        # Create Transaction
+        transaction: Transaction = self.__fauce_coins.create_batch_payment(payouts, 1)
+        # Add transactions to the mempool
+        self.mempool.add(transaction)
+        # Update coin database
+        self.update_coin_database(*accounts)
+        return transaction
 
     def update_coin_database(self, *args) -> None:
         """
-        function update coin database 
+        function update coin database with the confirmed balances of accounts
         """
         if args:
             for account in args:
                 if isinstance(account, Account):
-                    self.coin_database.update({account.get_account_id: account.get_balance})
+                    self.register_account(account)
+                    self.coin_database.update(
+                        {account.get_account_id: self.state.get_balance(account.get_account_id)}
+                    )
                 else:
                     raise BaseException(f"Unknown account {account}")
 
+    def register_account(self, *accounts: Account) -> None:
+        """
+        a function that records the public keys of accounts, so the signatures
+        of their operations can be checked when a block is validated.
+        """
+        for account in accounts:
+            if not account.wallet.dtype.names:  # * No key pair yet: nothing to verify
+                continue
+            for n, e in zip(account.wallet["Modulus"], account.wallet["PublicKey"]):
+                if n is None or e is None:
+                    continue
+                kPub = (n, e)
+                self.key_registry[sha256(str(kPub).encode("ascii")).hexdigest()] = kPub
+
+    @timed("block_validate_seconds", "Time to validate and add a block")
     def validate_block(self, block: Block) -> None:
         """
         a function that allows you to make a check and add a block to the history.
+        Structure, duplicate and signature checks run in validation.BlockValidator;
+        state is then applied in block order, and the block is written to the block store.
+        If any step fails, nothing is changed.
 
         :block:
             to validate
         """
-        for each in block.transactions:
-            for tx in each:
-                # * Double spending check
-                if tx["transaction_id"] in self.tx_database.values():
-                    raise BaseException(
-                        f"Similar transaction '{tx['transaction_id']}' exist!"
-                    )
-        # * Update blockchain transaction history
-        self.tx_database[len(self.tx_database)] = block.transactions
-
-        self.mempool_mirror.clear() #* Clear mempool
+        height: int = len(self.block_history)
+        block_index = self.validator.validate(
+            block, self.tip_id, height, self.tx_index, self.key_registry
+        )
+        try:
+            with STAGE_SECONDS["state"].time():
+                undo = self.state.apply_block(block)
+        except ValidationError:
+            raise
+        except BaseException as err:
+            raise ValidationError("state", str(err)) from err
+
+        # * Persist before any in-memory commit, so a block is accepted only once it is stored
+        if self.block_store is not None:
+            try:
+                self.block_store.append(block)
+            except BaseException as err:
+                self.state.disconnect()
+                if isinstance(err, (KeyboardInterrupt, SystemExit)):
+                    raise
+                raise ValidationError("store", str(err)) from err
+        self.__commit_block(block, block_index, undo)
+        BLOCKS_ACCEPTED.inc()
+        OPERATIONS_ACCEPTED.inc(sum(len(tx["operation"]) for _, tx in block.iter_transactions()))
+
+    def __commit_block(self, block: Block, block_index: dict[str, tuple[int, int]], undo) -> None:
+        """Records a block whose state is applied in the history, the indexes and the mempool"""
+        height: int = len(self.block_history)
+        self.__refresh_coin_database(undo.balances)
+
+        # * Update blockchain transaction history and index
+        self.tx_database[height] = [pack_transactions(tx_list) for tx_list in block.transactions]
+        self.tx_index.update(block_index)
+
+        self.mempool.remove_included(block)  # * Keep transactions the block did not include
 
         # * Update block history
         self.block_history.append(block.to_string())
+        self.tip_id = block.block_id
+
+    def disconnect_tip(self) -> str:
+        """
+        a function that removes the last block from the history and reverts its state changes
+        with the block's undo log. Its transactions go back to the mempool.
+
+        :returns:
+            id of the disconnected block
+        """
+        if not self.block_history:
+            raise BaseException("No block to disconnect!")
+        undo = self.state.disconnect()
+        height: int = len(self.block_history) - 1
+
+        transactions = self.tx_database.pop(height)
+        for records in transactions:
+            for record in records:
+                self.tx_index.pop(record.get_id, None)
+        for records in transactions:
+            self.mempool.add(unpack_transactions(records))
+
+        self.block_history.pop()
+        self.tip_id = undo.prev_hash
+        if self.block_store is not None:
+            self.block_store.pop()
+        self.__refresh_coin_database(undo.balances)
+        return undo.block_id
+
+    def rollback(self, count: int) -> list[str]:
+        """
+        a function that disconnects the last count blocks, most recent first.
+
+        :returns:
+            ids of the disconnected blocks
+        """
+        if count > self.state.get_undo_depth:
+            raise BaseException(f"Only {self.state.get_undo_depth} blocks can be disconnected!")
+        return [self.disconnect_tip() for _ in range(count)]
+
+    @property
+    def get_properties(self) -> PropertyRegistry:
+        """
+        Chain-wide property registry, updated by the create_property and payment_op_for_property
+        transactions of accepted blocks. Look up a deed, an owner's properties or a worth range.
+        """
+        return self.state.properties
+
+    def get_balance(self, account_id: str) -> int | float:
+        """function returns the confirmed balance of an account"""
+        return self.state.get_balance(account_id)
+
+    def __refresh_coin_database(self, changes: list[tuple[str, object]]) -> None:
+        """Copies the state balances an undo log touched into coin_database"""
+        for account_id, _ in changes:
+            self.coin_database[account_id] = self.state.get_balance(account_id)
+
+    def has_transaction(self, tx_id: str) -> bool:
+        """function checks if a transaction is recorded in the history"""
+        return tx_id in self.tx_index
+
+    def get_transaction(self, tx_id: str) -> list[dict] | None:
+        """
+        a function that finds a recorded transaction by its id.
+
+        :tx_id:
+            transaction id
+
+        :returns:
+            the transaction list as stored in the block, or None
+        """
+        location = self.tx_index.get(tx_id)
+        if location is None:
+            return None
+        height, position = location
+        return unpack_transactions(self.tx_database[height][position])
 
     def show_coin_database(self) -> None:
         """
@@ -137,7 +374,10 @@ class Blockchain:
         """
         blockchain_obj = {
             "coin_database": self.coin_database,
-            "transaction_database": self.tx_database,
+            "transaction_database": {
+                height: [unpack_transactions(records) for records in transactions]
+                for height, transactions in self.tx_database.items()
+            },
             "fauce_coins": self.get_fauce_coins(),
         }
         return json.dumps(blockchain_obj, indent=4)
@@ -194,12 +434,12 @@ def main():
     tx4 = user3.create_payment_op(user1, 100, 1)
 
     #! Add transactions to the mempool
-    blockchain.mempool_mirror[len(blockchain.mempool_mirror)] = tx2.get_trasaction_list
-    blockchain.mempool_mirror[len(blockchain.mempool_mirror)] = tx3.get_trasaction_list
-    blockchain.mempool_mirror[len(blockchain.mempool_mirror)] = tx4.get_trasaction_list
+    blockchain.mempool.add(tx2)
+    blockchain.mempool.add(tx3)
+    blockchain.mempool.add(tx4)
 
     #! Create subsequent block
-    block2 = BLOCK.create_block(genesis.block_id, list(blockchain.mempool_mirror.values()))
+    block2 = Block().create_block(genesis.block_id, blockchain.mempool.select())
     blockchain.validate_block(block2)
 
     # Update coin database and print blockchain state
@@ -0,0 +1,340 @@
+# ? Built-in
+import os
+import mmap
+import struct
+from typing import Iterator, Optional
+
+# ? Local
+from block import Block
+
+# height.idx: header (magic, count) + one record per height: (segment, offset, length, block id)
+HEIGHT_MAGIC = b"BLKHGT01"
+HEIGHT_HEADER = struct.Struct("<8sQ")
+HEIGHT_RECORD = struct.Struct("<IQI32s")
+
+# hash.idx: header (magic, capacity, count) + open-addressing slots: (block id, height + 1). 0 = empty
+HASH_MAGIC = b"BLKHSH01"
+HASH_HEADER = struct.Struct("<8sQQ")
+HASH_SLOT = struct.Struct("<32sQ")
+
+# Segment files: records of (length, payload = Block.to_bytes())
+RECORD_LENGTH = struct.Struct("<I")
+SEGMENT_NAME = "blk{:05d}.dat"
+
+
+class BlockStore:
+    """
+    Append-only on-disk block store.
+
+    Blocks are appended to segment files. Two memory-mapped index files locate a
+    block without scanning the segments:
+        height.idx: fixed-size records, so the record of height h is at a known offset.
+        hash.idx: open-addressing hash table from block id to height.
+    The top block can be removed with pop() when the tip of the chain is disconnected.
+
+    :path:
+        directory of the store. Created if missing; an existing store is reopened.
+
+    :segment_size:
+        a new segment file is started once the current one reaches this many bytes.
+
+    :sync_every:
+        fsync data and indexes every this many appends. 0 leaves syncing to sync()/close().
+    """
+
+    def __init__(
+        self, path: str, segment_size: int = 128 * 1024 * 1024, sync_every: int = 1
+    ) -> None:
+        self.path = path
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+        self.__unsynced = 0
+        self.__readers: dict[int, object] = {}
+        os.makedirs(path, exist_ok=True)
+
+        self.__height_file, self.__height_map = self.__open_index(
+            "height.idx", HEIGHT_HEADER.pack(HEIGHT_MAGIC, 0), HEIGHT_RECORD.size * 1024
+        )
+        magic, self.__count = HEIGHT_HEADER.unpack_from(self.__height_map, 0)
+        if magic != HEIGHT_MAGIC:
+            raise ValueError(f"{path}: height.idx is not a block index")
+
+        self.__hash_file, self.__hash_map = self.__open_index(
+            "hash.idx", HASH_HEADER.pack(HASH_MAGIC, 1024, 0), HASH_SLOT.size * 1024
+        )
+        magic, self.__capacity, _ = HASH_HEADER.unpack_from(self.__hash_map, 0)
+        if magic != HASH_MAGIC:
+            raise ValueError(f"{path}: hash.idx is not a block index")
+
+        self.__recover()
+        self.__writer = open(self.__segment_path(self.__segment), "ab")
+        self.__writer.truncate(self.__offset)  # * Drop a partial write after the last indexed block
+
+    def __recover(self) -> None:
+        """
+        Brings the indexes back in line with the segments after a crash: index records whose
+        data did not reach the disk are dropped, segments past the last indexed block are
+        removed, and hash.idx is rebuilt if it does not match height.idx.
+        """
+        count = self.__count
+        while count:
+            segment, offset, length, _ = self.__height_record(count - 1)
+            path = self.__segment_path(segment)
+            end = offset + RECORD_LENGTH.size + length
+            if os.path.exists(path) and os.path.getsize(path) >= end:
+                break
+            count -= 1
+        if count != self.__count:
+            self.__count = count
+            HEIGHT_HEADER.pack_into(self.__height_map, 0, HEIGHT_MAGIC, count)
+
+        # * Continue writing at the end of the last indexed block
+        self.__segment, self.__offset = 0, 0
+        if count:
+            segment, offset, length, _ = self.__height_record(count - 1)
+            self.__segment, self.__offset = segment, offset + RECORD_LENGTH.size + length
+        segment = self.__segment + 1
+        while os.path.exists(self.__segment_path(segment)):
+            os.remove(self.__segment_path(segment))
+            segment += 1
+
+        _, _, hashed = HASH_HEADER.unpack_from(self.__hash_map, 0)
+        last_key = self.__height_record(count - 1)[3] if count else None
+        if hashed != count or (last_key is not None and self.__find_slot(last_key)[1] != count):
+            capacity = self.__capacity
+            while count * 2 > capacity:
+                capacity *= 2
+            self.__rehash(capacity)
+        self.__height_map.flush()
+        self.__hash_map.flush()
+
+    def __enter__(self) -> "BlockStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, SEGMENT_NAME.format(segment))
+
+    def __open_index(self, name: str, header: bytes, body: int):
+        """Opens (or creates) an index file and memory-maps it"""
+        file_path = os.path.join(self.path, name)
+        if not os.path.exists(file_path):
+            with open(file_path, "wb") as f:
+                f.write(header)
+                f.truncate(len(header) + body)
+        index_file = open(file_path, "r+b")
+        return index_file, mmap.mmap(index_file.fileno(), 0)
+
+    @staticmethod
+    def __remap(index_file, index_map: mmap.mmap, size: int) -> mmap.mmap:
+        """Grows an index file to size bytes and maps it again"""
+        index_map.flush()
+        index_map.close()
+        index_file.truncate(size)
+        return mmap.mmap(index_file.fileno(), 0)
+
+    def __height_record(self, height: int) -> tuple[int, int, int, bytes]:
+        return HEIGHT_RECORD.unpack_from(
+            self.__height_map, HEIGHT_HEADER.size + height * HEIGHT_RECORD.size
+        )
+
+    # * Hash index
+    def __slot_offset(self, slot: int) -> int:
+        return HASH_HEADER.size + slot * HASH_SLOT.size
+
+    def __find_slot(self, key: bytes) -> tuple[int, int]:
+        """Returns (slot, height + 1) for key, or the empty slot where it belongs with 0"""
+        mask = self.__capacity - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        while True:
+            stored, height = HASH_SLOT.unpack_from(self.__hash_map, self.__slot_offset(slot))
+            if height == 0 or stored == key:
+                return slot, height
+            slot = (slot + 1) & mask
+
+    def __hash_insert(self, key: bytes, height: int) -> None:
+        if (self.__count + 1) * 2 > self.__capacity:  # * Keep load factor under 1/2
+            self.__rehash(self.__capacity * 2)
+        slot, _ = self.__find_slot(key)
+        HASH_SLOT.pack_into(self.__hash_map, self.__slot_offset(slot), key, height + 1)
+        HASH_HEADER.pack_into(
+            self.__hash_map, 0, HASH_MAGIC, self.__capacity, self.__count + 1
+        )
+
+    def __rehash(self, capacity: int) -> None:
+        """Grows the hash table and reinserts every block id from the height index"""
+        self.__hash_map = self.__remap(
+            self.__hash_file, self.__hash_map, HASH_HEADER.size + capacity * HASH_SLOT.size
+        )
+        self.__hash_map[HASH_HEADER.size :] = bytes(capacity * HASH_SLOT.size)
+        self.__capacity = capacity
+        HASH_HEADER.pack_into(self.__hash_map, 0, HASH_MAGIC, capacity, self.__count)
+        for height in range(self.__count):
+            key = self.__height_record(height)[3]
+            slot, _ = self.__find_slot(key)
+            HASH_SLOT.pack_into(self.__hash_map, self.__slot_offset(slot), key, height + 1)
+
+    def append(self, block: Block) -> int:
+        """
+        a function that writes a block at the end of the store.
+
+        :block:
+            block to store
+
+        :returns:
+            height of the block
+        """
+        key = bytes.fromhex(block.block_id)
+        if self.__find_slot(key)[1]:
+            raise BaseException(f"Block '{block.block_id}' is already stored!")
+
+        payload = block.to_bytes()
+        if self.__offset and self.__offset + len(payload) > self.segment_size:
+            self.__writer.close()  # * Start a new segment
+            self.__segment, self.__offset = self.__segment + 1, 0
+            self.__writer = open(self.__segment_path(self.__segment), "ab")
+        try:
+            self.__writer.write(RECORD_LENGTH.pack(len(payload)))
+            self.__writer.write(payload)
+            self.__writer.flush()
+        except BaseException:
+            self.__writer.truncate(self.__offset)  # * Keep the segment ending at the last block
+            raise
+        self.__unsynced += 1
+        syncing = self.sync_every and self.__unsynced >= self.sync_every
+        if syncing:  # * Data reaches the disk before the index that points to it
+            os.fsync(self.__writer.fileno())
+
+        height = self.__count
+        record_at = HEIGHT_HEADER.size + height * HEIGHT_RECORD.size
+        if record_at + HEIGHT_RECORD.size > len(self.__height_map):
+            self.__height_map = self.__remap(
+                self.__height_file, self.__height_map, 2 * len(self.__height_map)
+            )
+        HEIGHT_RECORD.pack_into(
+            self.__height_map, record_at, self.__segment, self.__offset, len(payload), key
+        )
+        self.__hash_insert(key, height)
+        self.__count += 1
+        HEIGHT_HEADER.pack_into(self.__height_map, 0, HEIGHT_MAGIC, self.__count)
+        self.__offset += RECORD_LENGTH.size + len(payload)
+
+        if syncing:
+            self.sync()
+        return height
+
+    def __hash_delete(self, key: bytes) -> None:
+        """Removes a key, shifting back the slots of its probe run so lookups stay correct"""
+        mask = self.__capacity - 1
+        empty, height = self.__find_slot(key)
+        if not height:
+            return
+        HASH_SLOT.pack_into(self.__hash_map, self.__slot_offset(empty), bytes(32), 0)
+        slot = empty
+        while True:
+            slot = (slot + 1) & mask
+            stored, height = HASH_SLOT.unpack_from(self.__hash_map, self.__slot_offset(slot))
+            if height == 0:
+                break
+            home = int.from_bytes(stored[:8], "little") & mask
+            # * Move the entry back unless its home slot lies cyclically in (empty, slot]
+            if (empty < slot and (home <= empty or home > slot)) or (
+                empty > slot and home <= empty and home > slot
+            ):
+                HASH_SLOT.pack_into(self.__hash_map, self.__slot_offset(empty), stored, height)
+                HASH_SLOT.pack_into(self.__hash_map, self.__slot_offset(slot), bytes(32), 0)
+                empty = slot
+        HASH_HEADER.pack_into(
+            self.__hash_map, 0, HASH_MAGIC, self.__capacity, self.__count - 1
+        )
+
+    def pop(self) -> str:
+        """
+        a function that removes the block at the top of the store, when the tip is disconnected.
+
+        :returns:
+            id of the removed block
+        """
+        if not self.__count:
+            raise IndexError("The block store is empty")
+        segment, offset, _, key = self.__height_record(self.__count - 1)
+        self.__hash_delete(key)
+        self.__count -= 1
+        HEIGHT_HEADER.pack_into(self.__height_map, 0, HEIGHT_MAGIC, self.__count)
+
+        if segment != self.__segment:  # * The block was the first of the current segment
+            self.__writer.close()
+            os.remove(self.__segment_path(self.__segment))
+            self.__writer = open(self.__segment_path(segment), "ab")
+        for stale in {segment, self.__segment}:  # * Drop read buffers past the new end
+            reader = self.__readers.pop(stale, None)
+            if reader is not None:
+                reader.close()
+        self.__segment, self.__offset = segment, offset
+        self.__writer.truncate(offset)
+
+        self.__unsynced += 1
+        if self.sync_every and self.__unsynced >= self.sync_every:
+            self.sync()
+        return key.hex()
+
+    def __read(self, segment: int, offset: int, length: int) -> Block:
+        reader = self.__readers.get(segment)
+        if reader is None:
+            reader = self.__readers[segment] = open(self.__segment_path(segment), "rb")
+        reader.seek(offset + RECORD_LENGTH.size)
+        return Block.from_bytes(reader.read(length))
+
+    def get_by_height(self, height: int) -> Block:
+        """Returns the block at a height"""
+        if not 0 <= height < self.__count:
+            raise IndexError(f"No block at height {height}")
+        segment, offset, length, _ = self.__height_record(height)
+        return self.__read(segment, offset, length)
+
+    def get_height(self, block_id: str) -> Optional[int]:
+        """Returns the height of a block id, or None if it is not stored"""
+        _, height = self.__find_slot(bytes.fromhex(block_id))
+        return height - 1 if height else None
+
+    def get_by_id(self, block_id: str) -> Optional[Block]:
+        """Returns the block with a block id, or None if it is not stored"""
+        height = self.get_height(block_id)
+        return None if height is None else self.get_by_height(height)
+
+    def iter_blocks(self, start: int = 0) -> Iterator[Block]:
+        """
+        a function that streams stored blocks in height order, for replaying the chain.
+
+        :start:
+            first height to read
+        """
+        for height in range(start, self.__count):
+            yield self.get_by_height(height)
+
+    def sync(self) -> None:
+        """Flushes segment data and indexes to disk"""
+        self.__writer.flush()
+        os.fsync(self.__writer.fileno())
+        self.__height_map.flush()
+        self.__hash_map.flush()
+        self.__unsynced = 0
+
+    def close(self) -> None:
+        """Syncs and closes every file of the store"""
+        if self.__writer.closed:
+            return
+        self.sync()
+        self.__writer.close()
+        for reader in self.__readers.values():
+            reader.close()
+        self.__readers.clear()
+        self.__height_map.close()
+        self.__hash_map.close()
+        self.__height_file.close()
+        self.__hash_file.close()
@@ -0,0 +1,186 @@
+"""
+Script compiler and stack interpreter.
+
+A script string such as "DUP SHA256 <hex> EQUALVERIFY CHECKSIG" is compiled once into
+compact bytecode plus a table of decoded constants, and cached by the hash of the script.
+Running it is a loop over bytes with no eval() and no per-verification node objects.
+
+Only scripts with op-codes, i.e. locking scripts, are cached. Unlocking scripts only push a
+signature and a key: decoding them is all their compilation does, and as signatures do not
+repeat, caching them would only evict the locking scripts that are reused.
+
+Operands are hex strings and are pushed as the bytes they encode:
+    signature    raw signature bytes
+    public key   the ascii text "(n, e)"
+    account id   the raw sha256 digest of the public key text
+"""
+# ? Built-in
+from hashlib import sha256
+from binascii import unhexlify
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Iterable, NamedTuple
+
+# ? Local
+from sigcache import SIGCACHE
+from metrics import timed
+
+# Op-codes: values follow Bitcoin script where one exists
+OP_PUSH = 0x01  # * Followed by a one-byte constant index
+OP_DUP = 0x76
+OP_EQUALVERIFY = 0x88
+OP_SHA256 = 0xA8
+OP_CHECKSIG = 0xAC
+
+OPCODES = {
+    "DUP": OP_DUP,
+    "SHA256": OP_SHA256,
+    "EQUALVERIFY": OP_EQUALVERIFY,
+    "CHECKSIG": OP_CHECKSIG,
+}
+
+CACHE_SIZE = 4096
+
+
+class CompiledScript(NamedTuple):
+    """Bytecode and the constants it pushes"""
+
+    code: bytes
+    consts: tuple[bytes, ...]
+
+
+class ScriptError(ValueError):
+    """Raised when a script cannot be compiled"""
+
+
+_cache: OrderedDict[bytes, CompiledScript] = OrderedDict()
+_cache_lock = Lock()
+
+
+def _compile(tokens: list[str]) -> CompiledScript:
+    code = bytearray()
+    consts: list[bytes] = []
+    for token in tokens:
+        opcode = OPCODES.get(token)
+        if opcode is not None:
+            code.append(opcode)
+            continue
+        if len(consts) == 256:
+            raise ScriptError("Too many constants in script")
+        try:
+            consts.append(unhexlify(token))
+        except ValueError as err:
+            raise ScriptError(f"Invalid operand {token!r}") from err
+        code += bytes((OP_PUSH, len(consts) - 1))
+    return CompiledScript(bytes(code), tuple(consts))
+
+
+def compile_script(source: str) -> CompiledScript:
+    """
+    a function that compiles a locking or unlocking script, or returns it from the cache.
+
+    :source:
+        space-separated op-codes and hex operands
+
+    :returns:
+        CompiledScript
+    """
+    tokens = source.split()
+    if not any(token in OPCODES for token in tokens):  # * Push-only: not cached
+        return _compile(tokens)
+
+    key = sha256(source.encode("ascii")).digest()
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+
+    compiled = _compile(tokens)
+    with _cache_lock:
+        _cache[key] = compiled
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def get_cache_size() -> int:
+    """Number of compiled scripts in the cache"""
+    return len(_cache)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_public_key(data: bytes) -> tuple[int, int]:
+    """Parses the public key text "(n, e)" without eval()"""
+    text = data.decode("ascii").strip()
+    if not (text.startswith("(") and text.endswith(")")):
+        raise ScriptError(f"Invalid public key {text!r}")
+    n, e = text[1:-1].split(",")
+    return int(n), int(e)
+
+
+def check_signature(msg: bytes, sig: bytes, pub_key: bytes) -> bool:
+    """CHECKSIG: verifies sig over msg with the public key text, through the signature cache"""
+    return SIGCACHE.verify(msg, sig, parse_public_key(pub_key))
+
+
+def execute(scripts: Iterable[CompiledScript], msg: bytes) -> bool:
+    """
+    a function that runs compiled scripts one after the other on a shared stack.
+
+    :scripts:
+        e.g. (unlocking, locking)
+
+    :msg:
+        the signed message checked by CHECKSIG
+
+    :returns:
+        result of CHECKSIG; false if a check fails or the script is malformed
+    """
+    stack: list[bytes] = []
+    try:
+        for code, consts in scripts:
+            pc, end = 0, len(code)
+            while pc < end:
+                op = code[pc]
+                if op == OP_PUSH:
+                    stack.append(consts[code[pc + 1]])
+                    pc += 2
+                    continue
+                pc += 1
+                if op == OP_DUP:
+                    stack.append(stack[-1])
+                elif op == OP_SHA256:
+                    stack.append(sha256(stack.pop()).digest())
+                elif op == OP_EQUALVERIFY:
+                    if stack.pop() != stack.pop():
+                        return False
+                elif op == OP_CHECKSIG:
+                    pub_key = stack.pop()
+                    return check_signature(msg, stack.pop(), pub_key)
+                else:
+                    return False
+    except (IndexError, ValueError):  # * Stack underflow or malformed operand
+        return False
+    return False
+
+
+@timed("script_run_seconds", "Time to compile (cached) and run a script")
+def run_script(source: str | Iterable[str], msg: bytes) -> bool:
+    """
+    a function that compiles (cached) and runs scripts.
+
+    :source:
+        a script string, or several (unlocking, locking) run on a shared stack
+
+    :msg:
+        the signed message checked by CHECKSIG
+    """
+    if isinstance(source, str):
+        source = (source,)
+    try:
+        compiled = [compile_script(script) for script in source]
+    except ScriptError:
+        return False
+    return execute(compiled, msg)
@@ -0,0 +1,119 @@
+"""
+Deterministic derivation of wallet sub-keys.
+
+A wallet's first key pair seeds every later one: child key i is the RSA key pair whose primes
+are searched from starting points drawn from a SHA-512 counter-mode stream keyed by
+HMAC-SHA512(seed, i). The same seed and index always give the same key, so a wallet can be
+rebuilt from its first key, and many keys can be derived in one call, in parallel.
+
+Primes are found by keypair.gen_prime, fed with that stream instead of os.urandom.
+
+    seed = wallet_seed(account.wallet[0])
+    entries = derive_wallet_entries(seed, range(1, 101))
+
+Children use the public exponent 65537, which keeps verification cheap. Anyone holding the
+first private key can derive every child, as with hardened derivation in HD wallets.
+"""
+# ? Built-in
+import os
+import hmac
+from hashlib import sha512
+from typing import Iterable, Optional
+
+# ? Local
+from keypair import PUBLIC_EXPONENT, gen_prime
+from keypool import WalletEntry
+
+
+class _DeterministicRandom:
+    """randfunc for pycryptodome: bytes of SHA-512(key || counter) for counter = 0, 1, ..."""
+
+    __slots__ = ("key", "counter", "buffer")
+
+    def __init__(self, key: bytes) -> None:
+        self.key = key
+        self.counter = 0
+        self.buffer = b""
+
+    def __call__(self, n: int) -> bytes:
+        while len(self.buffer) < n:
+            self.buffer += sha512(self.key + self.counter.to_bytes(8, "big")).digest()
+            self.counter += 1
+        data, self.buffer = self.buffer[:n], self.buffer[n:]
+        return data
+
+
+def wallet_seed(entry) -> bytes:
+    """
+    a function that returns the derivation seed of a wallet.
+
+    :entry:
+        first wallet entry (d, e, n, ...); its private exponent is the secret
+    """
+    d = int(entry[0])
+    return sha512(b"wallet seed" + d.to_bytes((d.bit_length() + 7) // 8, "big")).digest()
+
+
+def derive_wallet_entry(seed: bytes, index: int, key_bytes: int = 1024) -> WalletEntry:
+    """
+    a function that derives child key pair index of seed.
+
+    :key_bytes:
+        bit size of each prime
+
+    :returns:
+        wallet entry (d, e, n, p, q, dP, dQ, qInv)
+    """
+    randfunc = _DeterministicRandom(
+        hmac.new(seed, b"child" + index.to_bytes(4, "big"), sha512).digest()
+    )
+    p = gen_prime(key_bytes, randfunc)
+    q = p
+    while q == p:
+        q = gen_prime(key_bytes, randfunc)
+
+    e = PUBLIC_EXPONENT
+    d = pow(e, -1, (p - 1) * (q - 1))
+    return (d, e, p * q, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+
+
+def _derive_chunk(args: tuple[bytes, list[int], int]) -> list[WalletEntry]:
+    """Worker: derives a chunk of indexes. Top-level so it can be pickled"""
+    seed, indexes, key_bytes = args
+    return [derive_wallet_entry(seed, index, key_bytes) for index in indexes]
+
+
+def derive_wallet_entries(
+    seed: bytes,
+    indexes: Iterable[int],
+    key_bytes: int = 1024,
+    max_workers: Optional[int] = None,
+) -> list[WalletEntry]:
+    """
+    a function that derives many child key pairs in one call.
+
+    :indexes:
+        child indexes, e.g. range(1, 101)
+
+    :max_workers:
+        worker processes; defaults to the number of cores. With 1 worker, or a single
+        index, keys are derived in the calling process.
+
+    :returns:
+        wallet entries in the order of indexes
+    """
+    indexes = list(indexes)
+    workers = min(max_workers or os.cpu_count() or 1, len(indexes))
+    if workers <= 1:
+        return _derive_chunk((seed, indexes, key_bytes))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [(seed, indexes[i::workers], key_bytes) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_derive_chunk, chunks))
+    # * Chunk i holds indexes i, i + workers, ...: interleave back into order
+    entries: list[WalletEntry] = [None] * len(indexes)
+    for i, chunk in enumerate(results):
+        entries[i::workers] = chunk
+    return entries
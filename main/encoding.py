@@ -0,0 +1,231 @@
+"""
+Canonical, length-prefixed binary encoding for operations, transactions and blocks.
+
+Every value is a one-byte tag followed by its payload. Variable-size payloads are
+prefixed with their length as an unsigned LEB128 varint. Dict entries are sorted by
+their encoded key, so equal values always encode to the same bytes, independent of
+insertion order or Python's repr.
+
+    NONE / FALSE / TRUE     tag only
+    INT                     varint length + signed big-endian bytes
+    FLOAT                   8 bytes IEEE 754 big-endian
+    STR                     varint length + utf-8
+    HEX                     varint length + raw bytes of a lowercase even-length hex str
+    BYTES                   varint length + bytes
+    LIST                    varint count + items (tuples decode as lists)
+    DICT                    varint count + key, value pairs
+"""
+import struct
+from typing import Any
+
+TAG_NONE = 0x00
+TAG_FALSE = 0x01
+TAG_TRUE = 0x02
+TAG_INT = 0x03
+TAG_FLOAT = 0x04
+TAG_STR = 0x05
+TAG_HEX = 0x06
+TAG_BYTES = 0x07
+TAG_LIST = 0x08
+TAG_DICT = 0x09
+
+_FLOAT = struct.Struct(">d")
+_SIZED = frozenset((TAG_INT, TAG_STR, TAG_HEX, TAG_BYTES))  # * Tags with a length prefix
+_SMALL = [bytes([n]) for n in range(0x80)]  # * One-byte varints
+_fromhex = bytes.fromhex
+_SMALL_INTS = [bytes([TAG_INT, 1, n & 0xFF]) for n in range(-0x7F, 0x80)]  # * Encoded -127 to 127
+# * Encoded field order per dict shape: operations and transactions repeat the same few keys
+_ORDERS: dict[tuple, list[tuple[bytes, str]]] = {}
+_MAX_ORDERS = 256
+
+
+def _varint(n: int) -> bytes:
+    """Unsigned LEB128"""
+    if n < 0x80:
+        return _SMALL[n]
+    out = bytearray()
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _put_sized(out: bytearray, tag: int, raw: bytes) -> None:
+    """Writes tag, varint length and raw"""
+    size = len(raw)
+    out.append(tag)
+    if size < 0x80:
+        out.append(size)
+    else:
+        out += _varint(size)
+    out += raw
+
+
+def _encode(value: Any, out: bytearray) -> None:
+    """
+    Writes value to out. The exact types of operations and transactions (str, int, dict and
+    list) are tested first and written inline: hashing spends its time here.
+    """
+    kind = type(value)
+    if kind is str:
+        raw = _hex_bytes(value)
+        if raw is None:
+            _put_sized(out, TAG_STR, value.encode("utf-8"))
+            return
+        size = len(raw)
+        out.append(TAG_HEX)
+        if size < 0x80:
+            out.append(size)
+        else:
+            out += _varint(size)
+        out += raw
+    elif kind is int:
+        if -0x7F <= value <= 0x7F:  # * One signed byte: nonces and small amounts
+            out += _SMALL_INTS[value + 0x7F]
+        else:
+            _put_sized(out, TAG_INT, value.to_bytes((value.bit_length() + 8) // 8, "big", signed=True))
+    elif kind is dict:
+        size = len(value)
+        out.append(TAG_DICT)
+        if size < 0x80:
+            out.append(size)
+        else:
+            out += _varint(size)
+        for key, name in _key_order(value):
+            out += key
+            _encode(value[name], out)
+    elif kind is list or kind is tuple:
+        size = len(value)
+        out.append(TAG_LIST)
+        if size < 0x80:
+            out.append(size)
+        else:
+            out += _varint(size)
+        for item in value:
+            _encode(item, out)
+    elif value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out += _FLOAT.pack(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _put_sized(out, TAG_BYTES, bytes(value))
+    elif isinstance(value, int):  # * Subclasses are written as their base type
+        _encode(int(value), out)
+    elif isinstance(value, str):
+        _encode(str(value), out)
+    elif isinstance(value, (list, tuple)):
+        _encode(list(value), out)
+    elif isinstance(value, dict):
+        _encode(dict(value), out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} value {value!r}")
+
+
+def _hex_bytes(value: str) -> bytes | None:
+    """Hex ids and signatures are stored as raw bytes: half the size of their text form"""
+    if not value or len(value) & 1:
+        return None
+    try:
+        raw = _fromhex(value)
+    except ValueError:
+        return None
+    # * fromhex also accepts upper case and whitespace, which would not round-trip
+    return raw if raw.hex() == value else None
+
+
+def _key_order(value: dict) -> list[tuple[bytes, Any]]:
+    """Returns (encoded key, key) pairs sorted by encoded key"""
+    shape = tuple(value)
+    order = _ORDERS.get(shape)
+    if order is None:
+        order = sorted((encode(key), key) for key in shape)
+        if len(_ORDERS) < _MAX_ORDERS and all(type(key) is str for key in shape):
+            _ORDERS[shape] = order
+    return order
+
+
+def encode(value: Any) -> bytes:
+    """
+    a function that returns the canonical binary encoding of a value.
+
+    :value:
+        None, bool, int, float, str, bytes, or lists/tuples/dicts of them
+    """
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _decode(data: bytes, pos: int) -> tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag in _SIZED:
+        size = data[pos]
+        if size < 0x80:  # * One-byte varint
+            pos += 1
+        else:
+            size, pos = _read_varint(data, pos)
+        end = pos + size
+        if end > len(data):
+            raise ValueError(f"Truncated value at offset {pos}")
+        if tag == TAG_HEX:
+            return data[pos:end].hex(), end
+        if tag == TAG_STR:
+            return data[pos:end].decode("utf-8"), end
+        if tag == TAG_INT:
+            return int.from_bytes(data[pos:end], "big", signed=True), end
+        return data[pos:end], end
+    if tag == TAG_LIST:
+        count, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == TAG_DICT:
+        count, pos = _read_varint(data, pos)
+        entries = {}
+        for _ in range(count):
+            key, pos = _decode(data, pos)
+            entries[key], pos = _decode(data, pos)
+        return entries, pos
+    if tag == TAG_NONE:
+        return None, pos
+    if tag == TAG_FALSE:
+        return False, pos
+    if tag == TAG_TRUE:
+        return True, pos
+    if tag == TAG_FLOAT:
+        return _FLOAT.unpack_from(data, pos)[0], pos + 8
+    raise ValueError(f"Unknown encoding tag {tag:#04x} at offset {pos - 1}")
+
+
+def decode(data: bytes) -> Any:
+    """
+    a function that decodes bytes produced by encode.
+
+    :data:
+        encoded bytes. Must hold exactly one value.
+    """
+    data = bytes(data)
+    value, pos = _decode(data, 0)
+    if pos != len(data):
+        raise ValueError(f"Trailing data after offset {pos}")
+    return value
@@ -0,0 +1,91 @@
+# ? Built-in
+from typing import Any, Iterable, Iterator
+
+# ? Third Party
+import numpy as np
+
+
+class GrowableArray:
+    """
+    Append-only numpy structured array with amortized O(1) appends.
+
+    Rows live in a backing array whose capacity doubles when full, so an append
+    copies nothing except on a resize. Field access returns views of the used
+    part of the array, e.g. history["UTXO"], history["STXO"][i].
+
+    :dtype:
+        structured dtype of a row
+
+    :capacity:
+        initial number of rows allocated
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int = 16) -> None:
+        self._data = np.empty(max(capacity, 1), dtype=dtype)
+        self._size = 0
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "GrowableArray":
+        """Returns a new GrowableArray holding a copy of the rows of a structured array"""
+        rows = array.ravel()
+        obj = cls(rows.dtype, capacity=len(rows) * 2)
+        obj._data[: len(rows)] = rows
+        obj._size = len(rows)
+        return obj
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __grow(self, needed: int) -> None:
+        """Doubles the capacity until needed rows fit"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+    def append(self, row: tuple) -> None:
+        """
+        a function that adds a row at the end.
+
+        :row:
+            a tuple with one value per field
+        """
+        if self._size == self.capacity:
+            self.__grow(self._size + 1)
+        self._data[self._size] = row
+        self._size += 1
+
+    def extend(self, rows: Iterable[tuple]) -> None:
+        """Adds several rows at the end"""
+        rows = list(rows)
+        if self._size + len(rows) > self.capacity:
+            self.__grow(self._size + len(rows))
+        for row in rows:
+            self._data[self._size] = row
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: Any) -> Any:
+        """Field name returns a view of that column; anything else indexes the rows"""
+        if isinstance(key, str):
+            return self._data[key][: self._size]
+        return self._data[: self._size][key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data[: self._size])
+
+    def to_array(self) -> np.ndarray:
+        """Returns a compact copy of the rows as a plain numpy array"""
+        return self._data[: self._size].copy()
+
+    def __repr__(self) -> str:
+        return repr(self._data[: self._size])
@@ -1,17 +1,16 @@
 # ? Built-ins
 import sys
 import os
+import math
 import base64
-import pyasn1.codec.der.encoder
-import pyasn1.type.univ
 from pprint import pprint
 from dataclasses import dataclass, field, asdict
-from typing import Any, Generic, NewType, Optional
+from typing import Any, Callable, Generic, NewType, Optional
 
-# ? Third Party Libraries
-import numpy as np
-from Crypto.Math.Primality import generate_probable_prime, generate_probable_safe_prime
-from Crypto.Math.Numbers import Integer
+# ? Third Party Libraries: pycryptodome and pyasn1 are imported where used
+
+# ? Local
+from metrics import timed
 
 # * Typing class for Prime Number
 Prime = NewType("Prime", int)
@@ -21,10 +20,65 @@ PrivateExponent = NewType("PrivateExponent", int)
 PublicExponent = NewType("PublicExponent", int)
 Modulus = NewType("Modulus", int)
 
+PUBLIC_EXPONENT = 65537
+
+# Odd primes below 5000: candidates divisible by one are skipped without a Miller-Rabin test
+SIEVE_PRIMES = tuple(
+    n for n in range(3, 5000, 2) if all(n % k for k in range(3, int(n**0.5) + 1, 2))
+)
+
+
+def _rounds(bits: int) -> int:
+    """Miller-Rabin rounds before the Lucas test (FIPS 186-4, table C.3)"""
+    if bits >= 1536:
+        return 4
+    if bits >= 1024:
+        return 5
+    return 8 if bits >= 512 else 40
+
+
+def gen_prime(
+    bits: int, randfunc: Callable[[int], bytes] = os.urandom, e: int = PUBLIC_EXPONENT
+) -> Prime:
+    """
+    a function that returns the first probable prime from a random odd start of exactly bits bits,
+    whose p - 1 is coprime with e when e is prime. Consecutive odd candidates are sieved
+    through their residues, which is much cheaper than testing fresh random candidates.
+    Survivors are tested with Miller-Rabin and Lucas (pycryptodome).
+
+    :randfunc:
+        source of the start and the Miller-Rabin bases: a seeded one makes the prime deterministic
+    """
+    from Crypto.Math.Numbers import Integer
+    from Crypto.Math.Primality import PROBABLY_PRIME, lucas_test, miller_rabin_test
+
+    # * Top two bits set: the product of two primes has exactly 2 * bits bits
+    start = int.from_bytes(randfunc((bits + 7) // 8), "big") >> (-bits % 8)
+    start |= (3 << (bits - 2)) | 1
+    residues = [start % p for p in SIEVE_PRIMES]
+    for offset in range(0, 1 << bits, 2):
+        if not all((r + offset) % p for r, p in zip(residues, SIEVE_PRIMES)):
+            continue
+        candidate = start + offset
+        if (candidate - 1) % e == 0:
+            continue
+        big = Integer(candidate)
+        if (
+            miller_rabin_test(big, _rounds(bits), randfunc) == PROBABLY_PRIME
+            and lucas_test(big) == PROBABLY_PRIME
+        ):
+            return Prime(candidate)
+    raise BaseException("No prime found!")
+
 
 @dataclass(repr=False)
 class KeyPair:
-    """Simple RSA Algorithim to Compute KeyPair"""
+    """
+    Simple RSA Algorithim to Compute KeyPair.
+
+    Plain integer arithmetic. gen_key_pair generates the primes once per key pair and caches
+    n, phi(n), d and the CRT parameters; get_primes, get_crt_params and to_string reuse them.
+    """
 
     __private_key: tuple[PrivateExponent, Modulus] = field(
         default_factory=lambda: tuple()
@@ -32,6 +86,8 @@ class KeyPair:
     __large_primes: tuple[Prime1, Prime2] = field(default_factory=lambda: tuple())
     public_key: tuple[Modulus, PublicExponent] = field(default_factory=lambda: tuple())
     key_bytes: Optional[int] = field(default=1024)
+    __phi: Optional[int] = field(default=None, init=False)
+    __crt: tuple = field(default_factory=lambda: tuple(), init=False)
 
     @classmethod
     def from_existing(cls, kprv, p_q, kpub, k_bytes) -> "KeyPair":
@@ -45,22 +101,56 @@ class KeyPair:
     @property
     def get_primes(self) -> tuple[Prime1, Prime2]:
         """
-        Generates primes p & q: for automation purposes.
-        Using third party package pycryptodome with optimize Primality Tests
+        Returns primes p & q of the key pair. They are generated once, on the first
+        access when the key pair has none, and reused afterwards.
         """
-        Primes: set = set()
-
-        while len(Primes) != 2:
-            rand_prime: int = int(generate_probable_prime(exact_bits=self.key_bytes))
-            Primes.add(rand_prime)
-        self.__large_primes = tuple(Primes)
+        if not self.__large_primes:
+            p = gen_prime(self.key_bytes)
+            q = p
+            while q == p:
+                q = gen_prime(self.key_bytes)
+            self.__large_primes = (p, q)
         return self.__large_primes
 
+    @property
+    def get_phi(self) -> int:
+        """phi(n) = (p-1)(q-1), computed once"""
+        if self.__phi is None:
+            p, q = self.get_primes
+            self.__phi = (p - 1) * (q - 1)
+        return self.__phi
+
+    @property
+    def get_crt_params(self) -> tuple[Prime1, Prime2, int, int, int]:
+        """
+        Returns CRT parameters (p, q, dP, dQ, qInv) of the last generated key pair.
+        Uses the primes cached by gen_key_pair; does not generate new primes.
+
+        :dP:
+            d mod (p-1)
+        :dQ:
+            d mod (q-1)
+        :qInv:
+            (inverse of q) mod p
+        """
+        if not self.__large_primes or not self.__private_key:
+            raise ValueError("No key pair generated. Call gen_key_pair first.")
+        if not self.__crt:
+            p, q = self.__large_primes
+            d = self.__private_key[0]
+            self.__crt = (p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+        return self.__crt
+
+    @timed("keypair_gen_seconds", "Time to generate a key pair")
     def gen_key_pair(
-        self, e: PublicExponent = 65537
+        self, e: PublicExponent = PUBLIC_EXPONENT
     ) -> dict[str, tuple[PrivateExponent, Modulus] | tuple[Modulus, PublicExponent]]:
         """
-        Generates keys which return an object of the KeyPair class
+        Generates keys which return an object of the KeyPair class.
+        Every call generates new primes.
+
+        :e:
+            smallest public exponent to try; the first one coprime with phi(n) is used.
 
         :str:
             Key for accessing private or public key.
@@ -70,34 +160,32 @@ class KeyPair:
             :Kpub:
                 Public key access key-value
         """
-
         # * Get Fairly large primes p & q
-        temp1, temp2 = self.get_primes  # * Fairly size key
-        p, q = np.array(temp1, dtype="O"), np.array(temp2, dtype="O")
-        del temp1, temp2
+        self.__large_primes, self.__phi, self.__crt = tuple(), None, tuple()
+        p, q = self.get_primes  # * Fairly size key
 
         # * n: Product of p * q
-        n = np.multiply(p, q, dtype="O")
+        n = p * q
 
         # * Compute phi of n = (p-1)(q-1) which is basically number of coprimes with n.
-        phi_of_n = np.multiply((p - 1), (q - 1), dtype="O")
+        phi_of_n = self.get_phi
 
         # * Kpub = e. From members of set {2, 3, ... phi(n  -1)} such that g.c.d(e, phi(n)) = 1
-
-        while e < phi_of_n:
-            if np.gcd(e, phi_of_n) == 1:  #
-                self.public_key = (n, e)  # * Public Key: Kpub = (n, e)
-                break
+        while math.gcd(e, phi_of_n) != 1:
             e += 1
+        if not 1 < e < phi_of_n:
+            raise ValueError(f"Public exponent must be between 1 and phi(n), got {e}")
+        self.public_key = (n, e)  # * Public Key: Kpub = (n, e)
 
-        # * Compute Kpr = d, such that d * e mod phi(n) = 1
-        lcm = Integer((p - 1)).lcm(q - 1)
-        d = Integer(e).inverse(lcm)
-        self.__private_key = (int(d), n)
+        # * Compute Kpr = d, such that d * e mod lcm(p-1, q-1) = 1
+        d = pow(e, -1, math.lcm(p - 1, q - 1))
+        self.__private_key = (d, n)
         return {"Kpr": self.get_private_key, "Kpub": self.public_key}
 
     def __format_key(self, n, e, d, p, q, dP, dQ, qInv, **kwargs):
         """DER: Binary Encoding. PEM: Base64 encoding"""
+        import pyasn1.type.univ
+        import pyasn1.codec.der.encoder
 
         if kwargs.get("key", None) == "Private":  # * Private-DER
             # ASN.1 specification:
@@ -144,16 +232,10 @@ class KeyPair:
 
     def to_string(self, **kwargs) -> str | bytes:
         """function that allows you to form a string from the objects of a key pair.
-        Returns an object of the String class.
+        Returns an object of the String class. Uses the cached key; nothing is recomputed.
         """
-        args: tuple = (
-            *self.public_key,
-            self.get_private_key[0],
-            *self.get_primes,
-            self.get_private_key[0] % (self.get_primes[0] - 1),
-            self.get_private_key[0] % (self.get_primes[1] - 1),
-            Integer(self.get_primes[0]).inverse(self.get_primes[1]),
-        )
+        p, q, dP, dQ, qInv = self.get_crt_params
+        args: tuple = (*self.public_key, self.get_private_key[0], p, q, dP, dQ, qInv)
         if not kwargs:
             kwargs.update({"key": "Private", "format": "DER"})
             str_prv = self.__format_key(*args, **kwargs)
@@ -0,0 +1,127 @@
+# ? Built-in
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from concurrent.futures import Executor, Future
+from typing import Optional
+
+# ? Local
+from keypair import KeyPair
+
+# Wallet entry: (d, e, n, p, q, dP, dQ, qInv). Same order as account.WALLET_STRUCT
+WalletEntry = tuple[int, int, int, int, int, int, int, int]
+
+
+def gen_wallet_entry(key_bytes: int = 1024) -> WalletEntry:
+    """Worker: generates a key pair and returns it as a wallet entry"""
+    keys = KeyPair(key_bytes=key_bytes)
+    kPrv, kPub = keys.gen_key_pair().values()
+    return (kPrv[0], kPub[1], kPub[0], *keys.get_crt_params)
+
+
+@dataclass(repr=False)
+class KeyPool:
+    """
+    Pool of pre-generated RSA key pairs, refilled in the background by worker processes.
+
+    :low_watermark:
+        when fewer keys than this are available (ready or being generated), the pool refills.
+
+    :high_watermark:
+        the pool refills up to this many keys.
+
+    :max_workers:
+        number of worker processes generating keys. Defaults to the number of cores.
+
+    :key_bytes:
+        bit size of each prime.
+    """
+
+    low_watermark: int = 4
+    high_watermark: int = 16
+    max_workers: Optional[int] = None
+    key_bytes: int = 1024
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    __keys: deque = field(default_factory=deque, init=False)
+    __pending: int = field(default=0, init=False)
+    __cond: threading.Condition = field(default_factory=threading.Condition, init=False)
+    __executor: Optional[Executor] = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.low_watermark <= self.high_watermark:
+            raise ValueError(
+                f"Invalid watermarks low={self.low_watermark} high={self.high_watermark}"
+            )
+
+    def __enter__(self) -> "KeyPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of keys ready to be drawn"""
+        return len(self.__keys)
+
+    def start(self) -> "KeyPool":
+        """Starts filling the pool up to the high watermark"""
+        with self.__cond:
+            if self.__executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+
+                self.__executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self.__refill()
+        return self
+
+    def __refill(self) -> None:
+        """Submits enough key generation jobs to reach the high watermark. Caller holds the lock"""
+        if self.__executor is None:
+            return
+        deficit = self.high_watermark - len(self.__keys) - self.__pending
+        for _ in range(deficit):
+            self.__pending += 1
+            future = self.__executor.submit(gen_wallet_entry, self.key_bytes)
+            future.add_done_callback(self.__on_key)
+
+    def __on_key(self, future: Future) -> None:
+        """Collects a generated key"""
+        with self.__cond:
+            self.__pending -= 1
+            if not future.cancelled() and future.exception() is None:
+                self.__keys.append(future.result())
+            self.__cond.notify()
+
+    def get(self) -> WalletEntry:
+        """
+        a function that draws a key pair from the pool.
+        If the pool is empty, waits for a key being generated, or generates one in
+        the calling process when none is.
+
+        :return:
+            wallet entry (d, e, n, p, q, dP, dQ, qInv)
+        """
+        with self.__cond:
+            if not self.__keys and self.__pending:
+                self.__cond.wait_for(lambda: self.__keys or not self.__pending)
+
+            entry: Optional[WalletEntry] = None
+            if self.__keys:
+                entry = self.__keys.popleft()
+                self.hits += 1
+            else:
+                self.misses += 1
+
+            if len(self.__keys) + self.__pending < self.low_watermark:
+                self.__refill()
+
+        if entry is None:
+            entry = gen_wallet_entry(self.key_bytes)
+        return entry
+
+    def close(self) -> None:
+        """Stops the worker processes. Keys still in the pool stay available"""
+        with self.__cond:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,228 @@
+# ? Built-in
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+# ? Local
+from encoding import encode
+from transaction import Transaction
+from records import TransactionRecord, pack_transactions, unpack_transactions
+
+ORDER_PRIORITY = "priority"
+ORDER_ARRIVAL = "arrival"
+
+
+@dataclass(repr=False)
+class MempoolEntry:
+    """A pending transaction, stored as records, and its bookkeeping"""
+
+    tx_id: str
+    records: tuple[TransactionRecord, ...]
+    priority: int | float
+    seq: int
+    size: int
+    conflict_keys: tuple
+
+
+def conflict_keys(tx_list: list[dict]) -> tuple:
+    """
+    Returns the (sender, asset) keys a transaction spends. Two pending transactions with a
+    common key conflict: the same property cannot be transferred twice by its owner.
+    Coin payments carry no key; their amounts are checked against balances when signed.
+    """
+    return tuple(
+        (op["sender"], op["asset"])
+        for tx in tx_list
+        for op in tx["operation"]
+        if op["sender"] is not None and isinstance(op["asset"], (str, bytes))
+    )
+
+
+@dataclass(repr=False)
+class Mempool:
+    """
+    Pool of transactions waiting to be included in a block.
+
+    :max_count:
+        maximum number of transactions.
+
+    :max_bytes:
+        maximum total size of the transactions, in canonical encoding bytes.
+
+    :order:
+        "priority": highest priority first, then arrival. When full, the lowest priority
+            transaction is evicted for a higher priority one.
+        "arrival": first in, first out. When full, new transactions are rejected.
+    """
+
+    max_count: int = 100_000
+    max_bytes: int = 64 * 1024 * 1024
+    order: str = ORDER_PRIORITY
+    __entries: dict[str, MempoolEntry] = field(default_factory=dict, init=False)
+    __conflicts: dict[tuple, str] = field(default_factory=dict, init=False)
+    __queue: list = field(default_factory=list, init=False)  # * Next to include at the top
+    __evict: list = field(default_factory=list, init=False)  # * Next to evict at the top
+    __bytes: int = field(default=0, init=False)
+    __seq: itertools.count = field(default_factory=itertools.count, init=False)
+
+    def __post_init__(self) -> None:
+        if self.order not in (ORDER_PRIORITY, ORDER_ARRIVAL):
+            raise ValueError(f"Unknown mempool order '{self.order}'")
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self.__entries
+
+    @property
+    def get_bytes(self) -> int:
+        return self.__bytes
+
+    def get(self, tx_id: str) -> Optional[list[dict]]:
+        """Returns a pending transaction list by id"""
+        entry = self.__entries.get(tx_id)
+        return None if entry is None else unpack_transactions(entry.records)
+
+    def get_conflicts(self, tx: Transaction | list[dict]) -> set[str]:
+        """Returns the ids of pending transactions that conflict with tx"""
+        tx_list = tx.get_trasaction_list if isinstance(tx, Transaction) else tx
+        return {
+            self.__conflicts[key]
+            for key in conflict_keys(tx_list)
+            if key in self.__conflicts
+        }
+
+    def __queue_key(self, entry: MempoolEntry) -> tuple:
+        if self.order == ORDER_PRIORITY:
+            return (-entry.priority, entry.seq, entry.tx_id)
+        return (entry.seq, entry.tx_id)
+
+    def __live(self, item: tuple) -> bool:
+        """Heaps are cleaned lazily: an item is live if its entry is still pending"""
+        entry = self.__entries.get(item[-1])
+        return entry is not None and entry.seq == item[-2]
+
+    def __lowest(self) -> Optional[MempoolEntry]:
+        """Returns the next entry to evict"""
+        while self.__evict and not self.__live(self.__evict[0]):
+            heapq.heappop(self.__evict)
+        return self.__entries[self.__evict[0][-1]] if self.__evict else None
+
+    def add(self, tx: Transaction | list[dict], priority: int | float = 0) -> bool:
+        """
+        a function that adds a transaction to the pool.
+
+        :tx:
+            Transaction object or its transaction list
+
+        :priority:
+            higher is included first (priority order only)
+
+        :returns:
+            true if added. False for a duplicate, a conflict, or when no room can be made.
+        """
+        tx_list = tx.get_trasaction_list if isinstance(tx, Transaction) else tx
+        tx_id = tx_list[0]["transaction_id"]
+        if tx_id in self.__entries or self.get_conflicts(tx_list):
+            return False
+
+        size = len(encode(tx_list))
+        if size > self.max_bytes or self.max_count < 1:
+            return False
+
+        # * Make room by evicting lower priority transactions
+        while (
+            len(self.__entries) + 1 > self.max_count
+            or self.__bytes + size > self.max_bytes
+        ):
+            lowest = self.__lowest()
+            if self.order == ORDER_ARRIVAL or lowest.priority >= priority:
+                return False
+            self.__discard(lowest.tx_id)
+            self.__compact()
+
+        entry = MempoolEntry(
+            tx_id, pack_transactions(tx_list), priority, next(self.__seq), size, conflict_keys(tx_list)
+        )
+        self.__entries[tx_id] = entry
+        self.__bytes += size
+        for key in entry.conflict_keys:
+            self.__conflicts[key] = tx_id
+        heapq.heappush(self.__queue, self.__queue_key(entry))
+        heapq.heappush(self.__evict, (entry.priority, -entry.seq, entry.seq, tx_id))
+        return True
+
+    def __discard(self, tx_id: str) -> bool:
+        entry = self.__entries.pop(tx_id, None)
+        if entry is None:
+            return False
+        self.__bytes -= entry.size
+        for key in entry.conflict_keys:
+            self.__conflicts.pop(key, None)
+        return True
+
+    @property
+    def get_queue_size(self) -> int:
+        """Number of items in the inclusion heap, removed ones not yet compacted included"""
+        return len(self.__queue)
+
+    def __compact(self) -> None:
+        """Drops removed items from the heaps once they outnumber live ones"""
+        if len(self.__queue) > 2 * len(self.__entries) + 64:
+            self.__queue = [item for item in self.__queue if self.__live(item)]
+            self.__evict = [item for item in self.__evict if self.__live(item)]
+            heapq.heapify(self.__queue)
+            heapq.heapify(self.__evict)
+
+    def remove(self, tx_ids: Iterable[str]) -> int:
+        """
+        a function that removes transactions by id.
+
+        :returns:
+            number of transactions removed
+        """
+        removed = sum(self.__discard(tx_id) for tx_id in tx_ids)
+        self.__compact()
+        return removed
+
+    def remove_included(self, block) -> int:
+        """Removes only the transactions that a block included"""
+        return self.remove(tx["transaction_id"] for _, tx in block.iter_transactions())
+
+    def select(
+        self, max_count: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> list[list[dict]]:
+        """
+        a function that picks transactions for the next block, in pool order, without removing them.
+
+        :max_count:
+            maximum number of transactions
+
+        :max_bytes:
+            maximum total size; transactions that do not fit are skipped
+
+        :returns:
+            list of transaction lists, ready for Block.create_block
+        """
+        heap = list(self.__queue)
+        selected: list[list[dict]] = []
+        total = 0
+        while heap and (max_count is None or len(selected) < max_count):
+            item = heapq.heappop(heap)
+            if not self.__live(item):
+                continue
+            entry = self.__entries[item[-1]]
+            if max_bytes is not None and total + entry.size > max_bytes:
+                continue
+            selected.append(unpack_transactions(entry.records))
+            total += entry.size
+        return selected
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__conflicts.clear()
+        self.__queue.clear()
+        self.__evict.clear()
+        self.__bytes = 0
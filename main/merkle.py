@@ -0,0 +1,132 @@
+from hashlib import sha256
+from typing import Optional
+
+# Domain separation between leaves and inner nodes (protects against second preimages)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+EMPTY_ROOT = sha256(b"").digest()
+
+
+def _to_bytes(data: str | bytes) -> bytes:
+    """Transaction ids are hex strings; hash their raw bytes"""
+    if isinstance(data, bytes):
+        return data
+    try:
+        return bytes.fromhex(data)
+    except ValueError:
+        return data.encode("utf-8")
+
+
+def hash_leaf(data: str | bytes) -> bytes:
+    return sha256(LEAF_PREFIX + _to_bytes(data)).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    return sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Binary Merkle tree over transaction ids, built incrementally.
+
+    Every level of the tree is kept, so appending a leaf only rehashes the
+    O(log n) nodes on its path to the root. A node without a right sibling
+    is promoted to the level above unchanged: pairing it with itself would give
+    [a, b, c] and [a, b, c, c] the same root.
+    """
+
+    def __init__(self, leaves: Optional[list[str | bytes]] = None) -> None:
+        self.__levels: list[list[bytes]] = [[]]
+        for leaf in leaves or []:
+            self.append(leaf)
+
+    def __len__(self) -> int:
+        return len(self.__levels[0])
+
+    def append(self, data: str | bytes) -> int:
+        """
+        a function that adds a leaf and updates the nodes on its path to the root.
+
+        :data:
+            a transaction id
+
+        :returns:
+            index of the new leaf
+        """
+        levels = self.__levels
+        levels[0].append(hash_leaf(data))
+        index = len(levels[0]) - 1
+
+        level = 0
+        while len(levels[level]) > 1:
+            nodes = levels[level]
+            parent = index // 2
+            left = nodes[2 * parent]
+            if 2 * parent + 1 < len(nodes):
+                node = hash_node(left, nodes[2 * parent + 1])
+            else:  # * Promoted unchanged
+                node = left
+
+            if level + 1 == len(levels):
+                levels.append([])
+            above = levels[level + 1]
+            if parent < len(above):
+                above[parent] = node
+            else:
+                above.append(node)
+            index, level = parent, level + 1
+        return len(levels[0]) - 1
+
+    @property
+    def get_root(self) -> bytes:
+        if not self.__levels[0]:
+            return EMPTY_ROOT
+        return self.__levels[-1][0]
+
+    def get_proof(self, index: int) -> list[tuple[str, bool]]:
+        """
+        a function that returns the inclusion proof of a leaf.
+
+        :index:
+            index of the leaf
+
+        :returns:
+            (sibling hash hex, sibling is on the left) pairs from the leaf up to the root.
+            Levels where the node has no sibling are skipped.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"No leaf at index {index}")
+        proof: list[tuple[str, bool]] = []
+        for nodes in self.__levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(nodes):  # * Otherwise promoted unchanged
+                proof.append((nodes[sibling].hex(), sibling < index))
+            index //= 2
+        return proof
+
+    @staticmethod
+    def verify_proof(
+        data: str | bytes, proof: list[tuple[str, bool]], root: str | bytes
+    ) -> bool:
+        """
+        a function that checks an inclusion proof against a Merkle root.
+
+        :data:
+            the transaction id
+
+        :proof:
+            proof returned by get_proof
+
+        :root:
+            the expected root, as bytes or hex
+
+        :returns:
+            true if data is a leaf of the tree with that root
+        """
+        node = hash_leaf(data)
+        for sibling, is_left in proof:
+            sibling = bytes.fromhex(sibling)
+            node = hash_node(sibling, node) if is_left else hash_node(node, sibling)
+        if isinstance(root, str):
+            root = bytes.fromhex(root)
+        return node == root
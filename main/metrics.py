@@ -0,0 +1,312 @@
+"""
+Counters and latency histograms for the hot paths.
+
+Metrics are disabled by default. While disabled, every instrumented call costs one
+attribute check: nothing is timed, counted or locked. Enable them with enable(), or
+by setting the METRICS_ENABLED environment variable before the modules are imported.
+
+    import metrics
+    metrics.enable()
+    ...
+    metrics.REGISTRY.snapshot()        # dict, e.g. for JSON
+    metrics.REGISTRY.to_prometheus()   # Prometheus text exposition format
+    metrics.serve(9100)                # GET http://127.0.0.1:9100/metrics
+"""
+# ? Built-in
+import os
+import time
+import functools
+from bisect import bisect_left
+from contextlib import nullcontext
+from threading import Lock
+from typing import Any, Callable, Optional
+
+# Upper bounds in seconds, from 50 microseconds (a cached check) to 10 seconds (key generation)
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_NULL_TIMER = nullcontext()
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """A value that only goes up"""
+
+    kind = "counter"
+    __slots__ = ("registry", "name", "help", "labels", "value", "_lock")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labels: tuple) -> None:
+        self.registry = registry
+        self.name, self.help, self.labels = name, help, labels
+        self.value = 0
+        self._lock = Lock()
+
+    def inc(self, amount: int | float = 1) -> None:
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0
+
+    def snapshot(self) -> int | float:
+        return self.value
+
+    def prometheus_samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels)} {self.value}"]
+
+
+class _Timer:
+    """Context manager observing the time spent in its block"""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: "Histogram") -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Histogram:
+    """Distribution of observed values, counted in cumulative buckets"""
+
+    kind = "histogram"
+    __slots__ = ("registry", "name", "help", "labels", "buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        help: str,
+        labels: tuple,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.registry = registry
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self.reset()
+
+    def observe(self, value: float) -> None:
+        if not self.registry.enabled:
+            return
+        index = bisect_left(self.buckets, value)  # * len(buckets) is the +Inf bucket
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Returns a context manager timing its block, or a no-op one while disabled"""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.sum = 0.0
+            self.count = 0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a quantile as the upper bound of the bucket holding it"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(map(str, self.buckets + (float("inf"),)), self.counts)),
+        }
+
+    def prometheus_samples(self) -> list[str]:
+        samples, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+            samples.append(f"{self.name}_bucket{_format_labels(self.labels, le)} {cumulative}")
+        samples.append(f"{self.name}_sum{_format_labels(self.labels)} {self.sum}")
+        samples.append(f"{self.name}_count{_format_labels(self.labels)} {self.count}")
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Holds every metric, keyed by name and labels.
+
+    :enabled:
+        while false, metrics ignore every update.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.__metrics: dict[tuple, Counter | Histogram] = {}
+        self.__lock = Lock()
+
+    def __get(self, cls, name: str, help: str, labels: dict, **kwargs):
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            metric = self.__metrics.get(key)
+            if metric is None:
+                metric = self.__metrics[key] = cls(self, name, help, key[1], **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        """Returns the counter with this name and labels, created on first use"""
+        return self.__get(Counter, name, help, labels)
+
+    def histogram(
+        self, name: str, help: str = "", buckets: tuple[float, ...] = LATENCY_BUCKETS, **labels: str
+    ) -> Histogram:
+        """Returns the histogram with this name and labels, created on first use"""
+        return self.__get(Histogram, name, help, labels, buckets=buckets)
+
+    def reset(self) -> None:
+        """Zeroes every metric; the metrics stay registered"""
+        for metric in list(self.__metrics.values()):
+            metric.reset()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        a function that returns the current value of every metric.
+
+        :returns:
+            {"counters": {"name{labels}": value}, "histograms": {"name{labels}": {count, sum, mean, p50, p99, buckets}}}
+        """
+        result: dict[str, dict[str, Any]] = {"counters": {}, "histograms": {}}
+        for (name, labels), metric in sorted(self.__metrics.items()):
+            result[metric.kind + "s"][name + _format_labels(labels)] = metric.snapshot()
+        return result
+
+    def to_prometheus(self) -> str:
+        """Returns every metric in the Prometheus text exposition format"""
+        lines: list[str] = []
+        seen: set[str] = set()
+        for (name, _), metric in sorted(self.__metrics.items()):
+            if name not in seen:  # * HELP and TYPE once per name, before its first sample
+                seen.add(name)
+                lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.prometheus_samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(enabled=os.environ.get("METRICS_ENABLED", "") not in ("", "0"))
+
+
+def enable() -> None:
+    REGISTRY.enabled = True
+
+
+def disable() -> None:
+    REGISTRY.enabled = False
+
+
+def is_enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def timed(name: str, help: str = "") -> Callable:
+    """
+    a decorator that records the latency of each call in the histogram name, and
+    counts calls that raise in the counter name without its "_seconds" suffix + "_errors_total".
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        histogram = REGISTRY.histogram(name, help)
+        errors = REGISTRY.counter(
+            name.removesuffix("_seconds") + "_errors_total", f"Calls of {fn.__qualname__} that raised"
+        )
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def __getattr__(name: str) -> Any:
+    """Creates the HTTP handler class the first time it is accessed, so http.server is imported only when serving"""
+    if name == "MetricsHandler":
+        from http.server import BaseHTTPRequestHandler
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """Serves REGISTRY on GET /metrics (Prometheus text) and GET /metrics.json"""
+
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body = REGISTRY.to_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    import json
+
+                    body = json.dumps(REGISTRY.snapshot()).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass  # * Scrapes are frequent; keep stderr quiet
+
+        globals()[name] = MetricsHandler
+        return MetricsHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def serve(port: int = 9100, host: str = "127.0.0.1"):
+    """
+    a function that serves the metrics over HTTP from a daemon thread.
+
+    :returns:
+        the server; call shutdown() to stop it. Port 0 picks a free port (server.server_address)
+    """
+    from http.server import ThreadingHTTPServer
+    from threading import Thread
+
+    server = ThreadingHTTPServer((host, port), __getattr__("MetricsHandler"))
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -3,7 +3,14 @@ from pprint import pprint
 from base64 import b64encode
 from dataclasses import dataclass
 
-from script import Script
+from script import operation_message
+from bytecode import run_script
+from encoding import encode
+from metrics import REGISTRY, timed
+
+VERIFY_FAILURES = REGISTRY.counter(
+    "operation_verify_failures_total", "Operations rejected by verify_operation"
+)
 
 
 @dataclass(repr=False)
@@ -19,7 +26,10 @@ class Operation:
         the amount of transfer or property to transfer
 
     :signature:
-        signature data generated by the sender of the payment
+        signature data generated by the sender of the payment, over get_message
+
+    :nonce:
+        nonce of the transaction the operation is signed for
 
     :OPERATIONS:
         a stack of operations
@@ -29,11 +39,12 @@ class Operation:
     receiver: object | None = None
     asset: int | float | str | bytes = 0
     signature: bytes = b""
+    nonce: int = 0
 
     @classmethod
-    def __create_operation_helper(cls, s, r, a, sig) -> "Operation":
+    def __create_operation_helper(cls, s, r, a, sig, n) -> "Operation":
         """Return a new object of Operation"""
-        return cls(s, r, a, sig)
+        return cls(s, r, a, sig, n)
 
     def create_operation(
         self,
@@ -41,6 +52,7 @@ class Operation:
         recpt: object,
         asset: int | float | str | bytes,
         sig: bytes,
+        nonce: int = 0,
     ) -> "Operation":
         """
         a function that allows to create an operation with all the necessary details and signature.
@@ -56,11 +68,21 @@ class Operation:
         :sig:
             signature of the sender
 
+        :nonce:
+            nonce of the transaction the operation will be part of
+
         :return:
             Operation object.
         """
-        return self.__create_operation_helper(sender, recpt, asset, sig)
+        return self.__create_operation_helper(sender, recpt, asset, sig, nonce)
+
+    def get_message(self) -> bytes:
+        """Returns the message the sender signs: see script.operation_message"""
+        return operation_message(
+            self.sender.get_account_id, self.receiver.get_account_id, self.asset, self.nonce
+        )
 
+    @timed("operation_verify_seconds", "Time to verify an operation")
     def verify_operation(self, index: int, prop: bool = False) -> bool:
         """
         a function that checks the operation. The main checks (relevant for the proposed implementation) include:
@@ -78,29 +100,55 @@ class Operation:
              true/false depending on the results of checking the operation
         """
 
-        op_codes: str = "{0} {1} DUP SHA256 {2} EQUALVERIFY CHECKSIG".format(
-            self.signature.hex(),
-            str(
-                (
-                    self.sender.wallet["Modulus"][index],
-                    self.sender.wallet["PublicKey"][index],
-                )
-            )
-            .encode("ascii")
-            .hex(),
-            self.sender.get_account_id,
+        unlocking, locking = self.get_scripts(index)
+        valid = False
+        if prop:  # Property exist check
+            if self.sender.get_properties.get(self.asset, False):
+                valid = run_script((unlocking, locking), self.get_message())
+
+        elif self.asset < self.sender.get_balance:  # Coins are sufficient check
+            valid = run_script((unlocking, locking), self.get_message())
+
+        if not valid:
+            VERIFY_FAILURES.inc()
+        return valid
+
+    def get_scripts(self, index: int) -> tuple[str, str]:
+        """
+        a function that returns the P2PKH scripts of the operation.
+
+        :index:
+            index of key for signing data
+
+        :returns:
+            (unlocking, locking): "<sig> <pubKey>" and "DUP SHA256 <account_id> EQUALVERIFY CHECKSIG".
+            Joined with a space they form the op-codes read by Script.
+        """
+        kPub = (
+            self.sender.wallet["Modulus"][index],
+            self.sender.wallet["PublicKey"][index],
         )
-        script: object = None
-        if prop and self.sender.get_properties.get(
-            self.asset, False
-        ):  # Property exist check
-            script: object = Script(op_codes, self.asset)
-            return script.eval()
-
-        if self.asset < self.sender.get_balance:  # Coins are sufficient check
-            script: object = Script(op_codes, self.asset)
-            return script.eval()
-        return False
+        unlocking = "{0} {1}".format(
+            self.signature.hex(), str(kPub).encode("ascii").hex()
+        )
+        locking = "DUP SHA256 {0} EQUALVERIFY CHECKSIG".format(
+            self.sender.get_account_id
+        )
+        return unlocking, locking
+
+    def get_verify_item(self, index: int) -> tuple[bytes, bytes, tuple[int, int]]:
+        """
+        a function that returns the (msg, sig, kPub) triple checked by CHECKSIG,
+        for verifying many operations at once with verifier.BatchVerifier.
+
+        :index:
+            index of key for signing data
+        """
+        kPub = (
+            self.sender.wallet["Modulus"][index],
+            self.sender.wallet["PublicKey"][index],
+        )
+        return self.get_message(), self.signature, kPub
 
     def to_string(self) -> str:
         """
@@ -111,6 +159,15 @@ class Operation:
         """
         return json.dumps(self.get_operation_list, indent=1)
 
+    def to_bytes(self) -> bytes:
+        """
+        a function that serializes the operation with the canonical binary encoding.
+
+        :returns:
+             bytes, decoded by encoding.decode into get_operation_list
+        """
+        return encode(self.get_operation_list)
+
     def print_operation(self) -> None:
         """
         a  function to output the objects of the operation.
@@ -127,6 +184,6 @@ class Operation:
                 "sender": self.sender.get_account_id,
                 "receiver": self.receiver.get_account_id,
                 "asset": self.asset,
-                "sig": self.signature.hex().strip("0"),
+                "sig": self.signature.hex(),
             }
         ]
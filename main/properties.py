@@ -0,0 +1,108 @@
+# ? Built-in
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterator, NamedTuple, Optional
+
+# Sorts after any deed id
+LAST_DEED = "\uffff"
+
+
+class PropertyRecord(NamedTuple):
+    """A property deed as recorded on the chain"""
+
+    deed: str
+    owner: str
+    worth: Optional[int | float] = None
+    appro_area: Optional[str] = None
+
+
+class PropertyRegistry:
+    """
+    Chain-wide registry of property deeds, with secondary indexes:
+        by deed:   hash index, O(1)
+        by owner:  hash index of owner to deeds, O(1) per owner
+        by worth:  sorted (worth, deed) list, O(log n) range search with bisect
+
+    Records are immutable; ChainState keeps the replaced record in its undo log.
+    """
+
+    def __init__(self) -> None:
+        self.__deeds: dict[str, PropertyRecord] = {}
+        self.__owners: dict[str, set[str]] = {}
+        self.__worth: list[tuple[int | float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.__deeds)
+
+    def __contains__(self, deed: str) -> bool:
+        return deed in self.__deeds
+
+    def __iter__(self) -> Iterator[PropertyRecord]:
+        return iter(self.__deeds.values())
+
+    def get(self, deed: str) -> Optional[PropertyRecord]:
+        """Returns the record of a deed, or None"""
+        return self.__deeds.get(deed)
+
+    def get_owner(self, deed: str) -> Optional[str]:
+        """Returns the account id owning a deed, or None"""
+        record = self.__deeds.get(deed)
+        return None if record is None else record.owner
+
+    def get_by_owner(self, owner: str) -> list[PropertyRecord]:
+        """Returns the properties of an account"""
+        return [self.__deeds[deed] for deed in self.__owners.get(owner, ())]
+
+    def get_by_worth(
+        self, low: Optional[int | float] = None, high: Optional[int | float] = None
+    ) -> list[PropertyRecord]:
+        """
+        a function that lists properties by worth, in ascending order.
+        Properties recorded without a worth are not listed.
+
+        :low:
+            minimum worth, inclusive. None for no minimum
+
+        :high:
+            maximum worth, inclusive. None for no maximum
+        """
+        # * Deeds are hex strings: (worth, "") sorts before and (worth, LAST_DEED) after every deed of that worth
+        start = 0 if low is None else bisect_left(self.__worth, (low, ""))
+        end = len(self.__worth) if high is None else bisect_right(self.__worth, (high, LAST_DEED))
+        return [self.__deeds[deed] for _, deed in self.__worth[start:end]]
+
+    def put(self, record: PropertyRecord) -> Optional[PropertyRecord]:
+        """
+        a function that adds a record or replaces the record of the same deed.
+        An invalid record is refused before the registry is changed.
+
+        :returns:
+            the replaced record, or None
+        """
+        if record.worth is not None and (
+            isinstance(record.worth, bool) or not isinstance(record.worth, (int, float))
+        ):
+            raise BaseException(f"Invalid worth {record.worth!r} of property '{record.deed}'")
+        previous = self.remove(record.deed)
+        self.__deeds[record.deed] = record
+        self.__owners.setdefault(record.owner, set()).add(record.deed)
+        if record.worth is not None:
+            insort(self.__worth, (record.worth, record.deed))
+        return previous
+
+    def remove(self, deed: str) -> Optional[PropertyRecord]:
+        """
+        a function that removes the record of a deed.
+
+        :returns:
+            the removed record, or None
+        """
+        record = self.__deeds.pop(deed, None)
+        if record is None:
+            return None
+        deeds = self.__owners[record.owner]
+        deeds.discard(deed)
+        if not deeds:
+            del self.__owners[record.owner]
+        if record.worth is not None:
+            del self.__worth[bisect_left(self.__worth, (record.worth, deed))]
+        return record
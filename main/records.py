@@ -0,0 +1,117 @@
+"""
+Compact records for stored operations and transactions.
+
+Transaction lists (Transaction.get_trasaction_list) are dicts of hex strings: a 64-character
+account id costs about 113 bytes as a str and 65 as bytes, and every dict carries its own
+hash table. Records keep the same data in __slots__ objects with ids and signatures as raw
+bytes. They are what the account history, the mempool and the transaction database hold;
+the list-of-dict view is rebuilt on demand, e.g. for hashing, a block or JSON.
+
+    records = pack_transactions(tx_list)
+    unpack_transactions(records) == tx_list  # * True
+
+Hex fields (transaction_id, sender, receiver and sig) are stored as bytes only if they
+round-trip to the same string; any other value is kept as it is. Assets are kept as they
+are, since a str and a bytes deed are different properties.
+"""
+# ? Built-in
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+_MISSING = object()
+
+
+def _pack(value):
+    """Hex str to bytes, when the conversion is lossless"""
+    if isinstance(value, str):
+        try:
+            packed = bytes.fromhex(value)
+        except ValueError:
+            return value
+        if packed.hex() == value:
+            return packed
+    return value
+
+
+def _unpack(value):
+    return value.hex() if isinstance(value, bytes) else value
+
+
+@dataclass(frozen=True, slots=True)
+class OperationRecord:
+    """
+    An operation dict (Operation.get_operation_list) with its ids and signature as bytes.
+
+    :worth / appro_area:
+        only set by create_property operations; unset fields are left out of the dict view.
+    """
+
+    sender: Optional[bytes | str]
+    receiver: bytes | str
+    asset: int | float | str | bytes
+    sig: Optional[bytes | str]
+    worth: object = _MISSING
+    appro_area: object = _MISSING
+
+    @classmethod
+    def from_dict(cls, op: dict) -> "OperationRecord":
+        return cls(
+            _pack(op["sender"]),
+            _pack(op["receiver"]),
+            op["asset"],
+            _pack(op["sig"]),
+            op.get("worth", _MISSING),
+            op.get("appro_area", _MISSING),
+        )
+
+    def to_dict(self) -> dict:
+        op = {
+            "sender": _unpack(self.sender),
+            "receiver": _unpack(self.receiver),
+            "asset": self.asset,
+            "sig": _unpack(self.sig),
+        }
+        if self.worth is not _MISSING:
+            op["worth"] = self.worth
+        if self.appro_area is not _MISSING:
+            op["appro_area"] = self.appro_area
+        return op
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionRecord:
+    """A transaction dict with a bytes id and its operations as OperationRecord"""
+
+    transaction_id: bytes | str
+    operations: tuple[OperationRecord, ...]
+    nonce: int
+
+    @classmethod
+    def from_dict(cls, tx: dict) -> "TransactionRecord":
+        return cls(
+            _pack(tx["transaction_id"]),
+            tuple(OperationRecord.from_dict(op) for op in tx["operation"]),
+            tx["nonce"],
+        )
+
+    @property
+    def get_id(self) -> str:
+        """Transaction id as the hex string used by the dict view and the indexes"""
+        return _unpack(self.transaction_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "transaction_id": _unpack(self.transaction_id),
+            "operation": [op.to_dict() for op in self.operations],
+            "nonce": self.nonce,
+        }
+
+
+def pack_transactions(tx_list: Iterable[dict]) -> tuple[TransactionRecord, ...]:
+    """Transaction list to records"""
+    return tuple(TransactionRecord.from_dict(tx) for tx in tx_list)
+
+
+def unpack_transactions(records: Iterable[TransactionRecord]) -> list[dict]:
+    """Records to a transaction list, equal to the one they were packed from"""
+    return [record.to_dict() for record in records]
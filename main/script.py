@@ -8,9 +8,52 @@ from binascii import unhexlify
 
 
 from signature import Signature
+from sigcache import SIGCACHE
+from encoding import encode
+from metrics import timed
 
 SIGNER = Signature()
 
+# Coin amounts are signed as fixed-width little-endian integers
+AMOUNT_BYTES = 8
+
+
+def asset_to_bytes(amt: int | float | str | bytes) -> bytes:
+    """Returns the signed message form of an asset: coins or property's id"""
+    if isinstance(amt, int):
+        if not 0 <= amt < 1 << (8 * AMOUNT_BYTES):
+            raise BaseException(f"Invalid {amt} amount!")
+        return amt.to_bytes(AMOUNT_BYTES, "little")
+    elif isinstance(amt, float):
+        return struct.pack("<f", amt)
+    elif isinstance(amt, str):
+        return amt.encode("ascii")
+    elif isinstance(amt, bytes):
+        return amt
+    raise BaseException(f"Invalid {amt} input!")
+
+
+def operation_message(
+    sender: str, receiver: str, asset: int | float | str | bytes, nonce: int
+) -> bytes:
+    """
+    Returns the signed message of an operation. It binds the asset to the sender, the receiver
+    and the nonce of its transaction, so a signature cannot be replayed to another receiver
+    or in another transaction.
+    """
+    return encode((sender, receiver, asset_to_bytes(asset), nonce))
+
+
+def legacy_asset_to_bytes(amt: int | float | str | bytes) -> bytes:
+    """
+    Message form of an asset signed by earlier versions, which wrote a coin amount in
+    bit_length() bytes. Blocks no longer accept it: the message named neither the receiver
+    nor the transaction, so its signatures could be replayed. See operation_message.
+    """
+    if isinstance(amt, int):
+        return amt.to_bytes(amt.bit_length(), "little")
+    return asset_to_bytes(amt)
+
 
 class DataNode:
     """A node operand used in operations"""
@@ -78,7 +121,7 @@ class CHECKSIG:
         self.sig = sig
 
     def eval(self) -> bool:
-        return SIGNER.verify_signature(
+        return SIGCACHE.verify(
             self.msg.eval(), self.sig.eval(), eval(unhexlify(self.pubK.eval()))
         )
 
@@ -112,16 +155,7 @@ class Script:
         self.pointer = -1
         self.op_codes = op_codes.split(" ")
 
-        if isinstance(amt, int):
-            self.amt = amt.to_bytes(amt.bit_length(), "little")
-        elif isinstance(amt, float):
-            self.amt = struct.pack("f", amt)
-        elif isinstance(amt, str):
-            self.amt = amt.encode("ascii")
-        elif isinstance(amt, bytes):
-            self.amt = amt
-        else:
-            raise BaseException(f"Invalid {amt} input!")
+        self.amt = asset_to_bytes(amt)
 
     def push(self, data) -> None:
         """
@@ -147,6 +181,7 @@ class Script:
         """
         return self.stack[self.pointer]
 
+    @timed("script_eval_seconds", "Time to evaluate a script with Script.eval")
     def eval(self) -> bool:
         self.push(DataNode(unhexlify(self.op_codes[0])))
 
@@ -0,0 +1,249 @@
+"""
+Asyncio front end of a Blockchain.
+
+    async with LedgerService(blockchain) as service:
+        block_id, height = await service.submit(tx)
+
+submit returns once the transaction is in an accepted block. A single batching task owns
+the chain: it moves submitted transactions into the mempool and cuts a block when
+max_block_txs are pending or the oldest has waited max_delay seconds. Building and
+validating the block, hashing and signature checks included, runs on an executor, so the
+event loop keeps accepting submitters while a block is checked. Submitters never touch the
+mempool or the chain themselves; while the service runs, nothing else should either.
+
+A block that fails validation is split in halves and each half retried, so one bad
+transaction fails only its own submitter.
+"""
+# ? Built-in
+import time
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+# ? Local
+from block import Block
+from blockchain import Blockchain
+from transaction import Transaction
+from metrics import REGISTRY
+
+SUBMIT_SECONDS = REGISTRY.histogram(
+    "service_submit_seconds", "Time from submit to the transaction being in an accepted block"
+)
+SUBMIT_REJECTED = REGISTRY.counter(
+    "service_rejected_total", "Submitted transactions that were not committed"
+)
+
+# Errors the service never settles into a submitter: they stop it. Lower layers raise
+# bare BaseException for bad input, so everything else only fails its transactions.
+FATAL_ERRORS = (asyncio.CancelledError, KeyboardInterrupt, SystemExit)
+
+
+class SubmitError(BaseException):
+    """Raised to a submitter whose transaction was not committed"""
+
+
+class LedgerService:
+    """
+    :blockchain:
+        chain the service commits to.
+
+    :max_block_txs:
+        a block is cut as soon as this many transactions are pending.
+
+    :max_delay:
+        a block is cut once the oldest pending transaction has waited this many seconds.
+
+    :executor:
+        runs block building and validation. Defaults to a single thread owned by the service;
+        it must not run two commits at once.
+    """
+
+    def __init__(
+        self,
+        blockchain: Blockchain,
+        max_block_txs: int = 100,
+        max_delay: float = 0.05,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.blockchain = blockchain
+        self.max_block_txs = max_block_txs
+        self.max_delay = max_delay
+        self.__executor = executor
+        self.__own_executor = executor is None
+        self.__incoming: list[tuple[list[dict], asyncio.Future]] = []
+        self.__waiting: dict[str, list[asyncio.Future]] = {}  # * Transaction id to its submitters
+        self.__oldest: Optional[float] = None
+        self.__flushing = False
+        self.__wakeup: Optional[asyncio.Event] = None
+        self.__task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "LedgerService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    @property
+    def get_pending(self) -> int:
+        """Number of submitted transactions not yet committed or rejected"""
+        return len(self.__incoming) + len(self.__waiting)
+
+    async def start(self) -> None:
+        """Starts the batching task on the running loop"""
+        if self.__task is not None:
+            return
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger")
+        self.__wakeup = asyncio.Event()
+        self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Commits what is pending, then stops the batching task"""
+        if self.__task is None:
+            return
+        await self.flush()
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+        if self.__own_executor:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    async def flush(self) -> None:
+        """Cuts blocks until every submitted transaction is committed or rejected"""
+        self.__flushing = True
+        try:
+            while self.get_pending:
+                futures = [future for _, future in self.__incoming]
+                futures += [future for group in self.__waiting.values() for future in group]
+                self.__wakeup.set()
+                await asyncio.wait(futures)
+        finally:
+            self.__flushing = False
+
+    async def submit(self, tx: Transaction | list[dict]) -> tuple[str, int]:
+        """
+        a function that submits a transaction and waits for it to be committed.
+
+        :tx:
+            Transaction object or its transaction list
+
+        :returns:
+            (block id, height) of the block that includes it
+
+        :raises SubmitError:
+            the mempool refused the transaction, or its block failed validation
+        """
+        if self.__task is None:
+            raise SubmitError("LedgerService is not started")
+        tx_list = tx.get_trasaction_list if isinstance(tx, Transaction) else tx
+        future = asyncio.get_running_loop().create_future()
+        self.__incoming.append((tx_list, future))
+        if self.__oldest is None:
+            self.__oldest = time.monotonic()
+        if self.get_pending >= self.max_block_txs:
+            self.__wakeup.set()
+
+        start = time.perf_counter()
+        try:
+            return await future
+        finally:
+            SUBMIT_SECONDS.observe(time.perf_counter() - start)
+
+    async def __run(self) -> None:
+        """Batching task: waits for a size or time threshold, then commits"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.get_pending < self.max_block_txs and not self.__flushing:
+                if self.__oldest is None:
+                    timeout = None
+                else:
+                    timeout = self.__oldest + self.max_delay - time.monotonic()
+                if timeout is None or timeout > 0:
+                    try:
+                        await asyncio.wait_for(self.__wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            self.__wakeup.clear()
+            if not self.get_pending:
+                self.__oldest = None
+                continue
+
+            self.__admit()
+            txs = self.blockchain.mempool.select(max_count=self.max_block_txs)
+            self.__oldest = time.monotonic() if self.__incoming or self.__waiting else None
+            if not txs:
+                continue
+            try:
+                results = await loop.run_in_executor(self.__executor, self.__commit, txs)
+            except FATAL_ERRORS:
+                raise
+            except BaseException as err:  # * Commit itself failed: fail the batch, keep serving
+                self.blockchain.mempool.remove([tx_list[0]["transaction_id"] for tx_list in txs])
+                results = [(txs, err)]
+            for tx_lists, outcome in results:
+                self.__settle(tx_lists, outcome)
+
+    def __admit(self) -> None:
+        """Moves submitted transactions into the mempool. Runs on the loop, between commits"""
+        incoming, self.__incoming = self.__incoming, []
+        for tx_list, future in incoming:
+            tx_id = tx_list[0]["transaction_id"]
+            if tx_id in self.__waiting:  # * Same transaction submitted twice: share the outcome
+                self.__waiting[tx_id].append(future)
+                continue
+            try:
+                added = self.blockchain.mempool.add(tx_list)
+            except FATAL_ERRORS:
+                raise
+            except BaseException:
+                added = False
+            if added:
+                self.__waiting[tx_id] = [future]
+            else:
+                SUBMIT_REJECTED.inc()
+                future.set_exception(SubmitError(f"Mempool refused transaction '{tx_id}'"))
+        for tx_id in [tx_id for tx_id in self.__waiting if tx_id not in self.blockchain.mempool]:
+            self.__settle_id(tx_id, SubmitError(f"Transaction '{tx_id}' was evicted from the mempool"))
+
+    def __commit(self, txs: list[list[dict]]) -> list[tuple[list, object]]:
+        """
+        a function that builds and validates blocks from txs. Runs on the executor.
+        A rejected block is split in halves until the failing transactions are isolated.
+
+        :returns:
+            (transaction lists, (block id, height) or the error) per attempted block
+        """
+        block = Block().create_block(self.blockchain.tip_id, txs)
+        try:
+            self.blockchain.validate_block(block)
+        except FATAL_ERRORS:
+            raise
+        except BaseException as err:  # * ValidationError, or a lower layer refusing the block
+            if len(txs) == 1:
+                self.blockchain.mempool.remove([txs[0][0]["transaction_id"]])
+                return [(txs, err)]
+            middle = len(txs) // 2
+            return self.__commit(txs[:middle]) + self.__commit(txs[middle:])
+        return [(txs, (block.block_id, len(self.blockchain.block_history) - 1))]
+
+    def __settle(self, tx_lists: list[list[dict]], outcome: object) -> None:
+        """Resolves the submitters of committed or rejected transactions"""
+        for tx_list in tx_lists:
+            self.__settle_id(tx_list[0]["transaction_id"], outcome)
+
+    def __settle_id(self, tx_id: str, outcome: object) -> None:
+        for future in self.__waiting.pop(tx_id, ()):
+            if future.done():  # * Submitter was cancelled
+                continue
+            if isinstance(outcome, BaseException):
+                SUBMIT_REJECTED.inc()
+                future.set_exception(
+                    outcome if isinstance(outcome, SubmitError) else SubmitError(str(outcome))
+                )
+            else:
+                future.set_result(outcome)
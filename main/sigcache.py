@@ -0,0 +1,111 @@
+# ? Built-in
+from hashlib import sha256
+from threading import Lock
+from collections import OrderedDict
+
+# ? Local
+from encoding import encode
+from signature import Signature
+
+# Approximate memory of one entry: 32-byte digest object + OrderedDict node
+ENTRY_BYTES = 160
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class SignatureCache:
+    """
+    Process-wide cache of successful signature verifications, with LRU eviction.
+
+    Only the digest of (msg, sig, kPub) is kept, never the data itself, and only
+    valid signatures are cached: a hit means that exact triple already verified.
+
+    :max_bytes:
+        approximate memory bound; the cache holds at most max_bytes // ENTRY_BYTES entries.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.__entries: OrderedDict[bytes, None] = OrderedDict()
+        self.__lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resize(max_bytes)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @staticmethod
+    def make_key(msg: bytes, sig: bytes, kPub: tuple[int, int]) -> bytes:
+        """Digest of the length-prefixed (msg, sig, n, e)"""
+        n, e = kPub
+        return sha256(encode((msg, sig, int(n), int(e)))).digest()
+
+    def resize(self, max_bytes: int) -> None:
+        """Changes the memory bound, evicting least recently used entries if needed"""
+        with self.__lock:
+            self.max_bytes = max_bytes
+            self.max_entries = max(max_bytes // ENTRY_BYTES, 0)
+            self.__evict()
+
+    def __evict(self) -> None:
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def contains(self, key: bytes) -> bool:
+        """Checks a key and counts the hit or miss"""
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def add(self, key: bytes) -> None:
+        """Records a successful verification"""
+        with self.__lock:
+            self.__entries[key] = None
+            self.__entries.move_to_end(key)
+            self.__evict()
+
+    def verify(self, msg: bytes, sig: bytes, kPub: tuple[int, int]) -> bool:
+        """
+        a function that verifies a signature, skipping the modular exponentiation
+        when the same (msg, sig, kPub) already verified.
+
+        :returns:
+            true if the signature is valid
+        """
+        key = self.make_key(msg, sig, kPub)
+        if self.contains(key):
+            return True
+        valid = Signature().verify_signature(msg, sig, kPub)
+        if valid:
+            self.add(key)
+        return valid
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.__entries),
+            "max_entries": self.max_entries,
+            "bytes": len(self.__entries) * ENTRY_BYTES,
+        }
+
+
+SIGCACHE = SignatureCache()
+
+
+def configure(max_bytes: int) -> SignatureCache:
+    """Sets the memory bound of the process-wide cache and returns it"""
+    SIGCACHE.resize(max_bytes)
+    return SIGCACHE
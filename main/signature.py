@@ -1,15 +1,35 @@
 # Built-in
-import sys
-import base64
-import pyasn1.type.univ
 from hashlib import sha512
-import pyasn1.codec.der.encoder
 from dataclasses import dataclass, field
 
-# Local Imports
-from keypair import KeyPair
+# Local
+from metrics import timed
 
-GETKEYPAIR = KeyPair(1024)
+# Signatures and message hashes are little-endian integers, whatever the platform
+BYTEORDER = "little"
+
+
+def signature_width(n: int) -> int:
+    """Canonical length in bytes of a signature under modulus n"""
+    return (n.bit_length() + 7) // 8
+
+
+def read_signature(sig: bytes, n: int) -> bytes:
+    """
+    a function that reads a signature of any stored width into the canonical width.
+    Earlier versions wrote bit_length() bytes (zero padded, about 8x too long) or the
+    minimal number of bytes; as little-endian integers both hold the same value.
+
+    :n:
+        modulus of the signer's public key
+
+    :raises ValueError:
+        the value does not fit under n, so it cannot be a signature of this key
+    """
+    value = int.from_bytes(sig, BYTEORDER)
+    if value >= n:
+        raise ValueError("Signature is out of range of the modulus")
+    return value.to_bytes(signature_width(n), BYTEORDER)
 
 
 @dataclass
@@ -25,24 +45,51 @@ class Signature:
     def get_signature(self):
         return self.__signature
 
+    @timed("signature_sign_seconds", "Time to sign a message")
     def sign_data(self, kPr: tuple[int, int], msg: bytes) -> bytes:
         """Computes Digital Signature of a given message"""
         d, n = kPr  # Unpack Private Key
-        msg_hash = int.from_bytes(sha512(msg).digest(), sys.byteorder)
+        msg_hash = int.from_bytes(sha512(msg).digest(), BYTEORDER)
         temp = pow(msg_hash, d, n)
-        self.__signature = temp.to_bytes(temp.bit_length(), sys.byteorder)
+        self.__signature = temp.to_bytes(signature_width(n), BYTEORDER)
+        return self.__signature
+
+    @timed("signature_sign_crt_seconds", "Time to sign a message with the CRT private key")
+    def sign_data_crt(
+        self, kPr_crt: tuple[int, int, int, int, int], msg: bytes
+    ) -> bytes:
+        """
+        Computes Digital Signature of a given message using the Chinese Remainder Theorem.
+        Produces the same signature as sign_data, with two half-size exponentiations.
+        Signatures are signature_width(p * q) bytes long.
+
+        :kPr_crt:
+            CRT form of the private key (p, q, dP, dQ, qInv). See KeyPair.get_crt_params
+        """
+        p, q, dP, dQ, qInv = kPr_crt  # Unpack CRT Private Key
+        msg_hash = int.from_bytes(sha512(msg).digest(), BYTEORDER)
+        m1 = pow(msg_hash, dP, p)
+        m2 = pow(msg_hash, dQ, q)
+        h = (qInv * (m1 - m2)) % p
+        temp = m2 + h * q
+        self.__signature = temp.to_bytes(signature_width(p * q), BYTEORDER)
         return self.__signature
 
+    @timed("signature_verify_seconds", "Time to verify a signature")
     def verify_signature(self, msg, sig: bytes, kPub: tuple[int, int]) -> bool:
         n, e = kPub  # Unpack Public Key
-        msg_hash = int.from_bytes(sha512(msg).digest(), sys.byteorder)
-        unsign_msg = pow(int.from_bytes(sig, sys.byteorder), e, n)
+        msg_hash = int.from_bytes(sha512(msg).digest(), BYTEORDER)
+        unsign_msg = pow(int.from_bytes(sig, BYTEORDER), e, n)
         return msg_hash == unsign_msg
 
     def to_string(self, **kwargs):
+        import base64
+        import pyasn1.type.univ
+        import pyasn1.codec.der.encoder
+
         template = "--------------------BEGIN CERTIFICATE--------------------\n{}--------------------END CERTIFICATE--------------------\n"
         seq = pyasn1.type.univ.Sequence()
-        for i, x in enumerate((0, int.from_bytes(self.get_signature, sys.byteorder))):
+        for i, x in enumerate((0, int.from_bytes(self.get_signature, BYTEORDER))):
             seq.setComponentByPosition(i, pyasn1.type.univ.Integer(x))
         der = pyasn1.codec.der.encoder.encode(seq)
         if kwargs.get("format", None) == "PEM":
@@ -0,0 +1,170 @@
+"""
+Chain-level state: coin balances and the property registry, as confirmed by the accepted blocks.
+
+Applying a block records an undo log holding the previous value of every balance and property
+record the block changed. Disconnecting the block restores those values, so rolling back the last
+N blocks costs O(changes) instead of replaying the chain from genesis.
+"""
+# ? Built-in
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+# ? Local
+from block import Block
+from properties import PropertyRecord, PropertyRegistry
+
+# Marks a key that did not exist before the block
+MISSING = None
+
+
+@dataclass(repr=False)
+class UndoLog:
+    """
+    :block_id:
+        id of the block this log reverts.
+
+    :prev_hash:
+        id of the block before it, the tip after disconnecting.
+
+    :balances:
+        (account id, balance before the block) for every balance the block changed.
+
+    :properties:
+        (deed, record before the block) for every property the block created or transferred.
+    """
+
+    block_id: str
+    prev_hash: str
+    balances: list[tuple[str, Optional[int | float]]] = field(default_factory=lambda: list())
+    properties: list[tuple[str, Optional[PropertyRecord]]] = field(default_factory=lambda: list())
+
+    def __len__(self) -> int:
+        return len(self.balances) + len(self.properties)
+
+
+@dataclass(repr=False)
+class ChainState:
+    """
+    :balances:
+        account id to confirmed coin balance.
+
+    :properties:
+        registry of property deeds, indexed by deed, owner and worth.
+
+    :max_undo:
+        number of most recent blocks that can be disconnected.
+    """
+
+    balances: dict[str, int | float] = field(default_factory=lambda: dict())
+    properties: PropertyRegistry = field(default_factory=lambda: PropertyRegistry())
+    max_undo: int = 100
+    __undo: deque = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self.__undo = deque(maxlen=self.max_undo)
+
+    @property
+    def get_undo_depth(self) -> int:
+        """Number of blocks that can currently be disconnected"""
+        return len(self.__undo)
+
+    def get_balance(self, account_id: str) -> int | float:
+        return self.balances.get(account_id, 0)
+
+    def get_owner(self, deed: str) -> Optional[str]:
+        return self.properties.get_owner(deed)
+
+    def seed(self, account_id: str, amount: int | float) -> None:
+        """Credits coins outside any block, e.g. the faucet allocation. Cannot be undone"""
+        self.balances[account_id] = self.get_balance(account_id) + amount
+
+    def __set_balance(self, undo: UndoLog, touched: set, account_id: str, value) -> None:
+        if ("b", account_id) not in touched:  # * Only the value before the block is kept
+            touched.add(("b", account_id))
+            undo.balances.append((account_id, self.balances.get(account_id, MISSING)))
+        self.balances[account_id] = value
+
+    def __set_property(self, undo: UndoLog, touched: set, record: PropertyRecord) -> None:
+        if ("p", record.deed) not in touched:  # * Logged before put, so a failed put is reverted too
+            touched.add(("p", record.deed))
+            undo.properties.append((record.deed, self.properties.get(record.deed)))
+        self.properties.put(record)
+
+    def __apply_operation(self, undo: UndoLog, touched: set, op: dict) -> None:
+        sender, receiver, asset = op["sender"], op["receiver"], op["asset"]
+        if isinstance(asset, bool) or not isinstance(asset, (int, float, str, bytes)):
+            raise BaseException(f"Unknown asset {asset!r}")
+
+        if isinstance(asset, (str, bytes)):  # * Property deed
+            deed = asset.decode("ascii") if isinstance(asset, bytes) else asset
+            record = self.properties.get(deed)
+            if sender is None:  # * create_property
+                if record is not None:
+                    raise BaseException(f"Property '{deed}' already exists!")
+                record = PropertyRecord(deed, receiver, op.get("worth"), op.get("appro_area"))
+            elif record is None or record.owner != sender:
+                raise BaseException(f"Property '{deed}' is not owned by '{sender}'")
+            else:  # * payment_op_for_property
+                record = record._replace(owner=receiver)
+            self.__set_property(undo, touched, record)
+            return
+
+        if not (isinstance(asset, int) or math.isfinite(asset)) or asset < 0:
+            raise BaseException(f"Invalid amount {asset}")
+        if sender is None:  # * Coins are only issued outside blocks, by seed
+            raise BaseException(f"Payment of {asset} to '{receiver}' has no sender")
+        balance = self.get_balance(sender)
+        if asset > balance:
+            raise BaseException(f"Insufficient balance of '{sender}' to send {asset}")
+        self.__set_balance(undo, touched, sender, balance - asset)
+        self.__set_balance(undo, touched, receiver, self.get_balance(receiver) + asset)
+
+    def apply_block(self, block: Block) -> UndoLog:
+        """
+        a function that applies the operations of a block in order.
+        Either the whole block is applied or, on an invalid operation, nothing is.
+
+        :block:
+            block that passed the stateless checks
+
+        :returns:
+            the undo log of the block
+        """
+        undo = UndoLog(block.block_id, block.prev_hash)
+        touched: set = set()
+        try:
+            for _, tx in block.iter_transactions():
+                for op in tx["operation"]:
+                    self.__apply_operation(undo, touched, op)
+        except BaseException:
+            self.__revert(undo)
+            raise
+        self.__undo.append(undo)
+        return undo
+
+    def __revert(self, undo: UndoLog) -> None:
+        for account_id, balance in reversed(undo.balances):
+            if balance is MISSING:
+                self.balances.pop(account_id, None)
+            else:
+                self.balances[account_id] = balance
+        for deed, record in reversed(undo.properties):
+            if record is MISSING:
+                self.properties.remove(deed)
+            else:
+                self.properties.put(record)
+
+    def disconnect(self) -> UndoLog:
+        """
+        a function that reverts the most recently applied block.
+
+        :returns:
+            the undo log that was applied
+        """
+        if not self.__undo:
+            raise BaseException("No block to disconnect!")
+        undo = self.__undo.pop()
+        self.__revert(undo)
+        return undo
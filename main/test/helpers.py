@@ -0,0 +1,41 @@
+"""Signed test fixtures shared by the tests and the benchmarks"""
+from hashlib import sha256
+
+from block import Block
+from keypair import KeyPair
+from script import operation_message
+from signature import Signature
+from transaction import Transaction
+
+
+def make_signers(keys: int) -> list[tuple[str, tuple[int, int], tuple[int, int]]]:
+    """Returns (account id, kPr, kPub) for keys fresh key pairs"""
+    signers = []
+    for _ in range(keys):
+        kPr, kPub = KeyPair().gen_key_pair().values()
+        signers.append((sha256(str(kPub).encode("ascii")).hexdigest(), kPr, kPub))
+    return signers
+
+
+def make_block(
+    operations: int, signers: list, prev_hash: str = "0".zfill(64), start: int = 0
+) -> Block:
+    """
+    Returns a block of single-operation payments between signers.
+
+    :start:
+        first nonce and amount, so blocks built with different starts share no transaction
+    """
+    txs = []
+    for i in range(start, start + operations):
+        account_id, kPr, _ = signers[i % len(signers)]
+        receiver = signers[(i + 1) % len(signers)][0]
+        amount = i + 1
+        op = {
+            "sender": account_id,
+            "receiver": receiver,
+            "asset": amount,
+            "sig": Signature().sign_data(kPr, operation_message(account_id, receiver, amount, i)).hex(),
+        }
+        txs.append(Transaction().create_operation([op], i).get_trasaction_list)
+    return Block().create_block(prev_hash, txs)
@@ -2,6 +2,7 @@ import unittest
 
 from account import Account, SpecialAccount
 from keypair import KeyPair
+from keypool import KeyPool
 
 class AccountTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -25,7 +26,53 @@ class AccountTest(unittest.TestCase):
         self.assertEqual(self.user1.get_balance, 500-150.50)
         self.assertEqual(self.user2.get_balance, 150.50)
 
+    def test_running_balance_matches_history(self):
+        for amount in (10.25, 3.5, 40.0):
+            self.user1.create_payment_op(self.user2, amount, 1)
+
+        self.assertEqual(self.user1.get_balance, 500 - 10.25 - 3.5 - 40.0)
+        self.assertTrue(self.user1.audit_balance())
+        self.assertTrue(self.user2.audit_balance())
+
     def test_payment_of_more_than_availble(self):
         with self.assertRaises(BaseException):
             self.user1.create_payment_op(self.user2, 10000, 1)
 
+
+    def test_gen_account_from_key_pool(self):
+        with KeyPool(low_watermark=1, high_watermark=2, max_workers=2) as pool:
+            user3 = Account().gen_account(pool)
+            user3.add_key_pair_to_wallet(KeyPair(), pool)
+
+        self.assertEqual(len(user3.wallet), 2)
+        sig = user3.sign_data(b"check!!", 1)
+        self.user1.create_payment_op(user3, 25.0, 1)
+        self.assertEqual(user3.get_balance, 25.0)
+        self.assertTrue(sig)
+
+    def test_batch_payment(self):
+        recipients = [Account(_account_id=f"{i:064x}") for i in range(3)]
+        tx = self.user1.create_batch_payment(
+            [(recipients[0], 10), (recipients[1], 20.5), (recipients[0], 5)], 1
+        )
+
+        self.assertEqual(len(tx.set_of_operations), 3)
+        self.assertEqual(self.user1.get_balance, 500 - 35.5)
+        self.assertEqual(recipients[0].get_balance, 15)
+        self.assertEqual(recipients[1].get_balance, 20.5)
+        self.assertTrue(self.user1.audit_balance())
+        self.assertTrue(recipients[0].audit_balance())
+        with self.assertRaises(BaseException):  # * Each fits, the total does not
+            self.user1.create_batch_payment([(recipients[2], 300), (recipients[2], 300)], 1)
+        for amount in (-50.0, 0, True, "deed"):  # * Not a positive coin amount
+            with self.assertRaises(BaseException):
+                self.user1.create_batch_payment([(recipients[2], amount)], 1)
+        self.assertEqual(self.user1.get_balance, 500 - 35.5)
+
+    def test_batch_payment_mixed_amounts(self):
+        recipients = [Account(_account_id=f"{i:064x}") for i in range(2)]
+        tx = self.user1.create_batch_payment([(recipients[0], 10), (recipients[1], 10.0)], 1)
+
+        sigs = [op["sig"] for op in tx.set_of_operations]
+        self.assertNotEqual(sigs[0], sigs[1])  # * Int and float amounts sign different bytes
+        self.assertEqual(self.user1.get_balance, 500 - 20)
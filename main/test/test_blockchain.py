@@ -0,0 +1,136 @@
+import tempfile
+import unittest
+
+from block import Block
+from account import Account
+from keypair import KeyPair
+from blockchain import Blockchain
+from blockstore import BlockStore
+from validation import ValidationError
+
+class BlockchainTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.blockchain = Blockchain()
+        self.user = Account().gen_account()
+        self.user.add_key_pair_to_wallet(KeyPair())
+        self.blockchain.get_token_from_faucet(self.user, 100)
+        self.genesis = self.blockchain.init_blockchain([])
+
+    def test_transaction_index(self) -> None:
+        """Test accepted transactions are indexed by id"""
+        self.blockchain.validate_block(self.genesis)
+        tx_list = self.genesis.transactions[0]
+        tx_id = tx_list[0]["transaction_id"]
+
+        self.assertTrue(self.blockchain.has_transaction(tx_id))
+        self.assertEqual(self.blockchain.tx_index[tx_id], (0, 0))
+        self.assertEqual(self.blockchain.get_transaction(tx_id), tx_list)
+
+    def test_double_spending(self) -> None:
+        """Test a transaction cannot be recorded twice"""
+        self.blockchain.validate_block(self.genesis)
+        replay = Block().create_block(self.genesis.block_id, self.genesis.transactions)
+
+        with self.assertRaises(BaseException):
+            self.blockchain.validate_block(replay)
+        self.assertEqual(len(self.blockchain.block_history), 1)
+
+    def test_block_store(self) -> None:
+        """Test accepted blocks are persisted"""
+        with tempfile.TemporaryDirectory() as path:
+            with BlockStore(path) as store:
+                self.blockchain.block_store = store
+                self.blockchain.validate_block(self.genesis)
+            with BlockStore(path) as store:
+                self.assertEqual(store.get_by_height(0).block_id, self.genesis.block_id)
+
+    def test_restart_from_block_store(self) -> None:
+        """Test a Blockchain created on a store replays it and keeps extending it"""
+        account_id = self.user.get_account_id
+        with tempfile.TemporaryDirectory() as path:
+            with BlockStore(path) as store:
+                first = Blockchain(block_store=store)
+                first.get_token_from_faucet(self.user, 100)
+                genesis = first.init_blockchain([])
+                first.validate_block(genesis)
+
+            with BlockStore(path) as store:
+                restarted = Blockchain(block_store=store)
+                self.assertEqual(restarted.tip_id, genesis.block_id)
+                self.assertEqual(len(restarted.block_history), 1)
+                self.assertEqual(restarted.get_balance(account_id), 100)
+                self.assertEqual(restarted.get_fauce_coins(), first.get_fauce_coins())
+                self.assertIn(genesis.transactions[0][0]["transaction_id"], restarted.tx_index)
+
+                restarted.get_token_from_faucet(self.user, 50)  # * Signed by the same faucet key
+                restarted.validate_block(Block().create_block(restarted.tip_id, restarted.mempool.select()))
+                self.assertEqual(restarted.get_balance(account_id), 150)
+                self.assertEqual(len(store), 2)
+
+    def test_block_store_failure(self) -> None:
+        """Test a block the store refuses is not accepted in memory"""
+        account_id = self.user.get_account_id
+        with tempfile.TemporaryDirectory() as path:
+            with BlockStore(path) as store:
+                store.append(self.genesis)  # * The store refuses it as a duplicate
+                self.blockchain.block_store = store
+                with self.assertRaises(ValidationError) as ctx:
+                    self.blockchain.validate_block(self.genesis)
+                self.assertEqual(ctx.exception.stage, "store")
+                self.assertFalse(self.blockchain.block_history)
+                self.assertFalse(self.blockchain.tx_index)
+                self.assertEqual(self.blockchain.get_balance(account_id), 0)
+                self.assertEqual(len(self.blockchain.mempool), 1)
+                self.assertEqual(self.blockchain.state.get_undo_depth, 0)
+
+    def test_state_and_rollback(self) -> None:
+        """Test accepted blocks update confirmed balances and can be disconnected"""
+        account_id = self.user.get_account_id
+        self.assertEqual(self.blockchain.get_balance(account_id), 0)
+        self.blockchain.validate_block(self.genesis)
+        self.assertEqual(self.blockchain.get_balance(account_id), 100)
+        self.assertEqual(self.blockchain.coin_database[account_id], 100)
+
+        self.assertEqual(self.blockchain.rollback(1), [self.genesis.block_id])
+        self.assertEqual(self.blockchain.get_balance(account_id), 0)
+        self.assertFalse(self.blockchain.block_history)
+        self.assertEqual(self.blockchain.tip_id, self.genesis.prev_hash)
+        self.assertEqual(len(self.blockchain.mempool), 1)  # * Transactions are pending again
+        self.blockchain.validate_block(self.genesis)
+
+    def test_property_registry(self) -> None:
+        """Test property creation and sale transactions update the chain registry"""
+        buyer = Account().gen_account()
+        buyer.add_key_pair_to_wallet(KeyPair())
+        self.blockchain.get_token_from_faucet(buyer, 50)
+        self.blockchain.validate_block(self.genesis)
+
+        created = self.user.create_property(b"LR-001", b"2 acres", 40)
+        deed = created.set_of_operations[0]["asset"]
+        block = Block().create_block(self.genesis.block_id, [created.get_trasaction_list])
+        self.blockchain.validate_block(block)
+        registry = self.blockchain.get_properties
+        self.assertEqual(registry.get_owner(deed), self.user.get_account_id)
+        self.assertEqual(registry.get(deed).worth, 40)
+
+        sold = self.user.payment_op_for_property(deed, buyer, 40, 1)
+        self.blockchain.validate_block(Block().create_block(block.block_id, [sold.get_trasaction_list]))
+        self.assertEqual(registry.get_owner(deed), buyer.get_account_id)
+        self.assertEqual(registry.get_by_owner(self.user.get_account_id), [])
+        self.assertEqual([r.deed for r in registry.get_by_worth(40)], [deed])
+
+        self.blockchain.disconnect_tip()
+        self.assertEqual(registry.get_owner(deed), self.user.get_account_id)
+
+    def test_batch_faucet_payout(self) -> None:
+        """Test one faucet transaction funds many accounts once its block is accepted"""
+        accounts = [Account(_account_id=f"{i:064x}") for i in range(50)]
+        tx = self.blockchain.get_tokens_from_faucet([(account, 2) for account in accounts])
+        self.assertEqual(len(tx.set_of_operations), 50)
+
+        block = Block().create_block(self.blockchain.tip_id, self.blockchain.mempool.select())
+        self.blockchain.validate_block(block)
+        self.assertEqual(self.blockchain.get_fauce_coins(), 1000 - 100 - 50 * 2)
+        for account in accounts:
+            self.assertEqual(self.blockchain.get_balance(account.get_account_id), 2)
+            self.assertEqual(account.get_balance, 2)
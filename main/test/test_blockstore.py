@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from hashlib import sha256
+
+from block import Block
+from blockstore import SEGMENT_NAME, BlockStore
+
+class BlockStoreTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "chain")
+        self.blocks = []
+        prev_hash = "0".zfill(64)
+        for i in range(600):  # * Enough blocks to grow the hash index
+            tx_id = sha256(str(i).encode("ascii")).hexdigest()
+            block = Block().create_block(prev_hash, [[{"transaction_id": tx_id, "operation": [], "nonce": i}]])
+            self.blocks.append(block)
+            prev_hash = block.block_id
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_lookup_by_height_and_id(self) -> None:
+        """Test blocks are found by height and id across segments"""
+        with BlockStore(self.path, segment_size=4096, sync_every=0) as store:
+            for block in self.blocks:
+                store.append(block)
+
+            self.assertEqual(len(store), 600)
+            self.assertEqual(store.get_by_height(0).block_id, self.blocks[0].block_id)
+            self.assertEqual(store.get_height(self.blocks[345].block_id), 345)
+            self.assertEqual(store.get_by_id(self.blocks[599].block_id).transactions, self.blocks[599].transactions)
+            self.assertIsNone(store.get_by_id("ff" * 32))
+        self.assertTrue(os.path.exists(os.path.join(self.path, "blk00001.dat")))
+
+    def test_reopen_and_replay(self) -> None:
+        """Test a reopened store keeps its blocks and continues appending"""
+        with BlockStore(self.path, segment_size=4096) as store:
+            for block in self.blocks[:300]:
+                store.append(block)
+        with BlockStore(self.path, segment_size=4096) as store:
+            for block in self.blocks[300:]:
+                store.append(block)
+            replayed = [block.block_id for block in store.iter_blocks()]
+
+        self.assertEqual(replayed, [block.block_id for block in self.blocks])
+
+    def test_duplicate_block(self) -> None:
+        """Test a block id is stored only once"""
+        with BlockStore(self.path) as store:
+            store.append(self.blocks[0])
+            with self.assertRaises(BaseException):
+                store.append(self.blocks[0])
+
+    def test_pop(self) -> None:
+        """Test popping blocks across segments keeps both indexes and appends consistent"""
+        with BlockStore(self.path, segment_size=4096, sync_every=0) as store:
+            for block in self.blocks:
+                store.append(block)
+            for block in reversed(self.blocks[400:]):
+                self.assertEqual(store.pop(), block.block_id)
+
+            self.assertEqual(len(store), 400)
+            self.assertIsNone(store.get_height(self.blocks[450].block_id))
+            for height in range(400):  # * Every remaining id survives the backward shifts
+                self.assertEqual(store.get_height(self.blocks[height].block_id), height)
+            store.append(self.blocks[400])
+        with BlockStore(self.path, segment_size=4096) as store:
+            replayed = [block.block_id for block in store.iter_blocks()]
+        self.assertEqual(replayed, [block.block_id for block in self.blocks[:401]])
+
+    def test_recover_lost_writes(self) -> None:
+        """Test index records past the end of the data are dropped when the store is reopened"""
+        with BlockStore(self.path, segment_size=4096) as store:
+            for block in self.blocks[:300]:
+                store.append(block)
+            last = max(name for name in os.listdir(self.path) if name.endswith(".dat"))
+        segment = os.path.join(self.path, last)
+        os.truncate(segment, os.path.getsize(segment) - 1)  # * Last block only partly written
+        with open(os.path.join(self.path, SEGMENT_NAME.format(int(last[3:8]) + 1)), "wb") as f:
+            f.write(b"unindexed")  # * Segment started but never indexed
+
+        with BlockStore(self.path, segment_size=4096) as store:
+            self.assertEqual(len(store), 299)
+            self.assertIsNone(store.get_height(self.blocks[299].block_id))
+            self.assertEqual(store.get_height(self.blocks[298].block_id), 298)
+            for block in self.blocks[299:]:
+                store.append(block)
+        with BlockStore(self.path, segment_size=4096) as store:
+            replayed = [block.block_id for block in store.iter_blocks()]
+        self.assertEqual(replayed, [block.block_id for block in self.blocks])
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from account import Account, WALLET_STRUCT
+from keypool import gen_wallet_entry
+from signature import Signature
+from derivation import derive_wallet_entry, derive_wallet_entries, wallet_seed
+
+
+class DerivationTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.root = gen_wallet_entry(key_bytes=512)
+        cls.seed = wallet_seed(cls.root)
+
+    def test_deterministic(self) -> None:
+        """Test a seed and index always derive the same valid key pair"""
+        entry = derive_wallet_entry(self.seed, 1, key_bytes=512)
+        self.assertEqual(entry, derive_wallet_entry(self.seed, 1, key_bytes=512))
+        self.assertNotEqual(entry, derive_wallet_entry(self.seed, 2, key_bytes=512))
+
+        d, e, n, p, q, dP, dQ, qInv = entry
+        self.assertEqual(p * q, n)
+        self.assertEqual(e, 65537)
+        sig = Signature().sign_data_crt((p, q, dP, dQ, qInv), b"child")
+        self.assertTrue(Signature().verify_signature(b"child", sig, (n, e)))
+
+    def test_batch(self) -> None:
+        """Test batch derivation on workers returns the keys in index order"""
+        entries = derive_wallet_entries(self.seed, [3, 1, 2], key_bytes=512, max_workers=2)
+        self.assertEqual(entries[1], derive_wallet_entry(self.seed, 1, key_bytes=512))
+        self.assertEqual(len(set(entries)), 3)
+
+    def test_account_wallet(self) -> None:
+        """Test wallets with the same first key derive the same sub-keys"""
+        first, second = (Account(wallet=np.array([self.root], dtype=WALLET_STRUCT)) for _ in range(2))
+        first.derive_key_pairs(2, key_bytes=512, max_workers=1)
+        second.derive_key_pairs(2, key_bytes=512, max_workers=1)
+
+        self.assertEqual(len(first.wallet), 3)
+        self.assertEqual(first.wallet[2]["Modulus"], second.wallet[2]["Modulus"])
+        self.assertEqual(first.get_account_id, second.get_account_id)
+        with self.assertRaises(BaseException):
+            first.derive_key_pairs(0)
+        self.assertEqual(len(first.wallet), 3)
@@ -0,0 +1,54 @@
+import unittest
+
+from block import Block
+from encoding import encode, decode
+from transaction import Transaction
+
+class EncodingTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ops = [
+            {
+                "sender": "14bea94409798b67d78cfd9d544c8714af1e195f061395cdfc401f5891212434",
+                "receiver": "13888b7f65354f0f67116ffd0254f77205620a3f6e8ce24d7f7bd346e9e7b17e",
+                "asset": 150.5,
+                "sig": "d6f3178feecf7bf7d27041dc1819ec6",
+            }
+        ]
+
+    def test_round_trip(self) -> None:
+        """Test decode returns the encoded value"""
+        value = [None, True, False, -7, 2**100, 0.25, "deed", "ab01", b"\x00raw", {"k": [1]}]
+        self.assertEqual(decode(encode(value)), value)
+
+    def test_stable_bytes(self) -> None:
+        """Test the encoding is byte-for-byte the one stored ids were hashed over"""
+        value = [{"sender": "ab" * 4, "asset": -128, "sig": None, "worth": 1.5, "name": "Deed", "raw": b"\x00"}, 127, True, False, 300]
+        self.assertEqual(
+            encode(value).hex(),
+            "08050906050372617707010005037369670005046e616d65050444656564050561737365740302ff80"
+            "0505776f727468043ff8000000000000050673656e6465720604abababab03017f02010302012c",
+        )
+
+    def test_canonical_dict_order(self) -> None:
+        """Test equal dicts encode the same regardless of key order"""
+        reordered = [dict(reversed(list(self.ops[0].items())))]
+        self.assertEqual(encode(self.ops), encode(reordered))
+
+    def test_transaction_id_covers_operations(self) -> None:
+        """Test the id depends on operations and nonce"""
+        tx1 = Transaction().create_operation(self.ops, 7)
+        tx2 = Transaction().create_operation([dict(self.ops[0], asset=1)], 7)
+
+        self.assertNotEqual(tx1.transaction_id, tx2.transaction_id)
+        self.assertEqual(tx1.transaction_id, tx1.eval())
+
+    def test_transaction_and_block_bytes(self) -> None:
+        """Test binary serializers round-trip and beat JSON on size"""
+        tx = Transaction().create_operation(self.ops, 7)
+        block = Block().create_block("0".zfill(64), [tx.get_trasaction_list])
+        tx_copy = Transaction.from_bytes(tx.to_bytes())
+        block_copy = Block.from_bytes(block.to_bytes())
+
+        self.assertEqual(tx_copy.get_trasaction_list, tx.get_trasaction_list)
+        self.assertEqual(block_copy.eval(), block.block_id)
+        self.assertLess(len(block.to_bytes()), len(block.to_string()))
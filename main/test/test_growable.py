@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+
+from growable import GrowableArray
+
+class GrowableArrayTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dtype = np.dtype([("UTXO", "O"), ("STXO", "O")])
+        self.history = GrowableArray(self.dtype, capacity=2)
+
+    def test_append_grows_capacity(self) -> None:
+        """Test appends past capacity keep every row"""
+        for i in range(9):
+            self.history.append(([i], None))
+
+        self.assertEqual(len(self.history), 9)
+        self.assertGreaterEqual(self.history.capacity, 9)
+        self.assertEqual(list(self.history["UTXO"]), [[i] for i in range(9)])
+
+    def test_field_access(self) -> None:
+        """Test field views only cover used rows"""
+        self.history.append(([1], None))
+        self.history.append((None, [2]))
+
+        self.assertEqual(list(self.history["STXO"]), [None, [2]])
+        self.assertEqual(self.history[-1]["STXO"], [2])
+
+    def test_from_array(self) -> None:
+        """Test conversion from a plain structured array"""
+        array = np.array([([1], None), (None, [2])], dtype=self.dtype)
+        history = GrowableArray.from_array(array)
+        history.append(([3], None))
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history["UTXO"][2], [3])
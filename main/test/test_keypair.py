@@ -2,9 +2,61 @@ import sys
 import unittest
 
 from keypair import KeyPair
+from signature import Signature, read_signature, signature_width
 
 class KeyPairTestCase(unittest.TestCase):
     def setUp(self) -> None:
+        self.keys = KeyPair()
+        self.private_key, self.public_key = self.keys.gen_key_pair().values()
         return super().setUp()
 
-    
+    def test_crt_params(self) -> None:
+        """Test CRT parameters belong to the generated key"""
+        p, q, dP, dQ, qInv = self.keys.get_crt_params
+        d, n = self.private_key
+
+        self.assertEqual(p * q, n)
+        self.assertEqual(dP, d % (p - 1))
+        self.assertEqual(dQ, d % (q - 1))
+        self.assertEqual((q * qInv) % p, 1)
+
+    def test_signature_width(self) -> None:
+        """Test signatures are modulus length and older widths read back to it"""
+        n = self.public_key[0]
+        sig = Signature().sign_data(self.private_key, b"width")
+        self.assertEqual(len(sig), signature_width(n))
+
+        value = int.from_bytes(sig, "little")
+        padded = value.to_bytes(value.bit_length(), "little")
+        self.assertEqual(read_signature(padded, n), sig)
+        self.assertEqual(read_signature(sig.rstrip(b"\x00"), n), sig)
+        with self.assertRaises(ValueError):
+            read_signature(n.to_bytes(signature_width(n), "little"), n)
+
+    def test_crt_signature_matches(self) -> None:
+        """Test CRT signing produces the same verifiable signature"""
+        signer = Signature()
+        sig = signer.sign_data(self.private_key, b"deed transfer")
+        sig_crt = signer.sign_data_crt(self.keys.get_crt_params, b"deed transfer")
+
+        self.assertEqual(sig, sig_crt)
+        self.assertTrue(
+            signer.verify_signature(b"deed transfer", sig_crt, self.public_key)
+        )
+
+    def test_cached_export(self) -> None:
+        """Test primes are generated once and the DER export holds the generated key"""
+        import pyasn1.codec.der.decoder
+
+        self.assertEqual(self.keys.get_primes, self.keys.get_primes)
+        der_prv, der_pub = self.keys.to_string()
+        fields = [int(x) for x in pyasn1.codec.der.decoder.decode(der_prv)[0]]
+        n, e = self.public_key
+        self.assertEqual(fields[:4], [0, n, e, self.private_key[0]])
+        self.assertEqual(tuple(fields[4:]), self.keys.get_crt_params)
+        self.assertTrue(self.keys.to_string(key="Public", format="PEM").startswith("----"))
+
+    def test_exponent_below_phi(self) -> None:
+        """Test a public exponent that cannot be below phi(n) is refused"""
+        with self.assertRaises(ValueError):
+            KeyPair(key_bytes=512).gen_key_pair(1 << 1100)
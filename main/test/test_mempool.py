@@ -0,0 +1,92 @@
+import unittest
+from hashlib import sha256
+
+from block import Block
+from mempool import Mempool
+
+def make_tx(i: int, sender: str | None = "alice", asset: int | str = 1) -> list[dict]:
+    """Transaction list with the shape produced by Transaction.get_trasaction_list"""
+    op = {"sender": sender, "receiver": "bob", "asset": asset, "sig": "ab"}
+    tx_id = sha256(str(i).encode("ascii")).hexdigest()
+    return [{"transaction_id": tx_id, "operation": [op], "nonce": i}]
+
+class MempoolTestCase(unittest.TestCase):
+    def test_add_and_lookup(self) -> None:
+        """Test transactions are found by id and duplicates are rejected"""
+        pool = Mempool()
+        tx = make_tx(0)
+        tx_id = tx[0]["transaction_id"]
+
+        self.assertTrue(pool.add(tx))
+        self.assertFalse(pool.add(tx))
+        self.assertIn(tx_id, pool)
+        self.assertEqual(pool.get(tx_id), tx)
+        self.assertEqual(len(pool), 1)
+
+    def test_property_conflict(self) -> None:
+        """Test the same property cannot be pending twice from one sender"""
+        pool = Mempool()
+        first = make_tx(0, asset="deed")
+        self.assertTrue(pool.add(first))
+        self.assertEqual(pool.get_conflicts(make_tx(1, asset="deed")), {first[0]["transaction_id"]})
+        self.assertFalse(pool.add(make_tx(1, asset="deed")))
+        self.assertTrue(pool.add(make_tx(2, sender="carol", asset="deed")))
+        self.assertTrue(pool.add(make_tx(3, asset=5)))  # * Coin payments do not conflict
+
+        pool.remove([first[0]["transaction_id"]])
+        self.assertTrue(pool.add(make_tx(1, asset="deed")))
+
+    def test_ordering(self) -> None:
+        """Test selection follows priority, then arrival"""
+        pool = Mempool()
+        txs = [make_tx(i) for i in range(4)]
+        for tx, priority in zip(txs, (1, 5, 1, 3)):
+            pool.add(tx, priority)
+        self.assertEqual(pool.select(), [txs[1], txs[3], txs[0], txs[2]])
+        self.assertEqual(pool.select(max_count=2), [txs[1], txs[3]])
+        self.assertEqual(len(pool), 4)  # * Selecting does not remove
+
+        fifo = Mempool(order="arrival")
+        for tx, priority in zip(txs, (1, 5, 1, 3)):
+            fifo.add(tx, priority)
+        self.assertEqual(fifo.select(), txs)
+
+    def test_eviction(self) -> None:
+        """Test a full pool evicts the lowest priority for a higher one"""
+        pool = Mempool(max_count=2)
+        txs = [make_tx(i) for i in range(4)]
+        self.assertTrue(pool.add(txs[0], 1))
+        self.assertTrue(pool.add(txs[1], 2))
+        self.assertFalse(pool.add(txs[2], 1))
+        self.assertTrue(pool.add(txs[3], 3))
+        self.assertEqual(pool.select(), [txs[3], txs[1]])
+
+        sized = Mempool(max_bytes=pool.get_bytes)  # * Room for two transactions
+        self.assertTrue(sized.add(txs[0], 1))
+        self.assertTrue(sized.add(txs[1], 1))
+        self.assertFalse(sized.add(txs[2], 1))
+        self.assertLessEqual(sized.get_bytes, sized.max_bytes)
+
+        fifo = Mempool(max_count=1, order="arrival")
+        self.assertTrue(fifo.add(txs[0]))
+        self.assertFalse(fifo.add(txs[1], 10))
+
+    def test_eviction_compacts(self) -> None:
+        """Test evicted transactions do not pile up in the inclusion heap"""
+        pool = Mempool(max_count=10)
+        for i in range(5000):
+            self.assertTrue(pool.add(make_tx(i), i))
+        self.assertEqual(len(pool), 10)
+        self.assertLessEqual(pool.get_queue_size, 2 * len(pool) + 64)
+        self.assertEqual(pool.select(), [make_tx(i) for i in range(4999, 4989, -1)])
+
+    def test_remove_included(self) -> None:
+        """Test a block only removes the transactions it included"""
+        pool = Mempool()
+        txs = [make_tx(i) for i in range(3)]
+        for tx in txs:
+            pool.add(tx)
+        block = Block().create_block("0".zfill(64), txs[:2])
+
+        self.assertEqual(pool.remove_included(block), 2)
+        self.assertEqual(pool.select(), [txs[2]])
@@ -0,0 +1,55 @@
+import unittest
+from hashlib import sha256
+
+from block import Block
+from merkle import MerkleTree, hash_leaf, hash_node
+
+def full_root(leaves: list[bytes]) -> bytes:
+    """Reference root: rehash every level from scratch"""
+    level = [hash_leaf(leaf) for leaf in leaves]
+    while len(level) > 1:
+        lone = [level.pop()] if len(level) % 2 else []
+        level = [hash_node(level[i], level[i + 1]) for i in range(0, len(level), 2)] + lone
+    return level[0]
+
+class MerkleTreeTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tx_ids = [sha256(str(i).encode("ascii")).hexdigest() for i in range(9)]
+
+    def test_incremental_root(self) -> None:
+        """Test appending leaf by leaf gives the same root as a full rebuild"""
+        tree = MerkleTree()
+        for size, tx_id in enumerate(self.tx_ids, start=1):
+            tree.append(tx_id)
+            self.assertEqual(tree.get_root, full_root(self.tx_ids[:size]))
+
+    def test_odd_leaf_not_duplicated(self) -> None:
+        """Test repeating the last leaf changes the root"""
+        for size in (3, 5, 7, 9):
+            tx_ids = self.tx_ids[:size]
+            self.assertNotEqual(MerkleTree(tx_ids).get_root, MerkleTree(tx_ids + tx_ids[-1:]).get_root)
+
+    def test_inclusion_proofs(self) -> None:
+        """Test every leaf has a valid proof and a wrong id fails"""
+        tree = MerkleTree(self.tx_ids)
+        for index, tx_id in enumerate(self.tx_ids):
+            proof = tree.get_proof(index)
+            self.assertTrue(MerkleTree.verify_proof(tx_id, proof, tree.get_root))
+            self.assertFalse(MerkleTree.verify_proof(self.tx_ids[index - 1], proof, tree.get_root))
+        for size in range(1, len(self.tx_ids)):  # * Every shape of lone nodes
+            tree = MerkleTree(self.tx_ids[:size])
+            for index in range(size):
+                self.assertTrue(MerkleTree.verify_proof(self.tx_ids[index], tree.get_proof(index), tree.get_root))
+
+    def test_block_assembly(self) -> None:
+        """Test incremental block assembly matches create_block"""
+        tx_lists = [[{"transaction_id": tx_id, "operation": [], "nonce": 0}] for tx_id in self.tx_ids]
+        block = Block().create_block("0".zfill(64), tx_lists)
+        assembled = Block().create_block("0".zfill(64), [])
+        for tx_list in tx_lists:
+            assembled.add_transaction(tx_list)
+
+        self.assertEqual(assembled.merkle_root, block.merkle_root)
+        self.assertEqual(assembled.block_id, block.block_id)
+        proof = block.get_inclusion_proof(self.tx_ids[4])
+        self.assertTrue(Block.verify_inclusion(self.tx_ids[4], proof, block.merkle_root))
@@ -0,0 +1,80 @@
+import json
+import unittest
+from urllib.request import urlopen
+
+import metrics
+from metrics import MetricsRegistry, REGISTRY
+from keypair import KeyPair
+from signature import Signature
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry(enabled=True)
+
+    def tearDown(self) -> None:
+        metrics.disable()
+        REGISTRY.reset()
+
+    def test_disabled_is_noop(self) -> None:
+        """Test metrics ignore updates while disabled"""
+        registry = MetricsRegistry()
+        counter = registry.counter("calls_total")
+        histogram = registry.histogram("call_seconds")
+        counter.inc()
+        histogram.observe(0.1)
+        with histogram.time():
+            pass
+        self.assertEqual(counter.value, 0)
+        self.assertEqual(histogram.count, 0)
+
+    def test_counter_and_histogram(self) -> None:
+        """Test values, labels and quantile estimates"""
+        self.registry.counter("calls_total", kind="a").inc(2)
+        self.registry.counter("calls_total", kind="a").inc()
+        histogram = self.registry.histogram("call_seconds", buckets=(0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot["counters"]['calls_total{kind="a"}'], 3)
+        self.assertEqual(snapshot["histograms"]["call_seconds"]["count"], 4)
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+        with self.assertRaises(ValueError):
+            self.registry.histogram("calls_total", kind="a")
+
+    def test_prometheus_text(self) -> None:
+        """Test the exposition format has cumulative buckets, sum and count"""
+        self.registry.counter("calls_total", "Calls").inc()
+        self.registry.histogram("call_seconds", "Latency", buckets=(0.1, 1.0)).observe(0.5)
+        lines = self.registry.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE calls_total counter", lines)
+        self.assertIn("calls_total 1", lines)
+        self.assertIn('call_seconds_bucket{le="0.1"} 0', lines)
+        self.assertIn('call_seconds_bucket{le="1.0"} 1', lines)
+        self.assertIn('call_seconds_bucket{le="+Inf"} 1', lines)
+        self.assertIn("call_seconds_count 1", lines)
+
+    def test_instrumented_hot_paths(self) -> None:
+        """Test keygen and signing are timed once enabled and served over HTTP"""
+        metrics.enable()
+        kPr, kPub = KeyPair(key_bytes=512).gen_key_pair().values()
+        sig = Signature().sign_data(kPr, b"msg")
+        Signature().verify_signature(b"msg", sig, kPub)
+
+        histograms = REGISTRY.snapshot()["histograms"]
+        self.assertEqual(histograms["keypair_gen_seconds"]["count"], 1)
+        self.assertEqual(histograms["signature_sign_seconds"]["count"], 1)
+        self.assertEqual(histograms["signature_verify_seconds"]["count"], 1)
+
+        server = metrics.serve(0)
+        try:
+            port = server.server_address[1]
+            text = urlopen(f"http://127.0.0.1:{port}/metrics").read().decode("utf-8")
+            self.assertIn("keypair_gen_seconds_count 1", text)
+            data = json.loads(urlopen(f"http://127.0.0.1:{port}/metrics.json").read())
+            self.assertIn("signature_sign_seconds", data["histograms"])
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -6,13 +6,11 @@ from keypair import KeyPair
 from signature import Signature
 
 from script import DataNode, DUP, SHA256, EQUALVERIFY, CHECKSIG
-
-KEYS = KeyPair()
-SIGNER = Signature()
+from bytecode import get_cache_size, run_script
 
 class OpsTestCase(unittest.TestCase):
     def setUp(self) -> None:
-        self.private_key, self.public_key = KEYS.gen_key_pair().values()
+        self.private_key, self.public_key = KeyPair().gen_key_pair().values()
 
         self.data_node = DataNode(hexlify(str(self.public_key).encode("ascii")))
         self.dup_test = DUP(self.data_node)
@@ -39,6 +37,28 @@ class OpsTestCase(unittest.TestCase):
     def test_check_sig(self) -> None:
         """ Test "CHECKSIG" """
 
-        sig = SIGNER.sign_data(self.public_key, b"check!!")
+        sig = Signature().sign_data(self.public_key, b"check!!")
         checked = CHECKSIG(DataNode(b"check"), self.data_node, sig)
-        self.assertTrue(checked)
\ No newline at end of file
+        self.assertTrue(checked)
+
+    def test_compiled_script(self) -> None:
+        """Test the bytecode interpreter runs P2PKH without eval()"""
+        sig = Signature().sign_data(self.private_key, b"check!!")
+        unlocking = f"{sig.hex()} {self.data_node.eval().decode('ascii')}"
+        locking = f"DUP SHA256 {self.manual_hash.decode('ascii')} EQUALVERIFY CHECKSIG"
+
+        self.assertTrue(run_script((unlocking, locking), b"check!!"))
+        self.assertFalse(run_script((unlocking, locking), b"forged"))
+        self.assertFalse(run_script((unlocking, locking.replace("DUP", "DUP DUP")), b"check!!"))
+        self.assertFalse(run_script((unlocking, "DUP SHA256 __import__ EQUALVERIFY CHECKSIG"), b"check!!"))
+
+    def test_only_locking_scripts_cached(self) -> None:
+        """Test unique unlocking scripts do not fill the compiled script cache"""
+        locking = f"DUP SHA256 {self.manual_hash.decode('ascii')} EQUALVERIFY CHECKSIG"
+        run_script(locking, b"warm")
+        size = get_cache_size()
+        for i in range(20):
+            sig = Signature().sign_data(self.private_key, str(i).encode("ascii"))
+            unlocking = f"{sig.hex()} {self.data_node.eval().decode('ascii')}"
+            self.assertTrue(run_script((unlocking, locking), str(i).encode("ascii")))
+        self.assertEqual(get_cache_size(), size)
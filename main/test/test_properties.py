@@ -0,0 +1,36 @@
+import unittest
+
+from properties import PropertyRecord, PropertyRegistry
+
+class PropertyRegistryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = PropertyRegistry()
+        for i, worth in enumerate((500, 100, 300, 300, None)):
+            self.registry.put(PropertyRecord(f"deed{i}", "alice" if i % 2 else "bob", worth))
+
+    def test_lookup(self) -> None:
+        """Test lookups by deed and by owner"""
+        self.assertEqual(len(self.registry), 5)
+        self.assertEqual(self.registry.get_owner("deed1"), "alice")
+        self.assertIsNone(self.registry.get("deed9"))
+        self.assertEqual({r.deed for r in self.registry.get_by_owner("alice")}, {"deed1", "deed3"})
+        self.assertEqual(self.registry.get_by_owner("carol"), [])
+
+    def test_worth_range(self) -> None:
+        """Test range queries on worth are inclusive and sorted"""
+        deeds = lambda records: [r.deed for r in records]
+        self.assertEqual(deeds(self.registry.get_by_worth(300)), ["deed2", "deed3", "deed0"])
+        self.assertEqual(deeds(self.registry.get_by_worth(100, 300)), ["deed1", "deed2", "deed3"])
+        self.assertEqual(deeds(self.registry.get_by_worth(high=99)), [])
+        self.assertEqual(len(self.registry.get_by_worth()), 4)  # * No worth, not listed
+
+    def test_transfer_and_remove(self) -> None:
+        """Test replacing a record moves it between owner indexes"""
+        previous = self.registry.put(self.registry.get("deed0")._replace(owner="alice"))
+        self.assertEqual(previous.owner, "bob")
+        self.assertEqual(len(self.registry.get_by_owner("alice")), 3)
+        self.assertEqual(self.registry.get_by_worth(500)[0].owner, "alice")
+
+        self.assertEqual(self.registry.remove("deed2").worth, 300)
+        self.assertIsNone(self.registry.remove("deed2"))
+        self.assertEqual([r.deed for r in self.registry.get_by_worth(300, 300)], ["deed3"])
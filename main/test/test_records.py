@@ -0,0 +1,36 @@
+import unittest
+
+from records import OperationRecord, TransactionRecord, pack_transactions, unpack_transactions
+from transaction import Transaction
+
+
+class RecordsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        ops = [
+            {"sender": "ab" * 32, "receiver": "cd" * 32, "asset": 5, "sig": "0102ff"},
+            {"sender": None, "receiver": "cd" * 32, "asset": "6465", "sig": None, "worth": 7, "appro_area": "31"},
+        ]
+        self.tx_list = Transaction().create_operation(ops, 3).get_trasaction_list
+
+    def test_round_trip(self) -> None:
+        """Test records rebuild the exact transaction list, including property fields"""
+        records = pack_transactions(self.tx_list)
+        self.assertEqual(unpack_transactions(records), self.tx_list)
+        self.assertEqual(records[0].get_id, self.tx_list[0]["transaction_id"])
+
+    def test_compact_fields(self) -> None:
+        """Test hex ids and signatures are stored as bytes, assets as they are"""
+        record = pack_transactions(self.tx_list)[0]
+        self.assertEqual(len(record.transaction_id), 32)
+        self.assertEqual(record.operations[0].sender, bytes.fromhex("ab" * 32))
+        self.assertEqual(record.operations[1].asset, "6465")
+        self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(AttributeError):
+            record.nonce = 4
+
+    def test_non_hex_values_kept(self) -> None:
+        """Test values that are not lowercase hex survive unchanged"""
+        op = {"sender": "faucet", "receiver": "AB", "asset": 1, "sig": None}
+        self.assertEqual(OperationRecord.from_dict(op).to_dict(), op)
+        tx = {"transaction_id": "0", "operation": [op], "nonce": 0}
+        self.assertEqual(TransactionRecord.from_dict(tx).to_dict(), tx)
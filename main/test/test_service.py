@@ -0,0 +1,70 @@
+import copy
+import asyncio
+import unittest
+
+from blockchain import Blockchain
+from service import LedgerService, SubmitError
+from validation import hash_transaction
+from test.helpers import make_block, make_signers
+
+
+class LedgerServiceTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.signers = make_signers(2)
+
+    def setUp(self) -> None:
+        self.blockchain = Blockchain()
+        for account_id, _, kPub in self.signers:
+            self.blockchain.key_registry[account_id] = kPub
+            self.blockchain.state.seed(account_id, 10**6)
+
+    def test_concurrent_submit(self) -> None:
+        """Test concurrent submitters are committed in blocks of at most max_block_txs"""
+        txs = make_block(10, self.signers).transactions
+
+        async def main():
+            async with LedgerService(self.blockchain, max_block_txs=4, max_delay=0.01) as service:
+                return await asyncio.gather(*(service.submit(tx) for tx in txs))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(self.blockchain.block_history), 3)
+        self.assertEqual({height for _, height in results}, {0, 1, 2})
+        for tx, (_, height) in zip(txs, results):
+            self.assertEqual(self.blockchain.tx_index[tx[0]["transaction_id"]][0], height)
+
+    def test_invalid_transaction_fails_alone(self) -> None:
+        """Test a rejected transaction fails its submitter while the rest of its block commits"""
+        txs = make_block(4, self.signers).transactions
+        bad = copy.deepcopy(txs[1])
+        bad[0]["operation"][0]["asset"] += 1  # * Id and signature no longer match
+        bad[0]["transaction_id"] = "ff" * 32
+        txs[1] = bad
+
+        async def main():
+            async with LedgerService(self.blockchain, max_block_txs=4) as service:
+                return await asyncio.gather(*(service.submit(tx) for tx in txs), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertIsInstance(results[1], SubmitError)
+        self.assertEqual(sum(isinstance(r, tuple) for r in results), 3)
+        self.assertNotIn("ff" * 32, self.blockchain.tx_index)
+        self.assertEqual(len(self.blockchain.mempool), 0)
+
+    def test_malformed_transaction_keeps_serving(self) -> None:
+        """Test a transaction a lower layer refuses fails alone and the service keeps committing"""
+        first, second = make_block(2, self.signers).transactions
+        bad = copy.deepcopy(first)
+        op = bad[0]["operation"][0]
+        op["asset"] = -3  # * Has no signed message form
+        bad[0]["transaction_id"] = hash_transaction(bad[0]["operation"], bad[0]["nonce"])
+
+        async def main():
+            async with LedgerService(self.blockchain, max_block_txs=1, max_delay=0.01) as service:
+                with self.assertRaises(SubmitError):
+                    await asyncio.wait_for(service.submit(bad), 5)
+                return await asyncio.wait_for(service.submit(second), 5)
+
+        _, height = asyncio.run(main())
+        self.assertEqual(height, 0)
+        self.assertIn(second[0]["transaction_id"], self.blockchain.tx_index)
@@ -0,0 +1,50 @@
+import unittest
+
+from keypair import KeyPair
+from signature import Signature
+from sigcache import ENTRY_BYTES, SIGCACHE, SignatureCache
+from script import DataNode, CHECKSIG
+
+class SignatureCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.private_key, self.public_key = KeyPair().gen_key_pair().values()
+        signer = Signature()
+        self.items = [
+            (msg, signer.sign_data(self.private_key, msg), self.public_key)
+            for msg in (b"a", b"b", b"c")
+        ]
+
+    def test_hits_and_misses(self) -> None:
+        """Test a repeated verification is a hit and invalid ones are not cached"""
+        cache = SignatureCache()
+        self.assertTrue(cache.verify(*self.items[0]))
+        self.assertTrue(cache.verify(*self.items[0]))
+        self.assertFalse(cache.verify(b"forged", self.items[0][1], self.public_key))
+        self.assertFalse(cache.verify(b"forged", self.items[0][1], self.public_key))
+
+        self.assertEqual(cache.get_stats["hits"], 1)
+        self.assertEqual(cache.get_stats["misses"], 3)
+        self.assertEqual(len(cache), 1)
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used entry is evicted at the memory bound"""
+        cache = SignatureCache(max_bytes=2 * ENTRY_BYTES)
+        cache.verify(*self.items[0])
+        cache.verify(*self.items[1])
+        cache.verify(*self.items[0])  # * items[1] is now least recently used
+        cache.verify(*self.items[2])
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_stats["evictions"], 1)
+        self.assertTrue(cache.contains(cache.make_key(*self.items[0])))
+        self.assertFalse(cache.contains(cache.make_key(*self.items[1])))
+
+    def test_checksig_consults_cache(self) -> None:
+        """Test CHECKSIG records and reuses verifications"""
+        msg, sig, _ = self.items[0]
+        pub_key = DataNode(str(self.public_key).encode("ascii").hex())
+        SIGCACHE.clear()
+        CHECKSIG(DataNode(msg), pub_key, DataNode(sig)).eval()
+        self.assertTrue(CHECKSIG(DataNode(msg), pub_key, DataNode(sig)).eval())
+
+        self.assertEqual(SIGCACHE.get_stats["hits"], 1)
@@ -0,0 +1,77 @@
+import unittest
+from hashlib import sha256
+
+from block import Block
+from state import ChainState
+
+def make_block(prev_hash: str, *ops: tuple) -> Block:
+    """Block with one transaction per (sender, receiver, asset) operation"""
+    txs = []
+    for sender, receiver, asset in ops:
+        op = {"sender": sender, "receiver": receiver, "asset": asset, "sig": None}
+        tx_id = sha256(f"{prev_hash}{len(txs)}".encode("ascii")).hexdigest()
+        txs.append([{"transaction_id": tx_id, "operation": [op], "nonce": len(txs)}])
+    return Block().create_block(prev_hash, txs)
+
+class ChainStateTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state = ChainState(max_undo=2)
+        self.state.seed("faucet", 100)
+
+    def test_apply_and_disconnect(self) -> None:
+        """Test disconnecting blocks restores balances and owners exactly"""
+        first = make_block("0".zfill(64), ("faucet", "alice", 60), (None, "alice", "deed"))
+        second = make_block(first.block_id, ("alice", "bob", 25), ("alice", "bob", "deed"))
+
+        undo = self.state.apply_block(first)
+        self.assertEqual(len(undo), 3)
+        self.state.apply_block(second)
+        self.assertEqual(self.state.balances, {"faucet": 40, "alice": 35, "bob": 25})
+        self.assertEqual(self.state.get_owner("deed"), "bob")
+
+        self.assertEqual(self.state.disconnect().block_id, second.block_id)
+        self.assertEqual(self.state.balances, {"faucet": 40, "alice": 60})
+        self.assertEqual(self.state.get_owner("deed"), "alice")
+        self.state.disconnect()
+        self.assertEqual(self.state.balances, {"faucet": 100})
+        self.assertEqual(len(self.state.properties), 0)
+        with self.assertRaises(BaseException):
+            self.state.disconnect()
+
+    def test_invalid_block_is_not_applied(self) -> None:
+        """Test a block with an invalid operation leaves the state unchanged"""
+        for ops in (
+            [("faucet", "alice", 60), ("alice", "bob", 61)],  # * Insufficient balance
+            [(None, "alice", "deed"), ("bob", "carol", "deed")],  # * Not the owner
+            [(None, "alice", "deed"), (None, "bob", "deed")],  # * Created twice
+            [(None, "alice", 10**15)],  # * Coins minted by a block
+            [("faucet", "alice", float("nan"))],  # * Not a finite amount
+            [("faucet", "alice", float("inf"))],
+        ):
+            with self.assertRaises(BaseException):
+                self.state.apply_block(make_block("0".zfill(64), *ops))
+            self.assertEqual(self.state.balances, {"faucet": 100})
+            self.assertEqual(len(self.state.properties), 0)
+        self.assertEqual(self.state.get_undo_depth, 0)
+
+    def test_invalid_worth_is_not_applied(self) -> None:
+        """Test a property with an invalid worth is not left in the registry"""
+        block = make_block("0".zfill(64), (None, "alice", "deed"), (None, "bob", "deed2"))
+        block.transactions[0][0]["operation"][0]["worth"] = 10
+        block.transactions[1][0]["operation"][0]["worth"] = "lots"
+        with self.assertRaises(BaseException):
+            self.state.apply_block(block)
+        self.assertEqual(len(self.state.properties), 0)
+        self.assertEqual(self.state.get_undo_depth, 0)
+
+        self.state.apply_block(make_block("0".zfill(64), (None, "carol", "deed2")))
+        self.assertEqual(self.state.get_owner("deed2"), "carol")
+
+    def test_undo_depth(self) -> None:
+        """Test only the last max_undo blocks can be disconnected"""
+        prev_hash = "0".zfill(64)
+        for _ in range(3):
+            block = make_block(prev_hash, ("faucet", "alice", 1))
+            self.state.apply_block(block)
+            prev_hash = block.block_id
+        self.assertEqual(self.state.get_undo_depth, 2)
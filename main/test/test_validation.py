@@ -0,0 +1,102 @@
+import copy
+import unittest
+
+from block import Block
+from account import Account
+from keypair import KeyPair
+from blockchain import Blockchain
+from script import legacy_asset_to_bytes, operation_message
+from signature import Signature
+from transaction import Transaction
+from validation import BlockValidator, ValidationError, hash_transaction
+
+class ValidationTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.user = Account().gen_account()
+        cls.user.add_key_pair_to_wallet(KeyPair())
+
+    def setUp(self) -> None:
+        self.blockchain = Blockchain()
+        self.blockchain.get_token_from_faucet(self.user, 100)
+        self.genesis = self.blockchain.init_blockchain([])
+
+    def tamper(self, **op_fields) -> Block:
+        """Genesis transactions with a changed operation, rehashed so only the change is wrong"""
+        transactions = copy.deepcopy(self.genesis.transactions)
+        transactions[0][0]["operation"][0].update(op_fields)
+        return Block().create_block(self.genesis.prev_hash, transactions)
+
+    def rehash(self, **op_fields) -> Block:
+        """Genesis transactions with a changed operation and a matching transaction id"""
+        transactions = copy.deepcopy(self.genesis.transactions)
+        tx = transactions[0][0]
+        tx["operation"][0].update(op_fields)
+        tx["transaction_id"] = hash_transaction(tx["operation"], tx["nonce"])
+        return Block().create_block(self.genesis.prev_hash, transactions)
+
+    def assertStage(self, stage: str, block: Block) -> None:
+        height = len(self.blockchain.block_history)
+        with self.assertRaises(ValidationError) as ctx:
+            self.blockchain.validate_block(block)
+        self.assertEqual(ctx.exception.stage, stage)
+        self.assertEqual(len(self.blockchain.block_history), height)
+
+    def test_structure(self) -> None:
+        """Test transaction ids, Merkle root, block id and the tip link are checked"""
+        self.assertStage("structure", self.tamper(asset=10**6))  # * Id not recomputed
+        self.assertStage("structure", self.rehash(sender=None, sig=None, asset="deed", worth="lots"))
+        for asset in (2**64, -3, None):  # * No signed message form
+            self.assertStage("structure", self.rehash(asset=asset))
+        forged = Block().create_block(self.genesis.prev_hash, self.genesis.transactions)
+        forged.merkle_root = "0".zfill(64)
+        self.assertStage("structure", forged)
+        self.assertStage("structure", Block().create_block("1".zfill(64), self.genesis.transactions))
+
+    def test_signatures(self) -> None:
+        """Test operations must be signed by the registered key of the sender"""
+        transactions = copy.deepcopy(self.genesis.transactions)
+        tx = transactions[0][0]
+        tx["operation"][0]["asset"] = 99
+        tx["transaction_id"] = hash_transaction(tx["operation"], tx["nonce"])
+        self.assertStage("signatures", Block().create_block(self.genesis.prev_hash, transactions))
+
+        self.blockchain.key_registry.clear()
+        self.assertStage("signatures", self.genesis)
+
+    def test_parallel(self) -> None:
+        """Test the worker pool accepts and rejects the same blocks as the calling process"""
+        with BlockValidator(max_workers=2, min_parallel=1, chunk_size=1) as validator:
+            self.blockchain.validator = validator
+            self.assertStage("structure", self.tamper(asset=10**6))
+            self.blockchain.validate_block(self.genesis)
+        self.assertEqual(self.blockchain.tip_id, self.genesis.block_id)
+
+    def test_signature_binding(self) -> None:
+        """Test signatures cover receiver and nonce, and padded signatures still validate"""
+        self.blockchain.validate_block(self.genesis)
+        entry = self.user.wallet[1]
+        kPr = (entry["PrivateKey"], entry["Modulus"])
+        sender, receiver = self.user.get_account_id, "ab" * 32
+
+        sig = Signature().sign_data(kPr, legacy_asset_to_bytes(50))  # * Asset only, as signed before
+        op = {"sender": sender, "receiver": receiver, "asset": 50, "sig": sig.hex()}
+        tx = Transaction().create_operation([op], 1).get_trasaction_list
+        self.assertStage("signatures", Block().create_block(self.blockchain.tip_id, [tx]))
+
+        sig = Signature().sign_data(kPr, operation_message(sender, receiver, 50, 1))
+        replayed = dict(op, receiver="cd" * 32, sig=sig.hex())  # * Valid signature, other receiver
+        tx = Transaction().create_operation([replayed], 2).get_trasaction_list
+        self.assertStage("signatures", Block().create_block(self.blockchain.tip_id, [tx]))
+
+        value = int.from_bytes(sig, "little")
+        op["sig"] = value.to_bytes(value.bit_length(), "little").hex()  # * Old width
+        tx = Transaction().create_operation([op], 1).get_trasaction_list
+        self.blockchain.validate_block(Block().create_block(self.blockchain.tip_id, [tx]))
+        self.assertEqual(self.blockchain.get_balance(receiver), 50)
+
+    def test_unsigned_or_non_finite_payment(self) -> None:
+        """Test coin payments without a sender and non-finite amounts fail the structure stage"""
+        self.assertStage("structure", self.rehash(sender=None, sig=None))
+        for amount in (float("nan"), float("inf")):
+            self.assertStage("structure", self.rehash(asset=amount))
@@ -0,0 +1,33 @@
+import unittest
+
+from keypair import KeyPair
+from signature import Signature
+from verifier import BatchVerifier
+
+class BatchVerifierTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        keys = KeyPair()
+        private_key, self.public_key = keys.gen_key_pair().values()
+        signer = Signature()
+        self.items = [
+            (str(i).encode("ascii"), signer.sign_data(private_key, str(i).encode("ascii")), self.public_key)
+            for i in range(40)
+        ]
+
+    def test_serial_batch(self) -> None:
+        """Test single worker batch returns per-item results"""
+        items = self.items + [(b"forged", self.items[0][1], self.public_key)]
+        results = BatchVerifier(max_workers=1).verify(items)
+
+        self.assertEqual(results, [True] * 40 + [False])
+
+    def test_process_pool_batch(self) -> None:
+        """Test pooled batch keeps item order"""
+        items = list(self.items)
+        items[7] = (b"forged", items[7][1], self.public_key)
+
+        with BatchVerifier(max_workers=2, chunk_size=8, min_batch=1) as verifier:
+            results = verifier.verify(items)
+
+        self.assertFalse(results[7])
+        self.assertEqual(results.count(True), 39)
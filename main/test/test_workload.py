@@ -0,0 +1,17 @@
+import unittest
+
+from workload import Workload, WorkloadConfig
+
+
+class WorkloadTestCase(unittest.TestCase):
+    def test_small_workload(self) -> None:
+        """Test a seeded run keeps chain and account balances in step"""
+        config = WorkloadConfig(
+            accounts=3, operations=40, deed_ratio=0.3, block_size=10, key_bytes=512, seed=5
+        )
+        report = Workload(config).run()
+
+        self.assertEqual(report["submitted"], 40)
+        self.assertEqual(report["balance_mismatches"], 0)
+        self.assertGreater(report["blocks"], 1)
+        self.assertEqual(report["submit_latency_s"]["count"], 40 - report["rejected"])
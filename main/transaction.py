@@ -1,10 +1,12 @@
 import json
 import os
 from hashlib import sha256
-from dataclasses import dataclass, astuple
+from dataclasses import dataclass, astuple, field
 from pprint import pprint
 from typing import Optional
 
+from encoding import encode, decode
+
 
 RANDNONCE: int = int.from_bytes(os.urandom(4), "little")
 
@@ -25,12 +27,14 @@ class Transaction:
     transaction_id: str = ""
     set_of_operations: Optional[set] = None
     nonce: int = 0
+    _digest: Optional[str] = field(default=None, init=False, compare=False)
 
     @classmethod
     def __create_operation_helper(cls, ops, n) -> "Transaction":
         """Return a new object of Transaction with unique id"""
-        tx = cls(ops, n).eval()
-        return cls(tx, ops, n)
+        tx = cls("", ops, n)
+        tx.transaction_id = tx.eval()
+        return tx
 
     def create_operation(self, ops: list, nonce: int) -> "Transaction":
         """
@@ -48,10 +52,25 @@ class Transaction:
         return self.__create_operation_helper(ops, nonce)
 
     def eval(self) -> str:
-        """Return transaction hash"""
-        return sha256(
-            str((self.set_of_operations, self.nonce)).encode("ascii")
-        ).hexdigest()
+        """Return transaction hash: computed once over the canonical encoding of operations and nonce"""
+        if self._digest is None:
+            self._digest = sha256(
+                encode((self.set_of_operations, self.nonce))
+            ).hexdigest()
+        return self._digest
+
+    def to_bytes(self) -> bytes:
+        """
+        function that serializes the transaction with the canonical binary encoding.
+        Smaller and faster than to_string; read back with Transaction.from_bytes.
+        """
+        return encode((self.transaction_id, self.set_of_operations, self.nonce))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Transaction":
+        """Returns the Transaction serialized by to_bytes"""
+        tx_id, ops, nonce = decode(data)
+        return cls(tx_id, ops, nonce)
 
     def to_string(self) -> str:
         """
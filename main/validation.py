@@ -0,0 +1,270 @@
+"""
+Staged block validation.
+
+A block is accepted in four stages, cheapest first so that invalid blocks fail fast:
+    1. structure    every transaction has its fields, transaction ids, the Merkle root and the
+                    block id match their recomputed hashes, and the block extends the tip.
+    2. duplicates   no transaction is already in the history or twice in the block.
+    3. signatures   every signed operation verifies against the registered key of its sender,
+                    over script.operation_message: its sender, receiver, asset and nonce.
+    4. state        applied by Blockchain.validate_block, in block order.
+
+Stages 1 and 3 are stateless: transaction hashes and signatures are checked in chunks on a
+process pool, shared with the BatchVerifier. Blocks below min_parallel operations are
+checked in the calling process.
+
+Signatures are read at any stored width (see signature.read_signature). Signatures over the
+asset alone, as earlier versions made them, are not accepted: they could be replayed to any
+receiver under a new nonce.
+"""
+# ? Built-in
+import math
+from hashlib import sha256
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+# ? Local
+from block import Block
+from encoding import encode
+from merkle import MerkleTree
+from metrics import REGISTRY
+from script import AMOUNT_BYTES, operation_message
+from signature import read_signature
+from verifier import BatchVerifier, VerifyItem
+
+TX_FIELDS = ("transaction_id", "operation", "nonce")
+OP_FIELDS = ("sender", "receiver", "asset", "sig")
+
+STAGE_SECONDS = {
+    stage: REGISTRY.histogram(
+        "block_validation_stage_seconds", "Time spent in each block validation stage", stage=stage
+    )
+    for stage in ("structure", "duplicates", "signatures", "state")
+}
+
+
+class ValidationError(BaseException):
+    """Raised when a block fails a validation stage"""
+
+    def __init__(self, stage: str, message: str) -> None:
+        super().__init__(f"{stage}: {message}")
+        self.stage = stage
+
+
+def hash_transaction(operations: list[dict], nonce: int) -> str:
+    """Transaction id, as computed by Transaction.eval"""
+    return sha256(encode((operations, nonce))).hexdigest()
+
+
+def is_signable_asset(asset) -> bool:
+    """True if script.asset_to_bytes has a message form for asset: coins or a property's id"""
+    if isinstance(asset, bool):
+        return False
+    if isinstance(asset, int):
+        return 0 <= asset < 1 << (8 * AMOUNT_BYTES)
+    if isinstance(asset, str):
+        return asset.isascii()
+    if isinstance(asset, float):
+        return math.isfinite(asset)
+    return isinstance(asset, bytes)
+
+
+def _hash_chunk(chunk: list[tuple[list[dict], int]]) -> list[str]:
+    """Worker: hashes a chunk of (operations, nonce). Top-level so it can be pickled"""
+    return [hash_transaction(operations, nonce) for operations, nonce in chunk]
+
+
+@dataclass(repr=False)
+class BlockValidator:
+    """
+    Runs the stateless validation stages of a block.
+
+    :max_workers:
+        number of worker processes. Defaults to the number of cores.
+
+    :min_parallel:
+        blocks with fewer operations are checked in the calling process,
+        where pool overhead would cost more than the work.
+
+    :chunk_size:
+        number of transactions or signatures sent to a worker per task.
+    """
+
+    max_workers: Optional[int] = None
+    min_parallel: int = 256
+    chunk_size: int = 128
+    __verifier: Optional[BatchVerifier] = field(default=None, init=False)
+
+    def __enter__(self) -> "BlockValidator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_verifier(self) -> BatchVerifier:
+        """Returns the BatchVerifier whose process pool every stage shares"""
+        if self.__verifier is None:
+            self.__verifier = BatchVerifier(
+                max_workers=self.max_workers,
+                chunk_size=self.chunk_size,
+                min_batch=self.min_parallel,
+            )
+        return self.__verifier
+
+    def __map_chunks(self, func, items: list) -> list:
+        """Applies a chunk function to items, on the pool for large inputs"""
+        verifier = self.get_verifier()
+        if verifier.get_workers == 1 or len(items) < self.min_parallel:
+            return func(items)
+        chunks = [
+            items[i : i + self.chunk_size] for i in range(0, len(items), self.chunk_size)
+        ]
+        results: list = []
+        for chunk_result in verifier._get_executor().map(func, chunks):
+            results.extend(chunk_result)
+        return results
+
+    # * Stage 1
+    def check_structure(self, block: Block, tip_id: str) -> None:
+        """
+        a function that checks the fields and hashes of a block.
+
+        :block:
+            block to check
+
+        :tip_id:
+            id of the last accepted block, which prev_hash must reference
+        """
+        if block.prev_hash != tip_id:
+            raise ValidationError("structure", f"Block '{block.block_id}' does not extend the tip '{tip_id}'")
+
+        txs = [tx for _, tx in block.iter_transactions()]
+        for tx in txs:
+            if not isinstance(tx, dict) or any(key not in tx for key in TX_FIELDS):
+                raise ValidationError("structure", f"Malformed transaction {tx!r}")
+            for op in tx["operation"]:
+                if not isinstance(op, dict) or any(key not in op for key in OP_FIELDS):
+                    raise ValidationError("structure", f"Malformed operation {op!r}")
+                worth = op.get("worth")
+                if worth is not None and (isinstance(worth, bool) or not isinstance(worth, (int, float))):
+                    raise ValidationError("structure", f"Invalid worth {worth!r}")
+                if not is_signable_asset(op["asset"]):
+                    raise ValidationError("structure", f"Invalid asset {op['asset']!r}")
+                if op["sender"] is None and not isinstance(op["asset"], (str, bytes)):
+                    raise ValidationError("structure", f"Unsigned payment of {op['asset']!r}")
+
+        tx_ids = self.__map_chunks(
+            _hash_chunk, [(tx["operation"], tx["nonce"]) for tx in txs]
+        )
+        for tx, tx_id in zip(txs, tx_ids):
+            if tx["transaction_id"] != tx_id:
+                raise ValidationError("structure", f"Transaction id '{tx['transaction_id']}' does not match its hash")
+
+        merkle_root = MerkleTree(tx_ids).get_root.hex()
+        if block.merkle_root != merkle_root:
+            raise ValidationError("structure", f"Merkle root of block '{block.block_id}' does not match")
+        if block.block_id != sha256(encode((block.prev_hash, merkle_root))).hexdigest():
+            raise ValidationError("structure", f"Block id '{block.block_id}' does not match its hash")
+
+    # * Stage 2
+    @staticmethod
+    def check_duplicates(
+        block: Block, height: int, tx_index: dict[str, tuple[int, int]]
+    ) -> dict[str, tuple[int, int]]:
+        """
+        a function that checks no transaction is recorded twice.
+
+        :height:
+            height the block would have
+
+        :tx_index:
+            transaction index of the history
+
+        :returns:
+            the index entries of the block: transaction id to (height, position)
+        """
+        block_index: dict[str, tuple[int, int]] = {}
+        for position, tx in block.iter_transactions():
+            tx_id = tx["transaction_id"]
+            if tx_id in tx_index or tx_id in block_index:
+                raise ValidationError("duplicates", f"Similar transaction '{tx_id}' exist!")
+            block_index[tx_id] = (height, position)
+        return block_index
+
+    # * Stage 3
+    @staticmethod
+    def get_verify_items(
+        operations: Iterable[tuple[dict, int]], key_registry: dict[str, tuple[int, int]]
+    ) -> list[VerifyItem]:
+        """
+        a function that turns signed operations into (msg, sig, kPub) triples, with each
+        signature in its canonical width. Operations without a sender (new properties)
+        carry no signature.
+
+        :operations:
+            (operation, nonce of its transaction) pairs
+
+        :key_registry:
+            account id to public key (n, e)
+        """
+        items: list[VerifyItem] = []
+        for op, nonce in operations:
+            if op["sender"] is None:
+                continue
+            kPub = key_registry.get(op["sender"])
+            if kPub is None:
+                raise ValidationError("signatures", f"Unknown sender '{op['sender']}'")
+            try:
+                sig = read_signature(bytes.fromhex(op["sig"]), kPub[0])
+            except (TypeError, ValueError):
+                raise ValidationError("signatures", f"Malformed signature of '{op['sender']}'")
+            items.append((operation_message(op["sender"], op["receiver"], op["asset"], nonce), sig, kPub))
+        return items
+
+    def check_signatures(
+        self, block: Block, key_registry: dict[str, tuple[int, int]]
+    ) -> None:
+        """
+        a function that verifies every signed operation of a block.
+
+        :key_registry:
+            account id to public key (n, e)
+        """
+        operations = [
+            (op, tx["nonce"])
+            for _, tx in block.iter_transactions()
+            for op in tx["operation"]
+            if op["sender"] is not None
+        ]
+        items = self.get_verify_items(operations, key_registry)
+        for (op, _), valid in zip(operations, self.get_verifier().verify(items)):
+            if not valid:
+                raise ValidationError("signatures", f"Invalid signature of '{op['sender']}' over {op['asset']!r}")
+
+    def validate(
+        self,
+        block: Block,
+        tip_id: str,
+        height: int,
+        tx_index: dict[str, tuple[int, int]],
+        key_registry: dict[str, tuple[int, int]],
+    ) -> dict[str, tuple[int, int]]:
+        """
+        a function that runs stages 1 to 3.
+
+        :returns:
+            the transaction index entries of the block, for the state stage
+        """
+        with STAGE_SECONDS["structure"].time():
+            self.check_structure(block, tip_id)
+        with STAGE_SECONDS["duplicates"].time():
+            block_index = self.check_duplicates(block, height, tx_index)
+        with STAGE_SECONDS["signatures"].time():
+            self.check_signatures(block, key_registry)
+        return block_index
+
+    def close(self) -> None:
+        """Shuts down the worker processes"""
+        if self.__verifier is not None:
+            self.__verifier.close()
+            self.__verifier = None
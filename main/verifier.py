@@ -0,0 +1,111 @@
+# ? Built-in
+import os
+from dataclasses import dataclass, field
+from concurrent.futures import Executor
+from typing import Iterable, Optional
+
+# ? Local
+from signature import Signature
+from sigcache import SIGCACHE
+
+# (msg, sig, kPub): kPub = (n, e)
+VerifyItem = tuple[bytes, bytes, tuple[int, int]]
+
+
+def _verify_chunk(chunk: list[VerifyItem]) -> list[bool]:
+    """Worker: verifies a chunk of signatures. Top-level so it can be pickled"""
+    signer = Signature()
+    return [signer.verify_signature(msg, sig, kPub) for msg, sig, kPub in chunk]
+
+
+@dataclass(repr=False)
+class BatchVerifier:
+    """
+    Verifies many signatures at once on a process pool.
+
+    :max_workers:
+        number of worker processes. Defaults to the number of cores.
+        With 1 worker everything is verified in the calling process.
+
+    :chunk_size:
+        number of items sent to a worker per task.
+
+    :min_batch:
+        batches smaller than this are verified in the calling process,
+        where pool overhead would cost more than the math.
+
+    :use_cache:
+        skip items already in the process-wide signature cache, and record new successes in it.
+    """
+
+    max_workers: Optional[int] = None
+    chunk_size: int = 64
+    min_batch: int = 32
+    use_cache: bool = True
+    __executor: Optional[Executor] = field(default=None, init=False)
+
+    def __enter__(self) -> "BatchVerifier":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def get_workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+
+    def _get_executor(self) -> Executor:
+        """Creates the process pool on first use"""
+        if self.__executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.__executor = ProcessPoolExecutor(max_workers=self.get_workers)
+        return self.__executor
+
+    def verify(self, items: Iterable[VerifyItem]) -> list[bool]:
+        """
+        a function that verifies a batch of signatures.
+
+        :items:
+            (msg, sig, kPub) triples
+
+        :return:
+            per-item results, in the same order as items
+        """
+        items = list(items)
+        if not self.use_cache:
+            return self.__verify_uncached(items)
+
+        keys = [SIGCACHE.make_key(*item) for item in items]
+        results = [SIGCACHE.contains(key) for key in keys]
+        misses = [i for i, hit in enumerate(results) if not hit]
+
+        checked = self.__verify_uncached([items[i] for i in misses])
+        for i, valid in zip(misses, checked):
+            results[i] = valid
+            if valid:
+                SIGCACHE.add(keys[i])
+        return results
+
+    def __verify_uncached(self, items: list[VerifyItem]) -> list[bool]:
+        if self.get_workers == 1 or len(items) < self.min_batch:
+            return _verify_chunk(items)
+
+        chunks = [
+            items[i : i + self.chunk_size]
+            for i in range(0, len(items), self.chunk_size)
+        ]
+        results: list[bool] = []
+        for chunk_result in self._get_executor().map(_verify_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def verify_all(self, items: Iterable[VerifyItem]) -> bool:
+        """Returns True only if every signature in the batch is valid"""
+        return all(self.verify(items))
+
+    def close(self) -> None:
+        """Shuts down the worker processes"""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
@@ -0,0 +1,228 @@
+"""
+Synthetic workload for load-testing the ledger.
+
+Creates accounts, funds them from the faucet, issues property deeds and then drives a
+mix of coin payments and deed sales through Account and Blockchain at a target rate,
+sealing a block every block_size transactions. The choice of every operation comes from
+a seeded random generator, so two runs with the same config submit the same sequence.
+Keys come from the operating system's randomness and differ between runs.
+
+    python workload.py --accounts 20 --operations 2000 --rate 200 --seed 7
+"""
+# ? Built-in
+import json
+import time
+import random
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+# ? Local
+from block import Block
+from account import Account
+from keypair import KeyPair
+from keypool import KeyPool
+from blockchain import Blockchain
+from transaction import Transaction
+
+
+@dataclass
+class WorkloadConfig:
+    """
+    :accounts:
+        number of accounts.
+
+    :operations:
+        number of payments and deed sales to submit after setup.
+
+    :deed_ratio:
+        share of operations that are deed sales; the rest are coin payments.
+
+    :rate:
+        target operations per second. None submits as fast as possible.
+
+    :block_size:
+        transactions per block.
+
+    :funding:
+        coins each account receives from the faucet.
+
+    :deeds_per_account:
+        properties each account issues during setup.
+
+    :max_payment:
+        largest coin payment.
+
+    :key_bytes:
+        bit size of each prime of the account keys. Smaller keys make large setups quicker.
+
+    :seed:
+        seed of the operation sequence.
+    """
+
+    accounts: int = 10
+    operations: int = 1000
+    deed_ratio: float = 0.1
+    rate: Optional[float] = None
+    block_size: int = 100
+    funding: int = 10_000
+    deeds_per_account: int = 2
+    max_payment: int = 100
+    key_bytes: int = 1024
+    seed: int = 0
+
+
+def percentiles(samples: list[float]) -> dict[str, Optional[float]]:
+    """p50/p90/p99/max of latency samples in seconds"""
+    if not samples:
+        return {"count": 0, "p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "count": len(ordered),
+        "p50": ordered[last * 50 // 100],
+        "p90": ordered[last * 90 // 100],
+        "p99": ordered[last * 99 // 100],
+        "max": ordered[last],
+    }
+
+
+class Workload:
+    """Runs a WorkloadConfig against a fresh Blockchain"""
+
+    def __init__(self, config: WorkloadConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.blockchain = Blockchain(
+            faucet_coins=config.accounts * config.funding + 1  # * Payments must stay below the balance
+        )
+        self.accounts: list[Account] = []
+        self.deeds: dict[str, Account] = {}  # * Deed to its current owner
+        self.deed_ids: list[str] = []
+        self.submit_latency: list[float] = []
+        self.block_latency: list[float] = []
+        self.submitted = 0
+        self.rejected = 0
+
+    def submit(self, *txs: Transaction) -> None:
+        """Adds transactions to the mempool and seals a block once it holds block_size"""
+        for tx in txs:
+            self.blockchain.mempool.add(tx)
+        if len(self.blockchain.mempool) >= self.config.block_size:
+            self.seal_block()
+
+    def seal_block(self) -> None:
+        """Builds a block from the mempool and validates it"""
+        txs = self.blockchain.mempool.select(max_count=self.config.block_size)
+        if not txs:
+            return
+        block = Block().create_block(self.blockchain.tip_id, txs)
+        start = time.perf_counter()
+        self.blockchain.validate_block(block)
+        self.block_latency.append(time.perf_counter() - start)
+
+    def setup(self) -> None:
+        """Creates and funds the accounts, then issues their deeds"""
+        with KeyPool(key_bytes=self.config.key_bytes) as pool:
+            for _ in range(self.config.accounts):
+                account = Account().gen_account(pool)
+                account.add_key_pair_to_wallet(KeyPair(), pool)
+                self.accounts.append(account)
+        self.blockchain.get_tokens_from_faucet([(a, self.config.funding) for a in self.accounts])
+        for i, account in enumerate(self.accounts):
+            for j in range(self.config.deeds_per_account):
+                worth = self.rng.randint(1, self.config.max_payment)
+                tx = account.create_property(f"DEED-{i}-{j}".encode("ascii"), b"1 acre", worth)
+                deed = tx.set_of_operations[0]["asset"]
+                self.deeds[deed] = account
+                self.deed_ids.append(deed)
+                self.submit(tx)
+        self.seal_block()
+
+    def step(self) -> None:
+        """Submits one operation drawn from the mix"""
+        sale = bool(self.deed_ids) and self.rng.random() < self.config.deed_ratio
+        if sale:
+            deed = self.rng.choice(self.deed_ids)
+            seller = self.deeds[deed]
+            buyer = self.rng.choice([a for a in self.accounts if a is not seller])
+            price = self.rng.randint(1, self.config.max_payment)
+        else:
+            sender, receiver = self.rng.sample(self.accounts, 2)
+            amount = self.rng.randint(1, self.config.max_payment)
+
+        start = time.perf_counter()
+        try:
+            if sale:
+                payment, transfer = seller.sell_property(deed, buyer, price, 1)
+                self.deeds[deed] = buyer
+                txs = (payment, transfer)
+            else:
+                txs = (sender.create_payment_op(receiver, amount, 1),)
+        except BaseException:  # * e.g. the balance is too low for the drawn amount
+            self.rejected += 1
+            return
+        finally:
+            self.submitted += 1
+        self.submit_latency.append(time.perf_counter() - start)
+        self.submit(*txs)
+
+    def run(self) -> dict:
+        """
+        a function that runs setup and the timed operations.
+
+        :returns:
+            throughput, latency percentiles and a consistency check of chain and account balances
+        """
+        setup_start = time.perf_counter()
+        self.setup()
+        setup_elapsed = time.perf_counter() - setup_start
+        self.block_latency.clear()
+
+        start = time.perf_counter()
+        for i in range(self.config.operations):
+            if self.config.rate:  # * Hold the schedule: operation i is due at i / rate
+                delay = start + i / self.config.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.step()
+        while len(self.blockchain.mempool):
+            self.seal_block()
+        elapsed = time.perf_counter() - start
+
+        mismatched = sum(
+            self.blockchain.get_balance(a.get_account_id) != a.get_balance for a in self.accounts
+        )
+        return {
+            "config": asdict(self.config),
+            "setup_s": setup_elapsed,
+            "elapsed_s": elapsed,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "blocks": len(self.blockchain.block_history),
+            "throughput_ops_per_sec": (self.submitted - self.rejected) / elapsed if elapsed else None,
+            "submit_latency_s": percentiles(self.submit_latency),
+            "block_latency_s": percentiles(self.block_latency),
+            "balance_mismatches": mismatched,
+        }
+
+
+def run_workload(config: WorkloadConfig) -> dict:
+    """Runs a workload and returns its report"""
+    return Workload(config).run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    defaults = WorkloadConfig()
+    for name, value in asdict(defaults).items():
+        kind = float if name in ("rate", "deed_ratio") else int
+        parser.add_argument(f"--{name.replace('_', '-')}", type=kind, default=value)
+    args = parser.parse_args()
+    print(json.dumps(run_workload(WorkloadConfig(**vars(args))), indent=2))
+
+
+if __name__ == "__main__":
+    main()